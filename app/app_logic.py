@@ -1,23 +1,54 @@
 # app/app_logic.py
 import customtkinter as ctk
-from tkinter import messagebox
+import importlib
+import math
+import time
 from datetime import datetime
 
 from config import settings
 from data import persistence
-from services.google_calendar import GoogleCalendarService
+from app.scheduler import Scheduler
+from app.instrumentation import Instrumentation
+from app.notifications import NotificationCenter
 from app.ui.sidebar_frame import SidebarFrame
-from app.ui.timer_frame import TimerFrame
-from app.ui.planner_frame import PlannerFrame
-from app.ui.analytics_frame import AnalyticsFrame
+
+# Frames are imported and constructed the first time they are shown, so heavy
+# dependencies (matplotlib, tkcalendar, Google API) stay out of startup.
+FRAME_MODULES = {
+    "TimerFrame": "app.ui.timer_frame",
+    "PlannerFrame": "app.ui.planner_frame",
+    "AnalyticsFrame": "app.ui.analytics_frame",
+    "DiagnosticsFrame": "app.ui.diagnostics_frame",  # Hidden; opened with Ctrl+Shift+D
+}
+
+# Handlers timed when diagnostics are on (scheduler jobs and `after` callbacks are timed anyway)
+INSTRUMENTED_METHODS = {
+    "TimeSplitApp": ("show_frame", "on_mode_change"),
+    "TimerFrame": ("start_timer", "stop_timer", "reset_timer", "set_custom_focus_time"),
+    "PlannerFrame": ("refresh_task_list", "add_task", "add_event", "toggle_task_done", "delete_task"),
+    "AnalyticsFrame": ("create_charts",),
+}
+
+# What to rerun on the visible frame when other sync daemon clients change the data
+STORE_VIEWS = {"PlannerFrame": "refresh_task_list", "AnalyticsFrame": "create_charts"}
 
 class TimeSplitApp(ctk.CTk):
     def __init__(self):
         super().__init__()
 
         # --- Load Data and Services ---
-        self.app_data = persistence.load_data()
-        self.gcal_service = GoogleCalendarService()
+        self.store = persistence.open_store()
+        self.app_data = self.store.data
+        self._gcal_service = None
+        self._chart_renderer = None
+        self.scheduler = Scheduler(self)
+        self.autosaver = None
+        if settings.AUTOSAVE_ENABLED and type(self.store) is persistence.JournalStore:  # Not a daemon mirror
+            from data.autosave import Autosaver
+            self.autosaver = Autosaver(self.store, self.scheduler)
+        self.instrumentation = None
+        if settings.DIAGNOSTICS_ENABLED:
+            self._enable_instrumentation()
 
         # --- Core App State ---
         self.title(settings.APP_NAME)
@@ -31,28 +62,43 @@ class TimeSplitApp(ctk.CTk):
 
         # <<< NEW: Hydration Reminder State >>>
         self.HYDRATION_INTERVAL_SEC = 20 * 60  # 20 minutes
+        self.hydration_deadline = time.monotonic() + self.HYDRATION_INTERVAL_SEC
         self.hydration_reminder_time_left = self.HYDRATION_INTERVAL_SEC
 
         self._setup_ui()
+        self.notifications = NotificationCenter(self, self.scheduler)
         self.on_mode_change()
 
         # <<< NEW: Start the global reminder loop >>>
-        self._update_hydration_reminder()
+        self.scheduler.call_every(1.0, self._update_hydration_reminder)
+        if hasattr(self.store, 'poll'):
+            # Connected to the sync daemon: pick up changes made by other clients
+            self.scheduler.call_every(settings.DAEMON_POLL_SEC, self._poll_store)
 
     # <<< NEW: Global reminder loop that runs every second >>>
     def _update_hydration_reminder(self):
-        self.hydration_reminder_time_left -= 1
+        # Derived from the monotonic deadline, so a blocked loop never delays the reminder
+        remaining = self.hydration_deadline - time.monotonic() - self.scheduler.COALESCE_SEC
+        self.hydration_reminder_time_left = max(0, math.ceil(remaining))
 
         if self.hydration_reminder_time_left <= 0:
-            messagebox.showinfo("Hydration Reminder", "Time for a cup of water! 💧")
+            self.notify("Hydration Reminder", "Time for a cup of water! 💧", key="hydration")
+            self.hydration_deadline = time.monotonic() + self.HYDRATION_INTERVAL_SEC
             self.hydration_reminder_time_left = self.HYDRATION_INTERVAL_SEC
-        
-        # Update the label in the sidebar
-        if hasattr(self, 'sidebar_frame'):
-            self.sidebar_frame.update_hydration_label(self.hydration_reminder_time_left)
 
-        # Schedule this function to run again after 1000ms (1 second)
-        self.after(1000, self._update_hydration_reminder)
+        # Update the label in the sidebar
+        self.sidebar_frame.update_hydration_label(self.hydration_reminder_time_left)
+
+    def _enable_instrumentation(self):
+        self.instrumentation = Instrumentation(self)
+        self.scheduler.instrumentation = self.instrumentation
+        self.instrumentation.wrap_methods(self, INSTRUMENTED_METHODS["TimeSplitApp"])
+        self.instrumentation.add_source("scheduler", lambda: {"wakeups": self.scheduler.wakeups, "queued_jobs": len(self.scheduler._heap)})
+        self.instrumentation.add_source("store", lambda: {"backend": type(self.store).__name__, "pending_journal_records": getattr(self.store, "pending", None)})
+        if self.autosaver is not None:
+            self.instrumentation.add_source("autosave", self.autosaver.stats)
+        self.instrumentation.add_source("notifications", lambda: self.notifications.snapshot())
+        self.instrumentation.add_source("charts", lambda: self._chart_renderer.stats() if self._chart_renderer else {})
 
     def _setup_ui(self):
         self.grid_columnconfigure(1, weight=1)
@@ -67,47 +113,93 @@ class TimeSplitApp(ctk.CTk):
         self.main_frame.grid_columnconfigure(0, weight=1)
 
         self.frames = {}
-        for F in (TimerFrame, PlannerFrame, AnalyticsFrame):
-            frame = F(self.main_frame, self)
-            self.frames[F.__name__] = frame
-            frame.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
-
+        self._themed_frames = {}  # Frame name -> mode its theme was last applied for
+        self.current_frame_name = None
         self.show_frame("TimerFrame")
+        self.bind_all("<Control-Shift-D>", lambda e: self.show_frame("DiagnosticsFrame"))
+
+    @property
+    def gcal_service(self):
+        """Non-blocking Google Calendar facade; authentication starts on a worker thread on first use."""
+        if self._gcal_service is None:
+            from services.calendar_worker import AsyncCalendarService
+            self._gcal_service = AsyncCalendarService(self)
+        return self._gcal_service
+
+    @property
+    def chart_renderer(self):
+        """Draws analytics charts in worker processes and caches the images; started on first use."""
+        if self._chart_renderer is None:
+            from app.charts import ChartRenderer
+            self._chart_renderer = ChartRenderer(self.scheduler)
+        return self._chart_renderer
+
+    def get_frame(self, page_name):
+        """Returns the named frame, importing and constructing it on first use."""
+        if page_name not in self.frames:
+            frame_class = getattr(importlib.import_module(FRAME_MODULES[page_name]), page_name)
+            if self.instrumentation is not None:
+                # Before construction, so button commands bound in __init__ are timed too
+                frame_class = self.instrumentation.instrumented_class(frame_class, INSTRUMENTED_METHODS.get(page_name, ()))
+            frame = frame_class(self.main_frame, self)
+            frame.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+            self.frames[page_name] = frame
+        return self.frames[page_name]
 
     def show_frame(self, page_name):
-        # ... (no change to this function)
-        frame = self.frames[page_name]
+        frame = self.get_frame(page_name)
         frame.tkraise()
+        self.current_frame_name = page_name
+        mode = self.current_mode.get()
+        if self._themed_frames.get(page_name) != mode and hasattr(frame, 'update_theme'):
+            # Themes are applied when a frame becomes visible, not when the mode flips behind it
+            frame.update_theme()
+            self._themed_frames[page_name] = mode
         if hasattr(frame, 'on_show'):
             frame.on_show()
 
     def on_mode_change(self, *args):
-        # ... (no change to this function)
         mode = self.current_mode.get()
         self.theme = settings.THEMES[mode]
         self.sidebar_frame.update_theme()
-        for frame in self.frames.values():
-            if hasattr(frame, 'update_theme'):
-                frame.update_theme()
-        for name, frame in self.frames.items():
-            if frame.winfo_viewable():
-                self.show_frame(name)
-                break
+        # Hidden frames are now stale and catch up in show_frame; only the visible one redraws
+        if self.current_frame_name:
+            self.show_frame(self.current_frame_name)
+
+    def _poll_store(self):
+        if self.store.poll() and self.current_frame_name in STORE_VIEWS:
+            # Hidden frames re-read the store in their own on_show
+            getattr(self.frames[self.current_frame_name], STORE_VIEWS[self.current_frame_name])()
+
+    def timer_changed(self, running, **state):
+        """Lets other sync daemon clients see the timer; a no-op with a local store."""
+        if hasattr(self.store, 'publish_timer'):
+            self.store.publish_timer(running, **state)
+
+    def notify(self, title, message, priority="normal", key=None, min_interval_sec=None):
+        """Shows a non-modal toast (see app.notifications); never blocks the event loop."""
+        return self.notifications.notify(title, message, priority, key, min_interval_sec)
+
+    def commit(self, record):
+        """Applies a change to app_data and journals it to disk."""
+        self.store.commit(record)
 
     def log_session(self, label, duration_seconds):
-        # ... (no change to this function)
         timestamp = datetime.now().isoformat()
         mode = self.current_mode.get()
-        if "logs_df" not in self.app_data:
-            self.app_data['logs_df'] = []
-        self.app_data['logs_df'].append({
+        self.commit({'op': 'log_session', 'entry': {
             'timestamp': timestamp,
             'label': label,
             'duration_sec': duration_seconds,
             'mode': mode
-        })
+        }})
 
     def on_closing(self):
-        # ... (no change to this function)
-        persistence.save_data(self.app_data)
+        if self._gcal_service is not None:
+            self._gcal_service.close()
+        if self._chart_renderer is not None:
+            self._chart_renderer.close()
+        if self.autosaver is not None:
+            self.autosaver.close()
+        self.store.close()
         self.destroy()
\ No newline at end of file
@@ -0,0 +1,154 @@
+# app/charts.py
+"""Chart rendering for the analytics view, off the Tk thread.
+
+render() draws one chart spec to PNG bytes with matplotlib's Agg backend and runs in a
+worker process. ChartRenderer hands specs to a process pool and keeps the PNGs in an LRU
+cache keyed by a hash of the spec, which holds both the data and the colors, so a chart
+whose inputs did not change is shown without drawing anything.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import settings
+
+# Define a consistent dark background color for charts
+CHART_BG_COLOR = "#2B2B2B"
+CHART_FACE_COLOR = "#343638"
+CHART_TEXT_COLOR = "#FFFFFF"
+PIE_START_ANGLE = 140
+POLL_SEC = 0.05
+
+def chart_key(spec):
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+# --- Worker process ---
+def render(spec):
+    """Draws a chart spec ({'kind': 'pie' or 'bar', ...}) and returns it as PNG bytes."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=spec['size'], dpi=spec['dpi'], facecolor=CHART_BG_COLOR)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.set_title(spec['title'], color=CHART_TEXT_COLOR)
+    if spec['kind'] == "pie":
+        ax.pie(spec['values'], labels=spec['labels'], autopct='%1.1f%%', startangle=PIE_START_ANGLE,
+               colors=spec['colors'] or None, textprops={'color': CHART_TEXT_COLOR, 'weight': 'bold'})
+    else:
+        ax.barh(range(len(spec['labels'])), spec['values'], color=spec['color'])
+        ax.set_yticks(range(len(spec['labels'])), spec['labels'])
+        ax.set_xlim(0, max(spec['values']) * 1.05 if spec['values'] and max(spec['values']) > 0 else 1)
+        ax.tick_params(axis='x', colors=CHART_TEXT_COLOR)
+        ax.tick_params(axis='y', colors=CHART_TEXT_COLOR)
+        ax.set_facecolor(CHART_FACE_COLOR)
+        for spine in ax.spines.values():
+            spine.set_color(CHART_TEXT_COLOR)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=CHART_BG_COLOR)
+    return buffer.getvalue()
+
+def _warm_up():
+    import matplotlib.backends.backend_agg  # Pays the matplotlib import before the first real chart
+
+# --- Tk thread ---
+class ChartRenderer:
+    """Renders chart specs in a process pool and caches the PNGs, least recently used evicted first.
+
+    get() never blocks: a cached chart is handed to the callback at once, anything else
+    when a worker has drawn it (polled through the app scheduler while work is in flight).
+    Requests for a chart that is already being drawn share that render.
+    """
+    def __init__(self, scheduler, workers=None, cache_size=None):
+        self.scheduler = scheduler
+        self.workers = workers or settings.CHART_WORKERS
+        self.cache_size = cache_size or settings.CHART_CACHE_SIZE
+        self._pool = None
+        self._cache = OrderedDict()  # Key -> PNG bytes
+        self._in_flight = {}         # Key -> (future, [callbacks], pool it runs on)
+        self._poll_job = None
+        self.hits = self.misses = 0
+
+    def _executor(self):
+        if self._pool is None:
+            # Spawned rather than forked: the parent holds a Tk interpreter and an X connection
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _submit(self, fn, *args):
+        """Returns (pool, future), replacing the pool first if one of its workers has died."""
+        pool = self._executor()
+        try:
+            return pool, pool.submit(fn, *args)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            pool = self._executor()
+            return pool, pool.submit(fn, *args)
+
+    def _discard_pool(self, pool):
+        """Drops a broken pool so the next request starts a new one (unless that already happened)."""
+        if pool is self._pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self):
+        """Starts the workers ahead of the first chart."""
+        for _ in range(self.workers):
+            self._submit(_warm_up)
+
+    def get(self, spec, callback, key=None):
+        """Calls callback(png_bytes, error) for the chart `spec` (whose chart_key may be passed in); returns the key."""
+        key = key or chart_key(spec)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            callback(self._cache[key], None)
+            return key
+        self.misses += 1
+        if key in self._in_flight:
+            self._in_flight[key][1].append(callback)
+            return key
+        pool, future = self._submit(render, spec)
+        self._in_flight[key] = (future, [callback], pool)
+        if self._poll_job is None:
+            self._poll_job = self.scheduler.call_every(POLL_SEC, self._poll)
+        return key
+
+    def _poll(self):
+        for key, (future, callbacks, pool) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            del self._in_flight[key]
+            try:
+                png, error = future.result(), None
+                self._cache[key] = png
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed); the next get() renders on a new pool
+                print(f"Chart worker died: {e}")
+                self._discard_pool(pool)
+                png, error = None, e
+            except Exception as e:
+                print(f"Chart rendering failed: {e}")
+                png, error = None, e
+            for callback in callbacks:
+                callback(png, error)
+        if not self._in_flight:
+            self.scheduler.cancel(self._poll_job)
+            self._poll_job = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache),
+                "cached_kb": round(sum(map(len, self._cache.values())) / 1024), "in_flight": len(self._in_flight)}
+
+    def close(self):
+        self.scheduler.cancel(self._poll_job)
+        self._poll_job = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
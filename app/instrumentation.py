@@ -0,0 +1,176 @@
+# app/instrumentation.py
+import bisect
+import functools
+import json
+import os
+import sys
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Upper edges of the histogram buckets, in milliseconds (16.7 ms is one 60 Hz frame)
+BUCKET_EDGES_MS = (0.1, 0.5, 1, 2, 5, 10, 16.7, 33, 50, 100, 250, 500, 1000, float("inf"))
+
+class Histogram:
+    """Fixed-bucket latency histogram; recording is O(log buckets) and memory never grows."""
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKET_EDGES_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_EDGES_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Upper edge of the bucket holding the given fraction of samples."""
+        target = fraction * self.count
+        seen = 0
+        for edge, count in zip(BUCKET_EDGES_MS, self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(edge, self.max_ms)
+        return 0.0
+
+    def summary(self):
+        return {"count": self.count, "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "p50_ms": round(self.percentile(0.5), 3), "p95_ms": round(self.percentile(0.95), 3), "max_ms": round(self.max_ms, 3),
+                "buckets": {str(edge): count for edge, count in zip(BUCKET_EDGES_MS, self.counts) if count}}
+
+def callback_name(callback):
+    name = getattr(callback, "__qualname__", None)
+    if name is None and hasattr(callback, "func"):
+        return callback_name(callback.func)  # functools.partial
+    return name or repr(callback)
+
+def rss_bytes():
+    """Current resident set size, or None where it can't be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Peak, not current, but better than nothing
+    except ImportError:
+        return None
+
+class Instrumentation:
+    """Opt-in timing of event-loop work: how long callbacks run and how late they start.
+
+    Tk `after` callbacks on the root and every Scheduler job are measured automatically;
+    methods are wrapped with wrap_methods() or instrumented_class(). Other components can publish their own
+    figures through add_source().
+    """
+    def __init__(self, root):
+        self.root = root
+        self.durations = {}  # name -> Histogram of run time
+        self.lags = {}       # name -> Histogram of start delay past the requested time
+        self.sources = {}    # name -> callable returning a JSON-serialisable dict
+        self.started = time.monotonic()
+        self._patch_after()
+
+    def record(self, name, duration_ms, lag_ms=None):
+        self.durations.setdefault(name, Histogram()).record(duration_ms)
+        if lag_ms is not None:
+            self.lags.setdefault(name, Histogram()).record(max(0.0, lag_ms))
+
+    def measure(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def wrap_methods(self, obj, names):
+        """Replaces obj.<name> for each name with a timed version (recorded as Class.name)."""
+        for method_name in names:
+            method = getattr(obj, method_name, None)
+            if method is None:
+                continue
+            label = f"{type(obj).__name__}.{method_name}"
+            setattr(obj, method_name, functools.wraps(method)(functools.partial(self.measure, label, method)))
+
+    def instrumented_class(self, cls, names):
+        """Returns a subclass of cls whose methods `names` are timed.
+
+        Use it for classes whose __init__ hands its own bound methods to widgets (button
+        commands): wrapping the instance afterwards would miss those references.
+        """
+        def timed(method_name, method):
+            label = f"{cls.__name__}.{method_name}"
+
+            @functools.wraps(method)
+            def wrapper(obj, *args, **kwargs):
+                return self.measure(label, method, obj, *args, **kwargs)
+            return wrapper
+        overrides = {name: timed(name, getattr(cls, name)) for name in names if hasattr(cls, name)}
+        return type(cls.__name__, (cls,), dict(overrides, __module__=cls.__module__))
+
+    def _patch_after(self):
+        original = self.root.after
+
+        def after(ms, func=None, *args):
+            if func is None:
+                return original(ms)
+            due = time.perf_counter() + ms / 1000
+            name = "after:" + callback_name(func)
+
+            def timed(*call_args):
+                start = time.perf_counter()
+                try:
+                    return func(*call_args)
+                finally:
+                    end = time.perf_counter()
+                    self.record(name, (end - start) * 1000, (start - due) * 1000)
+            return original(ms, timed, *args)
+        self.root.after = after
+
+    def add_source(self, name, fn):
+        self.sources[name] = fn
+
+    def widget_count(self):
+        count, stack = 0, [self.root]
+        while stack:
+            widget = stack.pop()
+            count += 1
+            stack.extend(widget.winfo_children())
+        return count
+
+    def snapshot(self):
+        """Everything collected so far, as a JSON-serialisable dict."""
+        sources = {}
+        for name, fn in self.sources.items():
+            try:
+                sources[name] = fn()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+        return {
+            "uptime_sec": round(time.monotonic() - self.started, 1),
+            "rss_bytes": rss_bytes(),
+            "widgets": self.widget_count(),
+            "durations": {name: h.summary() for name, h in sorted(self.durations.items())},
+            "lags": {name: h.summary() for name, h in sorted(self.lags.items())},
+            "sources": sources,
+        }
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2, default=str)
+        return path
+
+    def reset(self):
+        self.durations.clear()
+        self.lags.clear()
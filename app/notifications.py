@@ -0,0 +1,149 @@
+# app/notifications.py
+import heapq
+import itertools
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import customtkinter as ctk
+from config import settings
+
+try:
+    from plyer import notification as plyer_notification
+except ImportError:
+    plyer_notification = None
+
+PRIORITIES = {"low": 0, "normal": 1, "high": 2}
+
+class _Toast(ctk.CTkFrame):
+    """One in-app notification: title, message and a close button."""
+    def __init__(self, parent, item, border_color, on_close):
+        super().__init__(parent, corner_radius=8, border_width=2, border_color=border_color)
+        self.item = item
+        self.grid_columnconfigure(0, weight=1)
+        self.title_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(weight="bold"), anchor="w")
+        self.title_label.grid(row=0, column=0, padx=(12, 0), pady=(8, 0), sticky="ew")
+        close_button = ctk.CTkButton(self, text="✕", width=24, height=24, fg_color="transparent", command=on_close)
+        close_button.grid(row=0, column=1, padx=6, pady=(6, 0))
+        self.message_label = ctk.CTkLabel(self, text="", wraplength=280, justify="left", anchor="w")
+        self.message_label.grid(row=1, column=0, columnspan=2, padx=12, pady=(0, 10), sticky="ew")
+        self.refresh()
+
+    def refresh(self):
+        count = f"  ×{self.item['count']}" if self.item['count'] > 1 else ""
+        self.title_label.configure(text=self.item['title'] + count)
+        self.message_label.configure(text=self.item['message'])
+
+class NotificationCenter:
+    """Non-modal notifications shown as toasts in the corner of the main window.
+
+    Unlike messagebox.showinfo, notify() returns at once and never runs a nested event
+    loop, so the timer, the reminders and animations keep running. Up to
+    NOTIFY_MAX_VISIBLE toasts are shown, the rest wait in a priority queue. A
+    notification with a `key` is coalesced with a queued or visible one with the same
+    key (shown as "×2"), and dropped if one was shown less than `min_interval_sec` ago.
+    A higher-priority notification sends the least important visible toast back to the queue.
+    With NOTIFY_DESKTOP, each notification also goes to the desktop (plyer, notify-send
+    or osascript) from a background thread.
+    """
+    def __init__(self, root, scheduler):
+        self.root = root
+        self.scheduler = scheduler
+        self._queue = []            # Heap of (-priority, seq, item)
+        self._visible = []          # _Toast widgets, oldest first
+        self._by_key = {}           # Key -> queued or visible item
+        self._last_shown = {}       # Key -> time.monotonic() it was last shown
+        self._seq = itertools.count()
+        self._stack = ctk.CTkFrame(root, fg_color="transparent")
+        self.stats = {"shown": 0, "coalesced": 0, "rate_limited": 0}
+
+    def notify(self, title, message, priority="normal", key=None, min_interval_sec=None):
+        """Queues a notification; returns False if it was rate-limited."""
+        if key is not None and key in self._by_key:
+            item = self._by_key[key]
+            item['count'] += 1
+            item['title'], item['message'] = title, message
+            if item.get('toast') is not None:
+                item['toast'].refresh()
+                self._schedule_dismiss(item)  # The newest occurrence gets the full display time
+            self.stats['coalesced'] += 1
+            return True
+        interval = settings.NOTIFY_MIN_INTERVAL_SEC if min_interval_sec is None else min_interval_sec
+        if key is not None and time.monotonic() - self._last_shown.get(key, -interval) < interval:
+            self.stats['rate_limited'] += 1
+            return False
+
+        item = {'title': title, 'message': message, 'priority': PRIORITIES[priority], 'key': key, 'count': 1,
+                'toast': None, 'dismiss_job': None}
+        if key is not None:
+            self._by_key[key] = item
+        heapq.heappush(self._queue, (-item['priority'], next(self._seq), item))
+        if settings.NOTIFY_DESKTOP:
+            send_desktop_notification(title, message)
+        self._show_next()
+        return True
+
+    def _show_next(self):
+        while self._queue:
+            if len(self._visible) >= settings.NOTIFY_MAX_VISIBLE:
+                # A more important notification takes the place of the least important toast
+                lowest = min(self._visible, key=lambda toast: toast.item['priority'])
+                if lowest.item['priority'] >= -self._queue[0][0]:
+                    break
+                self._hide(lowest.item)
+                heapq.heappush(self._queue, (-lowest.item['priority'], next(self._seq), lowest.item))
+            _, _, item = heapq.heappop(self._queue)
+            toast = _Toast(self._stack, item, self.root.theme["primary"], lambda item=item: self.dismiss(item))
+            toast.pack(side="bottom", fill="x", pady=(6, 0))
+            item['toast'] = toast
+            self._visible.append(toast)
+            if item['key'] is not None:
+                self._last_shown[item['key']] = time.monotonic()
+            self._schedule_dismiss(item)
+            self.stats['shown'] += 1
+        if self._visible:
+            self._stack.place(relx=1.0, rely=1.0, x=-20, y=-20, anchor="se")
+            self._stack.lift()
+
+    def _schedule_dismiss(self, item):
+        self.scheduler.cancel(item['dismiss_job'])
+        duration = settings.NOTIFY_DURATION_SEC * (2 if item['priority'] == PRIORITIES["high"] else 1)
+        item['dismiss_job'] = self.scheduler.call_later(duration, lambda: self.dismiss(item))
+
+    def _hide(self, item):
+        self.scheduler.cancel(item['dismiss_job'])
+        self._visible.remove(item['toast'])
+        item['toast'].destroy()
+        item['toast'] = None
+
+    def dismiss(self, item):
+        if item.get('toast') is None or item['toast'] not in self._visible:
+            return
+        self._hide(item)
+        if self._by_key.get(item['key']) is item:
+            del self._by_key[item['key']]
+        if not self._visible and not self._queue:
+            self._stack.place_forget()
+        self._show_next()
+
+    def snapshot(self):
+        return dict(self.stats, visible=len(self._visible), queued=len(self._queue))
+
+def send_desktop_notification(title, message):
+    """Best-effort desktop notification on a background thread; failures are printed, never raised."""
+    def send():
+        try:
+            if plyer_notification is not None:
+                plyer_notification.notify(title=title, message=message, app_name=settings.APP_NAME)
+            elif shutil.which("notify-send"):
+                subprocess.run(["notify-send", title, message], timeout=5, check=False)
+            elif sys.platform == "darwin":
+                script = f"display notification {_applescript(message)} with title {_applescript(title)}"
+                subprocess.run(["osascript", "-e", script], timeout=5, check=False)
+        except Exception as e:
+            print(f"Desktop notification failed: {e}")
+    threading.Thread(target=send, name="desktop-notify", daemon=True).start()
+
+def _applescript(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
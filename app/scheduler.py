@@ -0,0 +1,95 @@
+# app/scheduler.py
+import heapq
+import itertools
+import time
+from app.instrumentation import callback_name
+
+class _Job:
+    __slots__ = ("deadline", "callback", "interval", "cancelled")
+
+    def __init__(self, deadline, callback, interval):
+        self.deadline = deadline
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+
+class Scheduler:
+    """Single timer chain for the whole app, keyed to time.monotonic() deadlines.
+
+    Only one Tk `after` is ever pending: it is armed for the earliest deadline, and every
+    job due within COALESCE_SEC of that moment runs in the same wakeup. Periodic jobs are
+    anchored to their original deadline, so late wakeups never accumulate drift.
+    """
+    COALESCE_SEC = 0.015
+
+    def __init__(self, root):
+        self.root = root
+        self._heap = []
+        self._seq = itertools.count()
+        self._after_id = None
+        self._armed_for = None
+        self.wakeups = 0
+        self.instrumentation = None  # Set to an Instrumentation to time every job
+
+    def call_at(self, deadline, callback):
+        """Runs callback() once time.monotonic() reaches `deadline`. Returns a handle for cancel()."""
+        return self._push(_Job(deadline, callback, None))
+
+    def call_later(self, delay_sec, callback):
+        return self.call_at(time.monotonic() + delay_sec, callback)
+
+    def call_every(self, interval_sec, callback, first_delay_sec=None):
+        """Runs callback() every `interval_sec` seconds until cancelled."""
+        delay = interval_sec if first_delay_sec is None else first_delay_sec
+        return self._push(_Job(time.monotonic() + delay, callback, interval_sec))
+
+    def cancel(self, job):
+        if job is not None:
+            job.cancelled = True  # Dropped lazily when it reaches the top of the heap
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+        self._arm()
+        return job
+
+    def _arm(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return
+        deadline = self._heap[0][0]
+        if self._after_id is not None:
+            if self._armed_for <= deadline:
+                return  # Already waking up early enough
+            self.root.after_cancel(self._after_id)
+        delay_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        self._armed_for = deadline
+        self._after_id = self.root.after(delay_ms, self._run)
+
+    def _run(self):
+        self._after_id = None
+        self.wakeups += 1
+        horizon = time.monotonic() + self.COALESCE_SEC
+        due = []
+        while self._heap and self._heap[0][0] <= horizon:
+            _, _, job = heapq.heappop(self._heap)
+            if not job.cancelled:
+                due.append(job)
+
+        for job in due:
+            due_at = job.deadline
+            if job.interval is not None:
+                # Skip beats that were missed entirely instead of firing them back to back
+                job.deadline += job.interval
+                now = time.monotonic()
+                if job.deadline <= now:
+                    job.deadline += ((now - job.deadline) // job.interval + 1) * job.interval
+                heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+            started = time.monotonic()
+            try:
+                job.callback()
+            except Exception as e:
+                print(f"Scheduled callback {job.callback} failed: {e}")
+            if self.instrumentation is not None:
+                self.instrumentation.record("job:" + callback_name(job.callback), (time.monotonic() - started) * 1000, (started - due_at) * 1000)
+        self._arm()
@@ -1,109 +1,115 @@
 # app/ui/analytics_frame.py
 import customtkinter as ctk
-import pandas as pd
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import io
+import time
 from datetime import datetime, timedelta
 from config import settings # <<< THIS LINE WAS MISSING
+from data.aggregates import week_total
+from app.ui.theming import apply_theme
+from app.charts import CHART_BG_COLOR, chart_key
 
-# Define a consistent dark background color for charts
-CHART_BG_COLOR = "#2B2B2B" 
-CHART_FACE_COLOR = "#343638"
-CHART_TEXT_COLOR = "#FFFFFF"
+PIE_SIZE = (5, 4)  # Inches at 100 dpi, as the embedded figures used to be
+BAR_SIZE = (6, 4)
 
 class AnalyticsFrame(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, fg_color="transparent")
         self.controller = controller
-        
+
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
-        
+
+        # Charts are drawn to PNG by controller.chart_renderer; these track what is on screen
+        self._chart_keys = {"pie": None, "bar": None}     # Latest requested spec per chart
+        self._shown_keys = {"pie": None, "bar": None}     # Spec whose image is displayed
+        self._images = {}                                 # Keeps the CTkImages alive
+        self.last_render_ms = 0.0
+
         self._setup_widgets()
+        self.controller.chart_renderer.warm_up()
 
     def _setup_widgets(self):
         self.title_label = ctk.CTkLabel(self, text="Analytics Dashboard", font=ctk.CTkFont(size=24, weight="bold"))
         self.title_label.grid(row=0, column=0, padx=20, pady=20, sticky="w")
-        
+
         self.chart_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.chart_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=10)
         self.chart_frame.grid_columnconfigure((0, 1), weight=1)
         self.chart_frame.grid_rowconfigure(0, weight=1)
 
+        self.no_data_label = ctk.CTkLabel(self.chart_frame, text="No data to display.\nComplete a session to see analytics.", font=ctk.CTkFont(size=16))
+        self.chart_labels = {
+            "pie": ctk.CTkLabel(self.chart_frame, text="⏳ Drawing chart...", fg_color=CHART_BG_COLOR),
+            "bar": ctk.CTkLabel(self.chart_frame, text="⏳ Drawing chart...", fg_color=CHART_BG_COLOR),
+        }
+
         self.summary_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=14))
         self.summary_label.grid(row=2, column=0, padx=20, pady=20, sticky="w")
 
     def create_charts(self):
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-
-        try:
-            if 'logs_df' not in self.controller.app_data or not self.controller.app_data['logs_df']:
-                raise ValueError("No data to display.")
-            
-            df = pd.DataFrame(self.controller.app_data['logs_df'])
-            if df.empty:
-                raise ValueError("No data to display.")
-
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            mode_data = df.groupby('mode')['duration_sec'].sum()
-            if not mode_data.empty:
-                self.pie_chart_canvas = self._create_pie_chart(mode_data)
-                self.pie_chart_canvas.get_tk_widget().grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
-
-            task_data = df.groupby('label')['duration_sec'].sum() / 60
-            if not task_data.empty:
-                self.bar_chart_canvas = self._create_bar_chart(task_data)
-                self.bar_chart_canvas.get_tk_widget().grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
-
-            self._generate_summary(df)
-
-        except Exception as e:
-            no_data_label = ctk.CTkLabel(self.chart_frame, text=f"{e}\nComplete a session to see analytics.", font=ctk.CTkFont(size=16))
-            no_data_label.grid(row=0, column=0, columnspan=2, padx=20, pady=20)
+        """Requests the charts for the current aggregates; unchanged ones come straight from the cache."""
+        start = time.perf_counter()
+        totals = self.controller.store.aggregates
+
+        if totals['by_mode']:
+            self._show_charts()
+            for name, spec in self._chart_specs(totals).items():
+                key = self._chart_keys[name] = chart_key(spec)
+                if key != self._shown_keys[name]:
+                    self.controller.chart_renderer.get(
+                        spec, lambda png, error, name=name, key=key, spec=spec: self._on_chart_rendered(name, key, spec, png, error), key)
+            self._generate_summary()
+        else:
+            self._show_no_data()
             self.summary_label.configure(text="")
 
-    def _create_pie_chart(self, data):
-        fig = Figure(figsize=(5, 4), dpi=100, facecolor=CHART_BG_COLOR)
-        ax = fig.add_subplot(111)
-        pie_colors = [settings.THEMES[mode]['primary'] for mode in data.index if mode in settings.THEMES]
-        
-        ax.pie(data, labels=data.index, autopct='%1.1f%%', startangle=140,
-               colors=pie_colors,
-               textprops={'color': CHART_TEXT_COLOR, 'weight': 'bold'})
-        ax.set_title("Work vs. Study Time", color=CHART_TEXT_COLOR)
-        fig.tight_layout()
-        return FigureCanvasTkAgg(fig, master=self.chart_frame)
-
-    def _create_bar_chart(self, data):
-        fig = Figure(figsize=(6, 4), dpi=100, facecolor=CHART_BG_COLOR)
-        ax = fig.add_subplot(111)
-        
-        current_theme_color = self.controller.theme['primary']
-        data.plot(kind='barh', ax=ax, color=current_theme_color)
-        
-        ax.set_title("Time per Task (Minutes)", color=CHART_TEXT_COLOR)
-        ax.tick_params(axis='x', colors=CHART_TEXT_COLOR)
-        ax.tick_params(axis='y', colors=CHART_TEXT_COLOR)
-        ax.set_facecolor(CHART_FACE_COLOR)
-        ax.spines['top'].set_color(CHART_TEXT_COLOR)
-        ax.spines['bottom'].set_color(CHART_TEXT_COLOR)
-        ax.spines['left'].set_color(CHART_TEXT_COLOR)
-        ax.spines['right'].set_color(CHART_TEXT_COLOR)
-        fig.tight_layout()
-        return FigureCanvasTkAgg(fig, master=self.chart_frame)
-
-    def _generate_summary(self, df):
-        now = datetime.now()
-        start_of_this_week = now - timedelta(days=now.weekday())
-        start_of_last_week = start_of_this_week - timedelta(days=7)
-
-        this_week_df = df[df['timestamp'] >= start_of_this_week]
-        last_week_df = df[(df['timestamp'] >= start_of_last_week) & (df['timestamp'] < start_of_this_week)]
-
-        study_time_this_week = this_week_df[this_week_df['mode'] == 'Study']['duration_sec'].sum()
-        study_time_last_week = last_week_df[last_week_df['mode'] == 'Study']['duration_sec'].sum()
+        self.last_render_ms = (time.perf_counter() - start) * 1000
+        if self.last_render_ms > settings.ANALYTICS_RENDER_BUDGET_MS:
+            print(f"Analytics render took {self.last_render_ms:.1f} ms (budget {settings.ANALYTICS_RENDER_BUDGET_MS} ms).")
+
+    def _chart_specs(self, totals):
+        """Everything that determines how each chart looks, and so its cache key."""
+        dpi = round(100 * self._get_widget_scaling())
+        by_mode = dict(sorted(totals['by_mode'].items()))
+        by_label = dict(sorted(totals['by_label'].items()))
+        return {
+            "pie": {"kind": "pie", "title": "Work vs. Study Time", "size": PIE_SIZE, "dpi": dpi,
+                    "labels": list(by_mode), "values": list(by_mode.values()),
+                    "colors": [settings.THEMES[mode]['primary'] for mode in by_mode if mode in settings.THEMES]},
+            "bar": {"kind": "bar", "title": "Time per Task (Minutes)", "size": BAR_SIZE, "dpi": dpi,
+                    "labels": list(by_label), "values": [secs / 60 for secs in by_label.values()],
+                    "color": self.controller.theme['primary']},
+        }
+
+    def _on_chart_rendered(self, name, key, spec, png, error):
+        if key != self._chart_keys[name] or key == self._shown_keys[name]:
+            return  # Superseded by a newer request while it was drawing, or already on screen
+        if error is not None:
+            self.chart_labels[name].configure(text=f"Could not draw chart: {error}")
+            return
+        from PIL import Image
+        width, height = spec['size']
+        image = ctk.CTkImage(light_image=Image.open(io.BytesIO(png)), size=(width * 100, height * 100))
+        self._images[name] = image
+        self.chart_labels[name].configure(image=image, text="")
+        self._shown_keys[name] = key
+
+    def _show_charts(self):
+        self.no_data_label.grid_remove()
+        self.chart_labels["pie"].grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        self.chart_labels["bar"].grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+
+    def _show_no_data(self):
+        for label in self.chart_labels.values():
+            label.grid_remove()
+        self.no_data_label.grid(row=0, column=0, columnspan=2, padx=20, pady=20)
+
+    def _generate_summary(self):
+        today = datetime.now().date()
+        # Read from the persisted weekly buckets, so the session history never loads on the Tk thread
+        totals = self.controller.store.aggregates
+        study_time_this_week = week_total(totals, today, 'Study')
+        study_time_last_week = week_total(totals, today - timedelta(days=7), 'Study')
 
         summary_text = "💡 Keep up the great work logging your sessions!"
         if study_time_last_week > 0 and study_time_this_week < study_time_last_week:
@@ -114,8 +120,7 @@ class AnalyticsFrame(ctk.CTkFrame):
 
     def update_theme(self):
         theme = self.controller.theme
-        self.title_label.configure(text_color=theme["primary"])
-        
+        apply_theme([(self.title_label, {"text_color": theme["primary"]})])
+
     def on_show(self):
-        self.update_theme()
-        self.create_charts()
\ No newline at end of file
+        self.create_charts()
@@ -1,10 +1,17 @@
 # app/ui/breathing_frame.py
 import customtkinter as ctk
 import math
+import time
+from config import settings
+
+BREATH_CYCLE_SEC = 8.0  # 4 s in, 4 s out
+EASING_STEPS = 512
 
 class BreathingToplevel(ctk.CTkToplevel):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, scheduler, **kwargs):
         super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+        self._frame_job = None
         self.geometry("400x450")
         self.title("Breathing Exercise")
         self.resizable(False, False)
@@ -14,47 +21,78 @@ class BreathingToplevel(ctk.CTkToplevel):
         self.grid_rowconfigure(1, weight=1)
 
         self.animating = True
-        self.radius = 50
         self.max_radius = 120
         self.min_radius = 40
-        self.direction = 1  # 1 for expand, -1 for shrink
-        
+        self.center = 150
+
+        # Radius over one breath cycle, eased with a cosine; looked up by elapsed time
+        span = self.max_radius - self.min_radius
+        self.radius_table = [self.min_radius + span * (1 - math.cos(2 * math.pi * i / EASING_STEPS)) / 2
+                             for i in range(EASING_STEPS)]
+        # No point drawing faster than the circle can move one pixel at its fastest
+        peak_px_per_sec = math.pi * span / BREATH_CYCLE_SEC
+        self.frame_interval = max(1 / settings.BREATHING_MAX_FPS, 1 / peak_px_per_sec)
+
         self.instruction_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=24, weight="bold"))
         self.instruction_label.grid(row=0, column=0, pady=30)
-        
+
         self.canvas = ctk.CTkCanvas(self, width=300, height=300, bg="#2B2B2B", highlightthickness=0)
         self.canvas.grid(row=1, column=0, pady=20)
-        
-        self.after(50, self.start_animation)
+        # One canvas item for the whole exercise, moved with coords()
+        self.circle = self.canvas.create_oval(0, 0, 0, 0, fill="#3498db", outline="")
+
+        self._instruction = None
+        self._drawn_radius = None
+        self._start_time = None
+        self.frame_stats = {"frames": 0, "redraws": 0, "work_ms_total": 0.0, "work_ms_max": 0.0, "late_ms_max": 0.0}
+
+        self._frame_job = self.scheduler.call_later(0.05, self.start_animation)
 
     def start_animation(self):
-        self.animate()
+        self._start_time = time.monotonic()
+        self._frame_job = self.scheduler.call_every(self.frame_interval, self.animate, first_delay_sec=0)
+        self._next_frame_due = self._start_time
 
     def animate(self):
         if not self.animating: return
-        
-        if self.direction == 1:
-            self.instruction_label.configure(text="Breathe In...")
-            self.radius += 0.5
-            if self.radius >= self.max_radius:
-                self.direction = -1
-        else:
-            self.instruction_label.configure(text="Breathe Out...")
-            self.radius -= 0.5
-            if self.radius <= self.min_radius:
-                self.direction = 1
-        
-        self.draw_circle()
-        self.after(25, self.animate)
-
-    def draw_circle(self):
-        self.canvas.delete("all")
-        x0 = 150 - self.radius
-        y0 = 150 - self.radius
-        x1 = 150 + self.radius
-        y1 = 150 + self.radius
-        self.canvas.create_oval(x0, y0, x1, y1, fill="#3498db", outline="")
-        
+        started = time.perf_counter()
+        now = time.monotonic()
+
+        phase = ((now - self._start_time) % BREATH_CYCLE_SEC) / BREATH_CYCLE_SEC
+        self.set_instruction("Breathe In..." if phase < 0.5 else "Breathe Out...")
+        self.draw_circle(self.radius_table[int(phase * EASING_STEPS)])
+
+        # --- Frame-time measurement ---
+        stats = self.frame_stats
+        work_ms = (time.perf_counter() - started) * 1000
+        stats["frames"] += 1
+        stats["work_ms_total"] += work_ms
+        stats["work_ms_max"] = max(stats["work_ms_max"], work_ms)
+        stats["late_ms_max"] = max(stats["late_ms_max"], (now - self._next_frame_due) * 1000)
+        self._next_frame_due = self._frame_job.deadline
+
+    def set_instruction(self, text):
+        if text != self._instruction:
+            self.instruction_label.configure(text=text)
+            self._instruction = text
+
+    def draw_circle(self, radius):
+        radius = round(radius)
+        if radius == self._drawn_radius:
+            return
+        c = self.center
+        self.canvas.coords(self.circle, c - radius, c - radius, c + radius, c + radius)
+        self._drawn_radius = radius
+        self.frame_stats["redraws"] += 1
+
+    def get_frame_stats(self):
+        """Summary of the animation cost so far (frames run, redraws, per-frame work and lateness)."""
+        stats = dict(self.frame_stats)
+        stats["work_ms_mean"] = stats["work_ms_total"] / stats["frames"] if stats["frames"] else 0.0
+        stats["fps"] = 1 / self.frame_interval
+        return stats
+
     def on_close(self):
         self.animating = False
-        self.destroy()
\ No newline at end of file
+        self.scheduler.cancel(self._frame_job)
+        self.destroy()
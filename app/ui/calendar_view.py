@@ -2,6 +2,10 @@
 import tkinter as tk
 from tkinter import ttk
 import datetime
+from data.agenda import AgendaIndex
+
+AGENDA_DAYS = 7
+AGENDA_MAX_EVENTS = 250
 
 class CalendarViewFrame(ttk.Frame):
     def __init__(self, parent, controller):
@@ -23,50 +27,58 @@ class CalendarViewFrame(ttk.Frame):
         self.agenda_text = tk.Text(self, font=("Helvetica", 11), state=tk.DISABLED, relief=tk.FLAT)
         self.agenda_text.grid(row=1, column=0, sticky="nsew", padx=20, pady=10)
 
+        self.agenda = AgendaIndex()
+        self._tasks_seen = None
+        self._sections = []  # Lines currently shown per day, to rewrite only what changed
+
     def sync_calendar(self):
-        """Fetch events and rebuild the agenda view."""
-        self.sync_button.config(text="Syncing...")
-        self.update() # Force UI update
-        
-        # Fetch events from Google Calendar
-        events = self.controller.gcal_service.get_upcoming_events()
-        
-        self.update_agenda_display(events)
-        
-        self.sync_button.config(text="🔄 Sync with Google Calendar")
+        """Fetch events in the background and rebuild the agenda view when they arrive."""
+        self.sync_button.config(text="Syncing...", state=tk.DISABLED)
+        self.controller.gcal_service.get_upcoming_events(callback=self._on_events_fetched, max_results=AGENDA_MAX_EVENTS, force_sync=True)
 
-    def update_agenda_display(self, gcal_events=[]):
-        """Populates the text widget with tasks and calendar events."""
-        self.agenda_text.config(state=tk.NORMAL)
-        self.agenda_text.delete("1.0", tk.END)
+    def _on_events_fetched(self, events, error):
+        self.update_agenda_display(events or [])
+        self.sync_button.config(text="🔄 Sync with Google Calendar", state=tk.NORMAL)
+
+    def _refresh_tasks(self):
+        """Re-indexes the current mode's task deadlines, only when they changed since last time."""
+        mode = self.controller.current_mode.get()
+        index = self.controller.store.task_index(mode)
+        if (mode, index.version) != self._tasks_seen:
+            self.agenda.set_tasks(index.by_deadline())
+            self._tasks_seen = (mode, index.version)
+
+    def update_agenda_display(self, gcal_events=None):
+        """Shows tasks and calendar events for the next AGENDA_DAYS days, rewriting only the days that changed."""
+        if gcal_events is not None:
+            self.agenda.set_events(gcal_events)
+        self._refresh_tasks()
 
         today = datetime.date.today()
-        
-        for i in range(7): # Display for the next 7 days
+        on_days = dict(self.agenda.between(today, today + datetime.timedelta(days=AGENDA_DAYS)))
+        sections = []
+        for i in range(AGENDA_DAYS):
             current_day = today + datetime.timedelta(days=i)
-            day_str = current_day.strftime('%A, %B %d')
-            self.agenda_text.insert(tk.END, f"--- {day_str} ---\n", ('day_header',))
-            
-            # TODO: Add local tasks from planner frame here if they have due dates
-            
-            # Add Google Calendar events
-            day_has_event = False
-            for event in gcal_events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                event_date = datetime.datetime.fromisoformat(start.replace('Z', '+00:00')).date()
-                
-                if event_date == current_day:
-                    event_time = datetime.datetime.fromisoformat(start.replace('Z', '+00:00')).strftime('%I:%M %p') if 'T' in start else 'All-day'
-                    summary = event['summary']
-                    self.agenda_text.insert(tk.END, f"   GCal: {summary} ({event_time})\n")
-                    day_has_event = True
+            lines = [(f"--- {current_day.strftime('%A, %B %d')} ---", 'day_header')]
+            lines += on_days.get(current_day.isoformat()) or [("  No scheduled events.", 'no_event')]
+            lines.append(("", None))
+            sections.append(lines)
 
-            if not day_has_event:
-                 self.agenda_text.insert(tk.END, "  No scheduled events.\n", ('no_event',))
+        self.agenda_text.config(state=tk.NORMAL)
+        line = 1
+        for i, lines in enumerate(sections):
+            old = self._sections[i] if i < len(self._sections) else None
+            if lines != old:
+                if old:
+                    self.agenda_text.delete(f"{line}.0", f"{line + len(old)}.0")
+                for offset, (text, tag) in enumerate(lines):
+                    self.agenda_text.insert(f"{line + offset}.0", text + "\n", (tag,) if tag else ())
+            line += len(lines)
+        self._sections = sections
 
-            self.agenda_text.insert(tk.END, "\n")
-        
         # --- Styling ---
-        self.agenda_text.tag_configure('day_header', font=('Helvetica', 14, 'bold'), foreground=self.controller.theme["accent"])
+        theme = self.controller.theme
+        self.agenda_text.tag_configure('day_header', font=('Helvetica', 14, 'bold'), foreground=theme["primary"])
         self.agenda_text.tag_configure('no_event', foreground="gray")
-        self.agenda_text.config(state=tk.DISABLED, bg=self.controller.theme["bg"], fg=self.controller.theme["fg"])
\ No newline at end of file
+        self.agenda_text.tag_configure('task_done', foreground="gray", overstrike=True)
+        self.agenda_text.config(state=tk.DISABLED, bg=theme["bg"], fg=theme["text"])
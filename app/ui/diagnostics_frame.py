@@ -0,0 +1,87 @@
+# app/ui/diagnostics_frame.py
+import customtkinter as ctk
+from config import settings
+from app.ui.theming import apply_theme
+
+REFRESH_SEC = 1.0
+
+class DiagnosticsFrame(ctk.CTkFrame):
+    """Hidden panel (Ctrl+Shift+D) showing event-loop timings collected by app.instrumentation."""
+    def __init__(self, parent, controller):
+        super().__init__(parent, fg_color="transparent")
+        self.controller = controller
+        self._refresh_job = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.title_label = ctk.CTkLabel(self, text="Diagnostics", font=ctk.CTkFont(size=24, weight="bold"))
+        self.title_label.grid(row=0, column=0, padx=20, pady=20, sticky="w")
+
+        self.report_box = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        self.report_box.grid(row=1, column=0, sticky="nsew", padx=20, pady=10)
+
+        button_row = ctk.CTkFrame(self, fg_color="transparent")
+        button_row.grid(row=2, column=0, sticky="ew", padx=20, pady=(0, 20))
+        self.dump_button = ctk.CTkButton(button_row, text="Dump to JSON", command=self.dump)
+        self.dump_button.pack(side="left", padx=(0, 10))
+        self.reset_button = ctk.CTkButton(button_row, text="Reset", command=self.reset)
+        self.reset_button.pack(side="left")
+        self.status_label = ctk.CTkLabel(button_row, text="")
+        self.status_label.pack(side="left", padx=10)
+
+    def refresh(self):
+        if self.controller.current_frame_name != "DiagnosticsFrame":
+            # Hidden again: stop polling until the next on_show
+            self.controller.scheduler.cancel(self._refresh_job)
+            self._refresh_job = None
+            return
+        self._set_report(self._format_report())
+
+    def _format_report(self):
+        instrumentation = self.controller.instrumentation
+        if instrumentation is None:
+            return "Diagnostics are off. Set DIAGNOSTICS_ENABLED = True in config/settings.py and restart."
+
+        snapshot = instrumentation.snapshot()
+        rss = f"{snapshot['rss_bytes'] / 2**20:.1f} MiB" if snapshot['rss_bytes'] else "n/a"
+        lines = [f"Uptime {snapshot['uptime_sec']:.0f} s   Widgets {snapshot['widgets']}   RSS {rss}", ""]
+        lines.append(f"{'Callback':<48}{'count':>8}{'mean ms':>10}{'p95 ms':>9}{'max ms':>9}{'lag p95':>9}")
+        for name, stats in sorted(snapshot['durations'].items(), key=lambda item: -item[1]['max_ms']):
+            lag = snapshot['lags'].get(name)
+            lag_text = f"{lag['p95_ms']:>9.1f}" if lag else f"{'':>9}"
+            lines.append(f"{name[-47:]:<48}{stats['count']:>8}{stats['mean_ms']:>10.2f}{stats['p95_ms']:>9.1f}"
+                         f"{stats['max_ms']:>9.1f}{lag_text}")
+        for name, values in snapshot['sources'].items():
+            lines += ["", f"[{name}]"] + [f"  {key}: {value}" for key, value in values.items()]
+        return "\n".join(lines)
+
+    def _set_report(self, text):
+        self.report_box.configure(state="normal")
+        self.report_box.delete("1.0", "end")
+        self.report_box.insert("1.0", text)
+        self.report_box.configure(state="disabled")
+
+    def dump(self):
+        if self.controller.instrumentation is None:
+            return
+        try:
+            path = self.controller.instrumentation.dump(settings.DIAGNOSTICS_DUMP_PATH)
+            self.status_label.configure(text=f"Saved to {path}")
+        except IOError as e:
+            self.status_label.configure(text=f"Error saving diagnostics: {e}")
+
+    def reset(self):
+        if self.controller.instrumentation is not None:
+            self.controller.instrumentation.reset()
+        self.refresh()
+
+    def update_theme(self):
+        theme = self.controller.theme
+        button = {"fg_color": theme["primary"], "hover_color": theme["secondary"]}
+        apply_theme([(self.title_label, {"text_color": theme["primary"]}), (self.dump_button, button), (self.reset_button, button)])
+
+    def on_show(self):
+        self.refresh()
+        if self._refresh_job is None:
+            self._refresh_job = self.controller.scheduler.call_every(REFRESH_SEC, self.refresh)
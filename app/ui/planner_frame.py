@@ -3,6 +3,41 @@ import customtkinter as ctk
 from tkcalendar import DateEntry
 from tkinter import messagebox
 from datetime import datetime
+from app.ui.virtual_list import VirtualList
+from data.task_index import new_task_id
+from app.ui.theming import apply_theme
+
+PRIORITY_COLORS = {"High": "#E74C3C", "Medium": "#F39C12", "Low": "#3498DB"}
+
+# --- Recyclable rows for the virtualized task & event list ---
+class _TextRow(ctk.CTkLabel):
+    def __init__(self, parent, height, italic=False):
+        font = ctk.CTkFont(slant="italic") if italic else None
+        super().__init__(parent, text="", height=height, anchor="center" if italic else "w", font=font)
+        self._default_color = self.cget("text_color")
+
+    def update_row(self, data):
+        self.configure(text=data['text'], text_color=data.get('color', self._default_color))
+
+class _TaskRow(ctk.CTkFrame):
+    def __init__(self, parent, height, planner):
+        super().__init__(parent, height=height)
+        # Commands read the row's current data, so they stay correct when the row is recycled
+        self.check_var = ctk.StringVar(value="off")
+        self.checkbox = ctk.CTkCheckBox(self, text="", variable=self.check_var, onvalue="on", offvalue="off", command=lambda: planner.toggle_task_done(self.data['id']))
+        self.checkbox.pack(side="left", padx=10, pady=5)
+        delete_button = ctk.CTkButton(self, text="🗑️", width=30, command=lambda: planner.delete_task(self.data['id']), fg_color="#58181F", hover_color="#C21A09")
+        delete_button.pack(side="right", padx=10, pady=5)
+        self.priority_label = ctk.CTkLabel(self, text="", width=80, font=ctk.CTkFont(weight="bold"))
+        self.priority_label.pack(side="right", padx=10, pady=5)
+        self.deadline_label = ctk.CTkLabel(self, text="")
+        self.deadline_label.pack(side="right", padx=10, pady=5)
+
+    def update_row(self, task):
+        self.check_var.set("on" if task["done"] else "off")
+        self.checkbox.configure(text=task["text"])
+        self.priority_label.configure(text=task["priority"], text_color=PRIORITY_COLORS.get(task["priority"], "#3498DB"))
+        self.deadline_label.configure(text=f"Due: {task['deadline']}")
 
 class PlannerFrame(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -13,7 +48,6 @@ class PlannerFrame(ctk.CTkFrame):
         self.grid_rowconfigure(1, weight=1)
 
         self._setup_widgets()
-        self.update_theme()
 
     def _setup_widgets(self):
         # --- Create Tab View ---
@@ -30,8 +64,16 @@ class PlannerFrame(ctk.CTkFrame):
         self.setup_event_tab()
 
         # --- Task & Event List (remains the same) ---
-        self.task_list_frame = ctk.CTkScrollableFrame(self, label_text="Task & Event List")
+        # Only the rows in view get widgets; they are recycled as the list scrolls or changes
+        self.task_list_frame = VirtualList(self, label_text="Task & Event List", row_height=44, row_factories={
+            "header": lambda parent, height: _TextRow(parent, height, italic=True),
+            "info": _TextRow,
+            "task": lambda parent, height: _TaskRow(parent, height, self),
+        })
         self.task_list_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self._gcal_items = []
+        self._task_items = []
+        self._gcal_request = 0
 
     def setup_task_tab(self):
         task_tab = self.tab_view.tab("Add Task")
@@ -89,16 +131,13 @@ class PlannerFrame(ctk.CTkFrame):
         task_text = self.task_entry.get().strip()
         if not task_text: return messagebox.showwarning("Warning", "Task cannot be empty.")
             
-        task = { "text": task_text, "deadline": self.date_entry.get_date().strftime('%Y-%m-%d'), "priority": self.priority_menu.get(), "done": False }
+        task = { "id": new_task_id(), "text": task_text, "deadline": self.date_entry.get_date().strftime('%Y-%m-%d'), "priority": self.priority_menu.get(), "done": False }
         
         mode = self.controller.current_mode.get()
-        if 'tasks' not in self.controller.app_data: self.controller.app_data['tasks'] = {"Work": [], "Study": []}
-        self.controller.app_data['tasks'][mode].append(task)
+        self.controller.commit({"op": "task_add", "mode": mode, "task": task})
         
         if self.sync_to_gcal_check.get():
-            event = self.controller.gcal_service.create_all_day_event(f"[{mode}] {task_text}", task['deadline'])
-            if event: messagebox.showinfo("Success", "Task added as an all-day event to Google Calendar.")
-            else: messagebox.showerror("Error", "Could not create Google Calendar event.")
+            self.controller.gcal_service.create_all_day_event(f"[{mode}] {task_text}", task['deadline'], callback=self._on_task_event_created)
 
         self.task_entry.delete(0, 'end')
         self.refresh_task_list()
@@ -118,80 +157,94 @@ class PlannerFrame(ctk.CTkFrame):
             if end_dt <= start_dt:
                 return messagebox.showerror("Error", "End time must be after start time.")
 
-            event = self.controller.gcal_service.create_timed_event(summary, start_dt.isoformat(), end_dt.isoformat())
-            if event:
-                messagebox.showinfo("Success", f"Event '{summary}' was added to your Google Calendar.")
-                self.refresh_task_list()
-            else:
-                messagebox.showerror("Error", "Could not create event. Check console for details.")
+            # Queued in the outbox; the event is sent in the background and survives restarts
+            self.controller.gcal_service.create_timed_event(summary, start_dt.isoformat(), end_dt.isoformat(),
+                                                            callback=lambda event, error: self._on_event_created(summary, event))
+            self.event_summary_entry.delete(0, 'end')
+            self.refresh_task_list()
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
-    # The rest of the file (refresh_task_list, display helpers, update_theme, on_show) remains IDENTICAL to the previous version
+    # --- Google Calendar callbacks (run on the Tk thread once the worker is done) ---
+    def _on_task_event_created(self, event, error):
+        if event: self.controller.notify("Success", "Task added as an all-day event to Google Calendar.", key="gcal", min_interval_sec=0)
+        else: self.controller.notify("Error", "Could not create Google Calendar event.", priority="high", key="gcal-error", min_interval_sec=0)
+
+    def _on_event_created(self, summary, event):
+        if event:
+            self.controller.notify("Success", f"Event '{summary}' was added to your Google Calendar.", key="gcal", min_interval_sec=0)
+            self.refresh_task_list()
+        else:
+            self.controller.notify("Error", "Could not create event. Check console for details.", priority="high", key="gcal-error", min_interval_sec=0)
+
+    # --- Task & Event List ---
     def refresh_task_list(self):
-        for widget in self.task_list_frame.winfo_children():
-            widget.destroy()
-        self.display_gcal_events()
         self.display_local_tasks()
+        self.display_gcal_events()
+        self._render_list()
+
+    def _render_list(self):
+        self.task_list_frame.set_items(self._gcal_items + self._task_items)
 
     def display_gcal_events(self):
-        gcal_label = ctk.CTkLabel(self.task_list_frame, text="--- Upcoming Google Calendar Events ---", font=ctk.CTkFont(slant="italic"))
-        gcal_label.pack(fill="x", padx=5, pady=(10, 5))
-        try:
-            events = self.controller.gcal_service.get_upcoming_events()
-            if not events:
-                ctk.CTkLabel(self.task_list_frame, text="No upcoming events found.").pack(padx=5, pady=2)
-                return
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                time_str = dt.strftime('%b %d, %I:%M %p') if 'T' in start else dt.strftime('%b %d, All-day')
-                event_widget = ctk.CTkLabel(self.task_list_frame, text=f"🗓️ {event['summary']} ({time_str})", anchor="w")
-                event_widget.pack(fill="x", padx=5, pady=2)
-        except Exception as e:
-            ctk.CTkLabel(self.task_list_frame, text=f"Error fetching Google Calendar events: {e}", text_color="red").pack(padx=5, pady=2)
+        gcal = self.controller.gcal_service
+        pending_text = "⏳ Connecting to Google Calendar..." if gcal.state == gcal.PENDING else "⏳ Loading events..."
+        self._gcal_items = [
+            ("gcal-header", "header", {'text': "--- Upcoming Google Calendar Events ---"}),
+            ("gcal-status", "info", {'text': pending_text, 'color': "gray"}),
+        ]
+        # Results for an older request are dropped
+        self._gcal_request += 1
+        request = self._gcal_request
+        gcal.get_upcoming_events(callback=lambda events, error: self._show_gcal_events(request, events, error))
+
+    def _show_gcal_events(self, request, events, error):
+        if request != self._gcal_request:
+            return
+        items = [("gcal-header", "header", {'text': "--- Upcoming Google Calendar Events ---"})]
+        queued = len(self.controller.gcal_service.outbox)
+        if queued:
+            items.append(("gcal-outbox", "info", {'text': f"📤 {queued} event(s) waiting to be sent to Google Calendar", 'color': "gray"}))
+        if error:
+            items.append(("gcal-status", "info", {'text': f"Error fetching Google Calendar events: {error}", 'color': "red"}))
+        elif not events:
+            items.append(("gcal-status", "info", {'text': "No upcoming events found."}))
+        for event in events or []:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
+            time_str = dt.strftime('%b %d, %I:%M %p') if 'T' in start else dt.strftime('%b %d, All-day')
+            items.append((("event", event.get('id', start)), "info", {'text': f"🗓️ {event['summary']} ({time_str})"}))
+        self._gcal_items = items
+        self._render_list()
 
     def display_local_tasks(self):
-        local_label = ctk.CTkLabel(self.task_list_frame, text="--- Your Local Tasks ---", font=ctk.CTkFont(slant="italic"))
-        local_label.pack(fill="x", padx=5, pady=(20, 5))
         mode = self.controller.current_mode.get()
-        tasks = self.controller.app_data.get('tasks', {}).get(mode, [])
-        priority_map = {"High": 1, "Medium": 2, "Low": 3}
-        sorted_tasks = sorted(tasks, key=lambda t: (t['done'], priority_map.get(t['priority'], 3)))
-        for i, task in enumerate(sorted_tasks):
-            self.create_task_widget(task, i).pack(fill="x", padx=5, pady=5)
-
-    def create_task_widget(self, task, index):
-        task_frame = ctk.CTkFrame(self.task_list_frame)
-        check_var = ctk.StringVar(value="on" if task["done"] else "off")
-        checkbox = ctk.CTkCheckBox(task_frame, text=task["text"], variable=check_var, onvalue="on", offvalue="off", command=lambda i=index: self.toggle_task_done(i))
-        checkbox.pack(side="left", padx=10, pady=10)
-        delete_button = ctk.CTkButton(task_frame, text="🗑️", width=30, command=lambda i=index: self.delete_task(i), fg_color="#58181F", hover_color="#C21A09")
-        delete_button.pack(side="right", padx=10, pady=10)
-        priority_colors = {"High": "#E74C3C", "Medium": "#F39C12", "Low": "#3498DB"}
-        priority_label = ctk.CTkLabel(task_frame, text=task["priority"], width=80, text_color=priority_colors.get(task["priority"]), font=ctk.CTkFont(weight="bold"))
-        priority_label.pack(side="right", padx=10, pady=10)
-        deadline_label = ctk.CTkLabel(task_frame, text=f"Due: {task['deadline']}")
-        deadline_label.pack(side="right", padx=10, pady=10)
-        return task_frame
-        
-    def toggle_task_done(self, index):
+        # The index keeps tasks in display order as they change, so nothing is re-sorted here
+        ordered = self.controller.store.task_index(mode).by_priority()
+        self._task_items = [("tasks-header", "header", {'text': "--- Your Local Tasks ---"})]
+        self._task_items += [(("task", task['id']), "task", task) for task in ordered]
+
+    def toggle_task_done(self, task_id):
         mode = self.controller.current_mode.get()
-        self.controller.app_data['tasks'][mode][index]['done'] = not self.controller.app_data['tasks'][mode][index]['done']
+        done = self.controller.store.task_index(mode).get(task_id)['done']
+        self.controller.commit({"op": "task_update", "mode": mode, "id": task_id, "fields": {"done": not done}})
         self.refresh_task_list()
         
-    def delete_task(self, index):
+    def delete_task(self, task_id):
         mode = self.controller.current_mode.get()
-        self.controller.app_data['tasks'][mode].pop(index)
+        self.controller.commit({"op": "task_delete", "mode": mode, "id": task_id})
         self.refresh_task_list()
 
     def update_theme(self):
         theme = self.controller.theme
-        self.tab_view.configure(segmented_button_selected_color=theme["primary"], segmented_button_selected_hover_color=theme["secondary"])
-        self.task_list_frame.configure(label_text_color=theme["primary"])
-        self.add_task_button.configure(fg_color=theme["primary"], hover_color=theme["secondary"])
-        self.add_event_button.configure(fg_color=theme["primary"], hover_color=theme["secondary"])
-        self.refresh_task_list()
+        button = {"fg_color": theme["primary"], "hover_color": theme["secondary"]}
+        apply_theme([
+            (self.tab_view, {"segmented_button_selected_color": theme["primary"], "segmented_button_selected_hover_color": theme["secondary"]}),
+            (self.task_list_frame, {"label_text_color": theme["primary"]}),
+            (self.add_task_button, button),
+            (self.add_event_button, button),
+        ])
 
     def on_show(self):
-        self.update_theme()
\ No newline at end of file
+        # Tasks are per mode, so this also covers a mode switch while the planner is visible
+        self.refresh_task_list()
\ No newline at end of file
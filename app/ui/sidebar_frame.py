@@ -1,6 +1,7 @@
 # app/ui/sidebar_frame.py
 import customtkinter as ctk
 from config import settings
+from app.ui.theming import apply_theme
 
 class SidebarFrame(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -42,7 +43,9 @@ class SidebarFrame(ctk.CTkFrame):
     # <<< NEW: Method to update the label's text >>>
     def update_hydration_label(self, seconds_left):
         minutes, seconds = divmod(seconds_left, 60)
-        self.hydration_label.configure(text=f"💧 Water: {minutes:02d}:{seconds:02d}")
+        text = f"💧 Water: {minutes:02d}:{seconds:02d}"
+        if text != self.hydration_label.cget("text"):
+            self.hydration_label.configure(text=text)
 
     def toggle_mode(self):
         new_mode = "Study" if self.mode_switch.get() == 1 else "Work"
@@ -50,5 +53,4 @@ class SidebarFrame(ctk.CTkFrame):
 
     def update_theme(self):
         theme = self.controller.theme
-        self.logo_label.configure(text_color=theme["primary"])
-        self.mode_switch.configure(progress_color=theme["secondary"])
\ No newline at end of file
+        apply_theme([(self.logo_label, {"text_color": theme["primary"]}), (self.mode_switch, {"progress_color": theme["secondary"]})])
\ No newline at end of file
@@ -0,0 +1,17 @@
+# app/ui/theming.py
+
+def apply_theme(targets):
+    """Applies [(widget, options)] in one pass.
+
+    Every customtkinter configure() call redraws the widget, so options are merged into a
+    single call per widget, and options a widget already has are left out entirely.
+    """
+    merged = {}
+    for widget, options in targets:
+        merged.setdefault(widget, {}).update(options)
+    for widget, options in merged.items():
+        current = getattr(widget, '_theme_options', {})
+        changed = {key: value for key, value in options.items() if current.get(key) != value}
+        if changed:
+            widget.configure(**changed)
+            widget._theme_options = dict(current, **changed)
@@ -1,8 +1,11 @@
 # app/ui/timer_frame.py
 import customtkinter as ctk
+import math
+import time
 from tkinter import messagebox
 from config import settings
 from app.ui.breathing_frame import BreathingToplevel
+from app.ui.theming import apply_theme
 
 class TimerFrame(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -14,6 +17,8 @@ class TimerFrame(ctk.CTkFrame):
         self.time_left = self.get_focus_duration_seconds() # Use new method to get duration
         self.current_session_type = "Focus"
         self._timer_job = None
+        self.end_time = None  # time.monotonic() deadline while running
+        self._displayed_text = None
 
         self._setup_widgets()
         self.update_timer_display()
@@ -64,8 +69,6 @@ class TimerFrame(ctk.CTkFrame):
         
         self.breathing_button = ctk.CTkButton(self, text="🌬️ Take a Breathing Break", command=self.open_breathing_exercise, fg_color="grey")
         self.breathing_button.grid(row=5, column=0, pady=(10, 20))
-        
-        self.update_theme()
 
     # <<< NEW: Method to get the focus duration >>>
     def get_focus_duration_seconds(self):
@@ -85,8 +88,8 @@ class TimerFrame(ctk.CTkFrame):
                     raise ValueError("Duration must be positive.")
                 
                 # Save the new setting persistently
-                self.controller.app_data['custom_pomodoro_minutes'] = minutes
-                messagebox.showinfo("Success", f"Focus timer updated to {minutes} minutes.")
+                self.controller.commit({'op': 'set', 'key': 'custom_pomodoro_minutes', 'value': minutes})
+                self.controller.notify("Success", f"Focus timer updated to {minutes} minutes.", priority="low", key="focus-time", min_interval_sec=0)
 
                 # If the current session is a Focus session, update the timer immediately
                 if self.current_session_type == "Focus" and not self.timer_running:
@@ -111,42 +114,60 @@ class TimerFrame(ctk.CTkFrame):
     def open_breathing_exercise(self):
         # ... (no change)
         if not hasattr(self, 'breathing_window') or not self.breathing_window.winfo_exists():
-            self.breathing_window = BreathingToplevel(self)
+            self.breathing_window = BreathingToplevel(self, scheduler=self.controller.scheduler)
         self.breathing_window.focus()
 
     def start_timer(self):
-        # ... (no change)
         if self.timer_running: return
         self.timer_running = True
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
-        self.tick()
+        # Remaining time is always derived from this deadline, so late callbacks can't cause drift
+        self.end_time = time.monotonic() + self.time_left
+        self._schedule_tick()
+        self.controller.timer_changed(True, duration_sec=self.time_left, session_type=self.current_session_type,
+                                      mode=self.controller.current_mode.get(),
+                                      label=self.session_label_entry.get().strip() or "Unlabeled Session")
 
     def stop_timer(self):
-        # ... (no change)
         if not self.timer_running: return
         self.timer_running = False
-        if self._timer_job:
-            self.after_cancel(self._timer_job)
-            self._timer_job = None
+        self.controller.scheduler.cancel(self._timer_job)
+        self._timer_job = None
+        self.time_left = self._remaining_seconds()
+        self.end_time = None
         self.start_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
+        self.controller.timer_changed(False)
 
     def reset_timer(self):
         self.stop_timer()
         self.set_timer(self.current_session_type)
 
+    def _remaining_seconds(self):
+        # The scheduler may run us up to COALESCE_SEC early; don't show the old second then
+        remaining = self.end_time - time.monotonic() - self.controller.scheduler.COALESCE_SEC
+        return max(0, math.ceil(remaining))
+
+    def _schedule_tick(self):
+        # Wake up exactly when the displayed second changes
+        self._timer_job = self.controller.scheduler.call_at(self.end_time - (self.time_left - 1), self.tick)
+
     def tick(self):
-        if self.timer_running and self.time_left > 0:
-            self.time_left -= 1
-            self.update_timer_display()
-            self._timer_job = self.after(1000, self.tick)
-        elif self.time_left == 0:
+        if not self.timer_running: return
+        self.time_left = self._remaining_seconds()
+        self.update_timer_display()
+        if self.time_left <= 0:
             self.timer_finished()
+        else:
+            self._schedule_tick()
 
     def update_timer_display(self):
         minutes, seconds = divmod(self.time_left, 60)
-        self.timer_label.configure(text=f"{minutes:02d}:{seconds:02d}")
+        text = f"{minutes:02d}:{seconds:02d}"
+        if text != self._displayed_text:
+            self.timer_label.configure(text=text)
+            self._displayed_text = text
 
     def timer_finished(self):
         self.stop_timer()
@@ -161,20 +182,19 @@ class TimerFrame(ctk.CTkFrame):
             message = "Break finished! Ready for the next focus session?"
             self.wellness_reminder()
 
-        messagebox.showinfo("Session Complete", message)
+        self.controller.notify("Session Complete", message, priority="high", key="session", min_interval_sec=0)
         self.set_timer("Short Break" if self.current_session_type == "Focus" else "Focus")
 
     def wellness_reminder(self):
         reminders = [ "💧 Hydrate now!", "👀 Take a 5-min eye break!", "🧘 Stretch your neck" ]
         import random
-        messagebox.showinfo("Wellness Reminder", random.choice(reminders))
+        self.controller.notify("Wellness Reminder", random.choice(reminders), priority="low", key="wellness")
         
     def update_theme(self):
         theme = self.controller.theme
-        self.timer_label.configure(text_color=theme["primary"])
-        self.start_button.configure(fg_color=theme["primary"], hover_color=theme["secondary"])
         self.mode = self.controller.current_mode.get()
-        self.mode_indicator.configure(text=f"{'🧑‍💻' if self.mode == 'Work' else '📖'} {self.mode} Mode")
-
-    def on_show(self):
-        self.update_theme()
\ No newline at end of file
+        apply_theme([
+            (self.timer_label, {"text_color": theme["primary"]}),
+            (self.start_button, {"fg_color": theme["primary"], "hover_color": theme["secondary"]}),
+            (self.mode_indicator, {"text": f"{'🧑‍💻' if self.mode == 'Work' else '📖'} {self.mode} Mode"}),
+        ])
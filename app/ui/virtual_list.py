@@ -0,0 +1,130 @@
+# app/ui/virtual_list.py
+import customtkinter as ctk
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that only creates widgets for the rows currently in view.
+
+    Items are (key, kind, data) tuples. Row widgets are built per kind by
+    `row_factories[kind](parent, height)` and filled by `row.update_row(data)`; rows that
+    scroll out of view go back to a pool and are reused. set_items() diffs by key,
+    so an update that changes one item only touches that item's row.
+    """
+    def __init__(self, parent, row_factories, row_height=44, label_text="", **kwargs):
+        super().__init__(parent, **kwargs)
+        self.row_factories = row_factories
+        self.row_height = row_height
+        self.items = []
+        self.offset = 0          # Scroll position in pixels
+        self.visible = {}        # key -> row currently placed
+        self.pool = {kind: [] for kind in row_factories}
+        self.rows_updated = 0    # Rows whose content was (re)written, for benchmarks
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.label = ctk.CTkLabel(self, text=label_text, font=ctk.CTkFont(weight="bold"))
+        self.label.grid(row=0, column=0, columnspan=2, pady=(5, 0))
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=1, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", pady=5)
+
+        self.viewport.bind("<Configure>", lambda e: self._layout())
+        self._bind_wheel(self.viewport)
+
+    def configure(self, require_redraw=False, label_text=None, label_text_color=None, **kwargs):
+        if label_text is not None:
+            self.label.configure(text=label_text)
+        if label_text_color is not None:
+            self.label.configure(text_color=label_text_color)
+        if kwargs:
+            super().configure(require_redraw=require_redraw, **kwargs)
+
+    # --- Data ---
+    def set_items(self, items):
+        """Replaces the list contents; only rows whose key, position or data changed are touched."""
+        self.items = items
+        self._clamp_offset()
+        self._layout()
+
+    # --- Scrolling ---
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel, add="+")
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-self.row_height), add="+")
+        widget.bind("<Button-5>", lambda e: self.scroll_by(self.row_height), add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _on_wheel(self, event):
+        self.scroll_by(-self.row_height if event.delta > 0 else self.row_height)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.offset = float(value) * self._content_height()
+        elif action == "scroll":
+            self.offset += int(value) * self.row_height
+        self._clamp_offset()
+        self._layout()
+
+    def scroll_by(self, pixels):
+        self.offset += pixels
+        self._clamp_offset()
+        self._layout()
+
+    def _content_height(self):
+        return len(self.items) * self.row_height
+
+    def _clamp_offset(self):
+        max_offset = max(0, self._content_height() - self.viewport.winfo_height())
+        self.offset = min(max(0, self.offset), max_offset)
+
+    # --- Rendering ---
+    def _layout(self):
+        height = max(self.viewport.winfo_height(), self.row_height)
+        first = int(self.offset // self.row_height)
+        last = min(len(self.items), first + height // self.row_height + 2)
+        wanted = {self.items[i][0]: i for i in range(first, last)}
+
+        # Release rows that scrolled out of view (or whose key disappeared)
+        for key in [k for k in self.visible if k not in wanted]:
+            self._release(self.visible.pop(key))
+
+        for key, index in wanted.items():
+            _, kind, data = self.items[index]
+            row = self.visible.get(key)
+            if row is not None and row.kind != kind:
+                self._release(row)
+                row = None
+            if row is None:
+                row = self._acquire(kind)
+                self.visible[key] = row
+            if row.data != data:
+                row.update_row(data)
+                row.data = dict(data) if isinstance(data, dict) else data
+                self.rows_updated += 1
+            y = index * self.row_height - self.offset
+            if row.y != y:
+                row.place(x=0, y=y, relwidth=1)
+                row.y = y
+
+        content = self._content_height()
+        if content <= height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / content, (self.offset + height) / content)
+
+    def _acquire(self, kind):
+        if self.pool[kind]:
+            return self.pool[kind].pop()
+        row = self.row_factories[kind](self.viewport, self.row_height)
+        row.kind = kind
+        row.data = None
+        row.y = None
+        self._bind_wheel(row)
+        return row
+
+    def _release(self, row):
+        row.place_forget()
+        row.y = None
+        self.pool[row.kind].append(row)
@@ -0,0 +1,87 @@
+# benchmarks/analytics_render.py
+"""Measures AnalyticsFrame per-visit cost on the Tk thread, time until charts first appear, and memory growth across repeated tab switches.
+
+Run with: python -m benchmarks.analytics_render [visits]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import customtkinter as ctk
+from config import settings
+from data import aggregates
+from app.charts import ChartRenderer
+from app.scheduler import Scheduler
+from app.ui.analytics_frame import AnalyticsFrame
+
+MAX_MEMORY_GROWTH_KB = 512  # Python heap growth allowed across all visits after the first
+
+def _fake_controller(root, session_count=5000, label_count=20):
+    entries = [{'timestamp': f"2026-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}T09:00:00",
+                'label': f"Task {random.randrange(label_count)}",
+                'duration_sec': 25 * 60,
+                'mode': random.choice(list(settings.THEMES))} for _ in range(session_count)]
+    store = SimpleNamespace(aggregates=aggregates.rebuild(entries))
+    scheduler = Scheduler(root)
+    return SimpleNamespace(store=store, theme=settings.THEMES["Work"], scheduler=scheduler,
+                           chart_renderer=ChartRenderer(scheduler))
+
+def _wait_for_charts(root, frame, timeout_sec=60):
+    deadline = time.monotonic() + timeout_sec
+    while frame._shown_keys != frame._chart_keys and time.monotonic() < deadline:
+        root.update()
+        time.sleep(0.005)
+
+def run(visits=200):
+    root = ctk.CTk()
+    controller = _fake_controller(root)
+    frame = AnalyticsFrame(root, controller)
+    frame.pack(fill="both", expand=True)
+
+    # First visit starts the worker processes; it is reported but not bounded
+    start = time.perf_counter()
+    frame.on_show()
+    first_ms = frame.last_render_ms
+    _wait_for_charts(root, frame)
+    first_chart_ms = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    timings = []
+    for i in range(visits):
+        if i % 10 == 0:
+            # Every tenth visit sees one new session, so the bar chart is re-rendered in a worker
+            entry = {'timestamp': "2026-06-01T10:00:00", 'label': "Task 0", 'duration_sec': 60, 'mode': "Work"}
+            aggregates.add_session(controller.store.aggregates, entry)
+        start = time.perf_counter()
+        frame.on_show()
+        root.update()
+        timings.append((time.perf_counter() - start) * 1000)
+    growth_kb = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, 'filename')) / 1024
+    tracemalloc.stop()
+    _wait_for_charts(root, frame)
+    cache = controller.chart_renderer.stats()
+    controller.chart_renderer.close()
+    root.destroy()
+
+    timings.sort()
+    result = {
+        "first_visit_ms": round(first_ms, 2),
+        "first_charts_shown_ms": round(first_chart_ms, 1),
+        "chart_cache_hits": cache["hits"],
+        "chart_renders": cache["misses"],
+        "median_visit_ms": round(timings[len(timings) // 2], 2),
+        "p95_visit_ms": round(timings[int(len(timings) * 0.95)], 2),
+        "memory_growth_kb": round(growth_kb, 1),
+    }
+    result["within_budget"] = (result["p95_visit_ms"] <= settings.ANALYTICS_RENDER_BUDGET_MS
+                               and growth_kb <= MAX_MEMORY_GROWTH_KB)
+    return result
+
+if __name__ == "__main__":
+    result = run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    sys.exit(0 if result["within_budget"] else 1)
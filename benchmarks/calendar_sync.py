@@ -0,0 +1,84 @@
+# benchmarks/calendar_sync.py
+"""Benchmarks the calendar sync, cached refresh and batched write paths against the fake backend.
+
+Run with: python -m benchmarks.calendar_sync [events] [latency_ms]
+No credentials or network access are needed.
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from services.calendar_events import all_day_event_body, timed_event_body
+from services.event_cache import EventCache
+from services.fake_calendar import FakeCalendar
+from services.google_calendar import GoogleCalendarService
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def check_round_trip(service, cache):
+    """Raises AssertionError unless events written through `service` can be listed by EventCache.upcoming.
+
+    The event bodies include a naive dateTime, as older clients sent, to check the transport
+    hands back times the way the API does.
+    """
+    start = datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(days=1)
+    end = start + datetime.timedelta(hours=1)
+    events = [dict(timed_event_body("Round trip", start.isoformat(), end.isoformat()), id="roundtrip0001"),
+              {'id': "roundtrip0002", 'summary': "Round trip (naive)",
+               'start': {'dateTime': start.isoformat()}, 'end': {'dateTime': end.isoformat()}}]
+    results = service.insert_events_batch(events)
+    created = [event for event, status in results.values() if status is None]
+    assert len(created) == len(events), f"Round-trip inserts failed: {results}"
+    cache.upsert(created)
+    listed = {event['id'] for event in cache.upcoming(len(cache.events))}
+    assert listed >= {event['id'] for event in events}, "Round-tripped events are missing from upcoming()"
+
+def run(event_count=5000, latency_ms=50, refreshes=100, writes=200):
+    with tempfile.TemporaryDirectory() as folder:
+        return _run(folder, event_count, latency_ms, refreshes, writes)
+
+def _run(folder, event_count, latency_ms, refreshes, writes):
+    calendar = FakeCalendar(latency_ms=latency_ms, seed=1)
+    calendar.seed_events(event_count)
+    service = GoogleCalendarService(transport=calendar)
+    cache = EventCache(path=os.path.join(folder, "gcal_cache.json"))
+    results = {"events": event_count, "latency_ms": latency_ms}
+
+    # Full sync
+    before = calendar.request_count
+    (items, token, full), elapsed = _timed(lambda: service.sync_events(None))
+    cache.apply_sync(items, token, full)
+    results["full_sync"] = {"ms": round(elapsed, 1), "requests": calendar.request_count - before, "items": len(items)}
+
+    # Incremental sync after a handful of remote changes
+    for event_id in list(calendar.stored)[:10]:
+        calendar.update_event(event_id, summary="Changed")
+    before = calendar.request_count
+    (items, token, full), elapsed = _timed(lambda: service.sync_events(cache.sync_token))
+    cache.apply_sync(items, token, full)
+    results["incremental_sync"] = {"ms": round(elapsed, 1), "requests": calendar.request_count - before, "items": len(items)}
+
+    # Planner refreshes served from the cache
+    before = calendar.request_count
+    _, elapsed = _timed(lambda: [cache.upcoming(15) for _ in range(refreshes)])
+    results["cached_refresh"] = {"ms_per_refresh": round(elapsed / refreshes, 3), "requests": calendar.request_count - before}
+
+    check_round_trip(service, cache)
+
+    # One outbox flush worth of writes
+    events = [dict(all_day_event_body(f"Task {i}", "2030-01-01"), id=f"bench{i:08d}") for i in range(writes)]
+    before = calendar.request_count
+    delivered, elapsed = _timed(lambda: service.insert_events_batch(events))
+    results["batched_writes"] = {"ms": round(elapsed, 1), "requests": calendar.request_count - before,
+                                 "events": sum(1 for _, status in delivered.values() if status is None)}
+    return results
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    for key, value in run(*args).items():
+        print(f"{key}: {value}")
@@ -0,0 +1,231 @@
+# benchmarks/run.py
+"""Runs the benchmark suites on synthetic data and writes the results as JSON.
+
+Run with: python -m benchmarks.run [--sessions 1000 100000] [--tasks 10000] [--events 10000] [--gui]
+Compare two runs with: python -m benchmarks.run --compare old.json new.json
+
+Suites marked gui need a display; they only run with --gui.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from config import settings
+from data import aggregates, persistence
+from data.columnar import SessionColumns
+from data.rollups import Rollups
+from data.task_index import TaskIndex
+from benchmarks import synthetic
+
+REGRESSION_THRESHOLD = 0.2  # Timings more than 20% slower than the baseline are reported
+
+def _timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+# --- Headless suites ---
+def _heap_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+def bench_persistence(sessions, tasks, **_):
+    data = synthetic.app_data(sessions, tasks)
+    data['aggregates'] = aggregates.rebuild(data['logs_df'])
+    with tempfile.TemporaryDirectory() as folder:
+        return _bench_persistence_in(folder, data, sessions)
+
+def _bench_persistence_in(folder, data, sessions):
+    paths = settings.DATA_FILE_PATH, settings.JOURNAL_FILE_PATH, settings.SESSIONS_FILE_PATH
+    settings.DATA_FILE_PATH = os.path.join(folder, "app_data.json")
+    settings.JOURNAL_FILE_PATH = os.path.join(folder, "app_data.journal")
+    settings.SESSIONS_FILE_PATH = os.path.join(folder, "app_data.sessions")
+    try:
+        _, save_ms = _timed(lambda: persistence.save_data(data))
+        loaded, load_ms = _timed(persistence.load_data)
+        _, history_ms = _timed(loaded['logs_df'].load)  # Deferred until the history is first used
+        store = persistence.JournalStore()
+        entries = list(synthetic.sessions(1000, seed=1))
+        _, commit_ms = _timed(lambda: [store.commit({'op': 'log_session', 'entry': e}) for e in entries])
+        store._journal.close()
+
+        # Resident cost of the session history: list of dicts (the old logs_df) vs columns
+        _, dict_bytes = _heap_bytes(lambda: list(synthetic.sessions(min(sessions, 100000))))
+        _, column_bytes = _heap_bytes(lambda: SessionColumns(synthetic.sessions(min(sessions, 100000))))
+        per = max(1, min(sessions, 100000))
+        return {"save_ms": round(save_ms, 1), "load_ms": round(load_ms, 1), "history_load_ms": round(history_ms, 1),
+                "snapshot_kb": round(os.path.getsize(settings.DATA_FILE_PATH) / 1024),
+                "sessions_kb": round(os.path.getsize(settings.SESSIONS_FILE_PATH) / 1024),
+                "commit_us": round(commit_ms, 1),  # 1000 commits, so ms total == us each
+                "bytes_per_session_dicts": round(dict_bytes / per), "bytes_per_session_columns": round(column_bytes / per)}
+    finally:
+        settings.DATA_FILE_PATH, settings.JOURNAL_FILE_PATH, settings.SESSIONS_FILE_PATH = paths
+
+def bench_analytics(sessions, **_):
+    from app.ui.analytics_frame import AnalyticsFrame
+    state, rebuild_ms = _timed(lambda: aggregates.rebuild(synthetic.sessions(sessions)))
+    columns = SessionColumns(synthetic.sessions(sessions)).view()
+    rollups, rollups_ms = _timed(lambda: Rollups(columns))
+    entry = {'timestamp': datetime.now().isoformat(), 'label': "Label 0", 'duration_sec': 1500, 'mode': "Study"}
+    _, add_us = _timed(lambda: (aggregates.add_session(state, entry), rollups.add_session(entry)), repeat=1000)
+    first, today = rollups.first_day, datetime.now().date()
+    _, range_us = _timed(lambda: rollups.total(first, today, mode="Study"), repeat=1000)
+    _, trend_ms = _timed(lambda: rollups.daily(today - timedelta(days=365), today, label="Label 0"), repeat=100)
+
+    # The summary logic runs without a window: it only reads the store and writes one label
+    frame = SimpleNamespace(controller=SimpleNamespace(store=SimpleNamespace(aggregates=state)),
+                            summary_label=SimpleNamespace(configure=lambda **kwargs: None))
+    _, summary_ms = _timed(lambda: AnalyticsFrame._generate_summary(frame), repeat=100)
+    return {"rebuild_ms": round(rebuild_ms, 1), "rollups_build_ms": round(rollups_ms, 1),
+            "add_session_us": round(add_us * 1000, 2), "range_total_us": round(range_us * 1000, 2),
+            "year_trend_ms": round(trend_ms, 3), "summary_ms": round(summary_ms, 3)}
+
+def bench_planner_sort(tasks, **_):
+    task_list = synthetic.tasks(tasks)
+    index, build_ms = _timed(lambda: TaskIndex(task_list))
+    _, ordered_ms = _timed(index.by_priority, repeat=10)
+    rng = random.Random(0)
+    ids = [rng.choice(task_list)['id'] for _ in range(1000)]
+    _, toggle_ms = _timed(lambda: [index.update(i, {'done': not index.get(i)['done']}) for i in ids])
+    return {"index_build_ms": round(build_ms, 1), "ordered_view_ms": round(ordered_ms, 2),
+            "toggle_us": round(toggle_ms, 2)}  # 1000 toggles, so ms total == us each
+
+def bench_calendar_sync(events, **_):
+    from benchmarks import calendar_sync
+    return calendar_sync.run(event_count=events, latency_ms=0)
+
+# --- Suites that need a display ---
+def bench_planner_render(tasks, **_):
+    from benchmarks import task_list
+    return task_list.measure(tasks)
+
+def bench_agenda(events, **_):
+    import customtkinter as ctk
+    from app.ui.calendar_view import CalendarViewFrame
+    root = ctk.CTk()
+    # Enough of the app for the agenda: the Work tasks' deadline index and no calendar service
+    index = TaskIndex(synthetic.tasks(50))
+    controller = SimpleNamespace(theme=settings.THEMES["Work"], store=SimpleNamespace(task_index=lambda mode: index),
+                                 current_mode=SimpleNamespace(get=lambda: "Work"), gcal_service=None)
+    frame = CalendarViewFrame(root, controller)
+    frame.pack(fill="both", expand=True)
+    event_list = synthetic.calendar_events(events)
+    _, first_ms = _timed(lambda: frame.update_agenda_display(event_list))
+    root.update_idletasks()
+    _, unchanged_ms = _timed(lambda: frame.update_agenda_display(event_list), repeat=5)
+    event_list[0] = dict(event_list[0], summary="Renamed")
+    _, one_change_ms = _timed(lambda: frame.update_agenda_display(event_list))
+    root.destroy()
+    return {"first_render_ms": round(first_ms, 1), "unchanged_rerender_ms": round(unchanged_ms, 2),
+            "one_event_changed_ms": round(one_change_ms, 2)}
+
+def bench_analytics_render(**_):
+    from benchmarks import analytics_render
+    return analytics_render.run(visits=50)
+
+def bench_startup(**_):
+    from benchmarks import startup
+    return startup.run(3)
+
+# name -> (function, parameter the suite is scaled by, needs a display)
+SUITES = {
+    "persistence": (bench_persistence, "sessions", False),
+    "analytics": (bench_analytics, "sessions", False),
+    "planner_sort": (bench_planner_sort, "tasks", False),
+    "calendar_sync": (bench_calendar_sync, "events", False),
+    "planner_render": (bench_planner_render, "tasks", True),
+    "agenda": (bench_agenda, "events", True),
+    "analytics_render": (bench_analytics_render, None, True),
+    "startup": (bench_startup, None, True),
+}
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run(scales, suites=None, gui=False):
+    """Runs each selected suite once per value of the parameter it is scaled by."""
+    results = []
+    for name, (fn, scaled_by, needs_display) in SUITES.items():
+        if (suites and name not in suites) or (needs_display and not gui):
+            continue
+        for value in (scales[scaled_by] if scaled_by else [None]):
+            params = {scaled_by: value} if scaled_by else {}
+            kwargs = {key: values[0] for key, values in scales.items()}
+            kwargs.update(params)
+            print(f"{name} {params or ''}".rstrip(), flush=True)
+            try:
+                metrics = fn(**kwargs)
+            except Exception as e:
+                metrics = {"error": f"{type(e).__name__}: {e}"}
+                print(f"  failed: {metrics['error']}")
+            results.append({"suite": name, "params": params, "metrics": metrics})
+    return {"commit": _commit(), "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(), "platform": platform.platform(), "results": results}
+
+# --- Comparison ---
+def _flatten(metrics, prefix=""):
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield prefix + key, value
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Returns (suite, params, metric, old, new) for every timing that got slower than the threshold allows."""
+    old = {(r['suite'], json.dumps(r['params'], sort_keys=True)): dict(_flatten(r['metrics'])) for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        before = old.get((r['suite'], json.dumps(r['params'], sort_keys=True)), {})
+        for metric, value in _flatten(r['metrics']):
+            if not (metric.endswith('_ms') or metric.endswith('_us')) or metric not in before:
+                continue
+            if before[metric] > 0 and value > before[metric] * (1 + threshold):
+                regressions.append((r['suite'], r['params'], metric, before[metric], value))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[10000])
+    parser.add_argument('--events', type=int, nargs='+', default=[10000])
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES), help="Run only these suites")
+    parser.add_argument('--gui', action='store_true', help="Also run the suites that open windows")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            regressions = compare(json.load(f_old), json.load(f_new))
+        for suite, params, metric, before, after in regressions:
+            print(f"{suite} {params} {metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+        print(f"{len(regressions)} regression(s).")
+        return 1 if regressions else 0
+
+    report = run({'sessions': args.sessions, 'tasks': args.tasks, 'events': args.events}, args.suite, args.gui)
+    output = args.output or os.path.join("benchmarks", "results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# benchmarks/startup.py
+"""Reports import time and time-to-first-frame for TimeSplitApp in a fresh interpreter.
+
+Run with: python -m benchmarks.startup [runs]
+"""
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ("matplotlib", "tkcalendar", "googleapiclient")
+
+# Runs in a child process so every measurement starts with a cold module cache
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+from app.app_logic import TimeSplitApp
+imported = time.perf_counter()
+app = TimeSplitApp()
+app.update()
+first_frame = time.perf_counter()
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+app.destroy()
+print(json.dumps({{"import_ms": (imported - start) * 1000,
+                  "first_frame_ms": (first_frame - start) * 1000,
+                  "heavy_modules_loaded": loaded}}))
+"""
+
+def measure_once():
+    output = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def run(runs=5):
+    samples = [measure_once() for _ in range(runs)]
+    median = lambda key: sorted(s[key] for s in samples)[len(samples) // 2]
+    return {
+        "import_ms": round(median("import_ms"), 1),
+        "first_frame_ms": round(median("first_frame_ms"), 1),
+        "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"],
+    }
+
+if __name__ == "__main__":
+    for key, value in run(int(sys.argv[1]) if len(sys.argv) > 1 else 5).items():
+        print(f"{key}: {value}")
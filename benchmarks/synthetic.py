@@ -0,0 +1,52 @@
+# benchmarks/synthetic.py
+"""Deterministic synthetic app data at any scale, shaped exactly like what the app stores."""
+import random
+from datetime import date, datetime, timedelta
+from config import settings
+
+PRIORITIES = ("Low", "Medium", "High")
+SESSION_LENGTHS = (5 * 60, 15 * 60, 25 * 60, 50 * 60)
+
+def sessions(count, seed=0, start=date(2020, 1, 1), label_count=50):
+    """Yields `count` logs_df entries in chronological order, a few per day from `start` on."""
+    rng = random.Random(seed)
+    modes = list(settings.THEMES)
+    labels = [f"Label {i}" for i in range(label_count)]
+    moment = datetime.combine(start, datetime.min.time()).replace(hour=8)
+    for _ in range(count):
+        moment += timedelta(minutes=rng.randint(20, 240))
+        yield {'timestamp': moment.isoformat(), 'label': rng.choice(labels),
+               'duration_sec': rng.choice(SESSION_LENGTHS), 'mode': rng.choice(modes)}
+
+def tasks(count, seed=0, start=None, days=60):
+    """Returns `count` planner tasks with stable ids and deadlines spread over `days` days."""
+    rng = random.Random(seed)
+    start = start or date.today()
+    return [{'id': f"task{i:08d}", 'text': f"Task {i}",
+             'deadline': (start + timedelta(days=rng.randrange(days))).isoformat(),
+             'priority': rng.choice(PRIORITIES), 'done': rng.random() < 0.3} for i in range(count)]
+
+def calendar_events(count, seed=0, start=None, days=7):
+    """Returns `count` Calendar API event resources, a mix of timed and all-day, over `days` days."""
+    rng = random.Random(seed)
+    start = start or date.today()
+    events = []
+    for i in range(count):
+        day = start + timedelta(days=rng.randrange(days))
+        if rng.random() < 0.2:
+            when = {'start': {'date': day.isoformat()}, 'end': {'date': (day + timedelta(days=1)).isoformat()}}
+        else:
+            begin = datetime.combine(day, datetime.min.time()) + timedelta(minutes=15 * rng.randrange(96))
+            when = {'start': {'dateTime': begin.isoformat()}, 'end': {'dateTime': (begin + timedelta(hours=1)).isoformat()}}
+        events.append(dict(when, id=f"event{i:08d}", summary=f"Event {i}"))
+    return events
+
+def app_data(session_count, task_count=0, seed=0):
+    """Returns a complete app_data dict (the shape persistence.load_data returns)."""
+    half = task_count // 2
+    study = [dict(t, id="s" + t['id']) for t in tasks(task_count - half, seed + 1)]
+    return {
+        'tasks': {'Work': {t['id']: t for t in tasks(half, seed)}, 'Study': {t['id']: t for t in study}},
+        'logs': {},
+        'logs_df': list(sessions(session_count, seed)),
+    }
@@ -0,0 +1,88 @@
+# benchmarks/task_list.py
+"""Measures PlannerFrame refresh latency (toggle / delete one task) against the number of tasks.
+
+Run with: python -m benchmarks.task_list [count ...]
+"""
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import customtkinter as ctk
+from config import settings
+from data import persistence
+from data.task_index import TaskIndex
+from app.ui.planner_frame import PlannerFrame
+
+class _MemoryStore:
+    """Just enough of the store interface for the planner, without touching disk."""
+    def __init__(self, data):
+        self.data = data
+        self.indexes = {mode: TaskIndex(tasks.values()) for mode, tasks in data['tasks'].items()}
+
+    def tasks(self, mode):
+        return list(self.data['tasks'].get(mode, {}).values())
+
+    def task_index(self, mode):
+        return self.indexes[mode]
+
+    def commit(self, record):
+        persistence.apply_record(self.data, record, self.indexes)
+
+class _IdleCalendar:
+    PENDING, READY = "pending", "ready"
+    state = READY
+    outbox = ()
+
+    def get_upcoming_events(self, callback, max_results=15, force_sync=False):
+        callback([], None)
+
+def _controller(task_count):
+    tasks = [{"id": f"task-{i}", "text": f"Task {i}", "deadline": "2030-01-01", "priority": random.choice(["Low", "Medium", "High"]),
+              "done": random.random() < 0.3} for i in range(task_count)]
+    store = _MemoryStore({"tasks": persistence.tasks_by_id({"Work": tasks, "Study": []})})
+    controller = SimpleNamespace(store=store, gcal_service=_IdleCalendar(), theme=settings.THEMES["Work"])
+    controller.commit = store.commit
+    return controller
+
+def measure(task_count, operations=20):
+    root = ctk.CTk()
+    root.geometry(settings.GEOMETRY)
+    controller = _controller(task_count)
+    controller.current_mode = ctk.StringVar(master=root, value="Work")
+    frame = PlannerFrame(root, controller)
+    frame.pack(fill="both", expand=True)
+    root.update()
+
+    start = time.perf_counter()
+    frame.refresh_task_list()
+    root.update_idletasks()
+    first_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    before = frame.task_list_frame.rows_updated
+    for i in range(operations):
+        tasks = controller.store.data['tasks']["Work"]
+        task_id = next(reversed(tasks)) if i % 2 else next(iter(tasks))
+        start = time.perf_counter()
+        if i % 2:
+            frame.delete_task(task_id)
+        else:
+            frame.toggle_task_done(task_id)
+        root.update_idletasks()
+        timings.append((time.perf_counter() - start) * 1000)
+    rows_touched = (frame.task_list_frame.rows_updated - before) / operations
+    widgets = sum(len(pool) for pool in frame.task_list_frame.pool.values()) + len(frame.task_list_frame.visible)
+    root.destroy()
+
+    timings.sort()
+    return {"tasks": task_count, "first_render_ms": round(first_ms, 1), "median_update_ms": round(timings[len(timings) // 2], 2),
+            "max_update_ms": round(timings[-1], 2), "rows_touched_per_update": round(rows_touched, 1), "row_widgets": widgets}
+
+def run(counts=(100, 1000, 5000)):
+    return [measure(count) for count in counts]
+
+if __name__ == "__main__":
+    counts = [int(a) for a in sys.argv[1:]] or (100, 1000, 5000)
+    for result in run(counts):
+        print(result)
@@ -6,11 +6,46 @@ import customtkinter  # <<< ADD THIS LINE
 APP_NAME = "TimeSplit - Modern Productivity Manager"
 GEOMETRY = "1200x800"
 DATA_FILE_PATH = "data/app_data.json"
+SESSIONS_FILE_PATH = "data/app_data.sessions"  # Session history in compact columnar form
+
+STORAGE_BACKEND = "json"  # "json" (snapshot + journal) or "sqlite"
+SQLITE_DB_PATH = "data/app_data.db"
+
+# --- Session Journal ---
+JOURNAL_FILE_PATH = "data/app_data.journal"
+JOURNAL_COMPACT_THRESHOLD = 500  # Records appended before the journal is folded into the snapshot
+JOURNAL_FSYNC = False            # fsync after every record (survives power loss, costs a disk flush)
+AUTOSAVE_ENABLED = True         # Write snapshots in the background instead of compacting on the UI thread
+AUTOSAVE_DELAY_SEC = 2.0         # Quiet period after a change before the snapshot is written
+AUTOSAVE_MAX_DELAY_SEC = 30.0    # Longest a burst of changes can postpone it
+AUTOSAVE_FSYNC = "file"          # "full" (file + directory entry), "file" or "none"
+TRANSFER_CHUNK_SIZE = 5000       # Sessions held in memory at once by the import/export command
+
+# --- Sync Daemon (python -m data.daemon) ---
+SYNC_DAEMON = False              # Run the app as a client of the daemon instead of opening the data files
+DAEMON_HOST = "127.0.0.1"        # Local only: the API has no authentication
+DAEMON_PORT = 47615
+DAEMON_MAX_CLIENTS = 512
+DAEMON_QUEUE_SIZE = 256          # Outgoing messages buffered per client before it counts as stalled
+DAEMON_MAX_REQUEST_BYTES = 1 << 20
+DAEMON_CONNECT_TIMEOUT_SEC = 2.0
+DAEMON_REQUEST_TIMEOUT_SEC = 5.0
+DAEMON_POLL_SEC = 0.2            # How often the app applies changes made by other clients
 
 # --- Google Calendar API ---
 CREDENTIALS_PATH = 'credentials/credentials.json'
 TOKEN_PATH = 'credentials/token.json'
 API_SCOPES = ['https://www.googleapis.com/auth/calendar']
+EVENT_CACHE_PATH = "data/gcal_cache.json"
+EVENT_CACHE_TTL_SEC = 5 * 60  # Cached events are shown without any API call for this long
+OUTBOX_PATH = "data/gcal_outbox.json"
+OUTBOX_FLUSH_DELAY_MS = 500   # Writes queued within this window go out in one batch
+OUTBOX_BACKOFF_BASE_SEC = 5
+OUTBOX_BACKOFF_MAX_SEC = 15 * 60
+CALENDAR_TRANSPORT = "google"  # "google", "record" (google + cassette), "replay" (cassette only) or "fake"
+CALENDAR_CASSETTE_PATH = "data/gcal_cassette.json"
+FAKE_CALENDAR_EVENTS = 2000    # Events seeded into the fake backend
+FAKE_CALENDAR_LATENCY_MS = 0   # Simulated round-trip time per request
 
 # --- UI Themes (Modern Color Palette) ---
 customtkinter.set_appearance_mode("Dark") # This will now work correctly
@@ -38,4 +73,20 @@ POMODORO_SETTINGS = {
     "Long Break": 15 * 60,
 }
 
-CUSTOM_POMODORO_DEFAULT_MINUTES = 25
\ No newline at end of file
+CUSTOM_POMODORO_DEFAULT_MINUTES = 25
+
+# --- Notifications ---
+NOTIFY_MAX_VISIBLE = 3        # Toasts on screen at once; more wait in a priority queue
+NOTIFY_DURATION_SEC = 8       # Before a toast hides itself (doubled for high priority)
+NOTIFY_MIN_INTERVAL_SEC = 30  # A keyed reminder is dropped if the same one was shown this recently
+NOTIFY_DESKTOP = False        # Also send desktop notifications (plyer, notify-send or osascript)
+
+# --- Diagnostics ---
+DIAGNOSTICS_ENABLED = False  # Time event-loop callbacks; Ctrl+Shift+D opens the diagnostics panel
+DIAGNOSTICS_DUMP_PATH = "data/diagnostics.json"
+
+# --- Performance Budgets ---
+BREATHING_MAX_FPS = 60  # Display refresh budget for the breathing animation
+CHART_WORKERS = 2    # Processes drawing analytics charts
+CHART_CACHE_SIZE = 32  # Rendered charts kept (a few tens of KB each)
+ANALYTICS_RENDER_BUDGET_MS = 50  # Per-visit cost of AnalyticsFrame.create_charts before a warning is printed
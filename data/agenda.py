@@ -0,0 +1,77 @@
+# data/agenda.py
+import bisect
+from datetime import datetime
+
+class AgendaIndex:
+    """Calendar events and task deadlines bucketed by day ('YYYY-MM-DD').
+
+    Each source is indexed in one pass, every event's start is parsed once, and days are
+    kept in a sorted list so a window of any length is found with two binary searches;
+    reading it costs time proportional to what it contains.
+    """
+    def __init__(self):
+        self._days = {}      # day -> {key: (sort key, text, tag)}
+        self._day_keys = []  # Sorted days that have at least one item
+        self._where = {}     # key -> day
+
+    # --- Sources ---
+    def set_events(self, events):
+        """Replaces the indexed calendar events; unchanged events are left in place."""
+        items = {}
+        for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            if 'T' in start:
+                time_text = datetime.fromisoformat(start.replace('Z', '+00:00')).strftime('%I:%M %p')
+                sort_key = start[11:16]
+            else:
+                time_text, sort_key = 'All-day', ''
+            items[("event", event.get('id', start))] = (start[:10], (sort_key, f"   GCal: {event['summary']} ({time_text})", 'event'))
+        self._replace("event", items)
+
+    def set_tasks(self, tasks):
+        """Replaces the indexed task deadlines (tasks without a deadline are skipped)."""
+        items = {}
+        for task in tasks:
+            if task.get('deadline'):
+                mark = "✔" if task['done'] else "•"
+                items[("task", task['id'])] = (task['deadline'], ('~', f"   {mark} Task: {task['text']} [{task['priority']}]",
+                                                                  'task_done' if task['done'] else 'task'))
+        self._replace("task", items)
+
+    def _replace(self, kind, items):
+        for key in [k for k in self._where if k[0] == kind and k not in items]:
+            self._remove(key)
+        for key, (day, item) in items.items():
+            if self._where.get(key) == day and self._days[day][key] == item:
+                continue
+            self._remove(key)
+            self._add(key, day, item)
+
+    def _add(self, key, day, item):
+        if day not in self._days:
+            self._days[day] = {}
+            bisect.insort(self._day_keys, day)
+        self._days[day][key] = item
+        self._where[key] = day
+
+    def _remove(self, key):
+        day = self._where.pop(key, None)
+        if day is None:
+            return
+        bucket = self._days[day]
+        del bucket[key]
+        if not bucket:
+            del self._days[day]
+            del self._day_keys[bisect.bisect_left(self._day_keys, day)]
+
+    # --- Queries ---
+    def day(self, day):
+        """The (text, tag) lines for one day (a date or 'YYYY-MM-DD'), timed events first, then tasks."""
+        bucket = self._days.get(str(day), {})
+        return [(text, tag) for _, text, tag in sorted(bucket.values())]
+
+    def between(self, start, end):
+        """[(day, lines)] for the days in [start, end) that have anything on them."""
+        lo = bisect.bisect_left(self._day_keys, str(start))
+        hi = bisect.bisect_left(self._day_keys, str(end))
+        return [(day, self.day(day)) for day in self._day_keys[lo:hi]]
@@ -0,0 +1,47 @@
+# data/aggregates.py
+from datetime import datetime, timedelta
+
+# Aggregates are kept as plain dicts so they can be stored alongside app_data as-is:
+#   by_mode:  {mode: seconds}
+#   by_label: {label: seconds}
+#   by_week:  {"YYYY-MM-DD" of the Monday: {mode: seconds}}
+#   count:    number of sessions folded in
+# Per-day totals are not kept here (they would grow the startup snapshot with every day of
+# history); data.rollups derives them from the session columns when first needed.
+
+def empty():
+    return {"by_mode": {}, "by_label": {}, "by_week": {}, "count": 0}
+
+def week_key(day):
+    """Returns the ISO date of the Monday starting the week that contains `day`."""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def add_session(state, entry):
+    """Folds one logged session into the aggregates in constant time."""
+    apply_delta(state, session_delta(entry))
+
+def session_delta(entry):
+    """What one session adds to the aggregates; raises (changing nothing) if the entry is malformed."""
+    mode, label, seconds = entry['mode'], entry['label'], entry['duration_sec']
+    if not (isinstance(mode, str) and isinstance(label, str) and isinstance(seconds, int)):
+        raise TypeError(f"malformed session {entry!r}")
+    return mode, label, seconds, week_key(datetime.fromisoformat(entry['timestamp']).date())
+
+def apply_delta(state, delta):
+    mode, label, seconds, week = delta
+    state['by_mode'][mode] = state['by_mode'].get(mode, 0) + seconds
+    state['by_label'][label] = state['by_label'].get(label, 0) + seconds
+    totals = state['by_week'].setdefault(week, {})
+    totals[mode] = totals.get(mode, 0) + seconds
+    state['count'] += 1
+
+def rebuild(entries):
+    """Builds aggregates from scratch, e.g. for data saved before aggregates existed."""
+    state = empty()
+    for entry in entries:
+        add_session(state, entry)
+    return state
+
+def week_total(state, day, mode):
+    """Returns the seconds logged in `mode` during the week containing `day`."""
+    return state['by_week'].get(week_key(day), {}).get(mode, 0)
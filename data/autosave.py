@@ -0,0 +1,146 @@
+# data/autosave.py
+import json
+import marshal
+import os
+import threading
+import time
+from config import settings
+from data import persistence
+
+SNAPSHOT_SECTIONS = ("tasks", "aggregates")  # Serialized separately and reused while clean
+
+class Autosaver:
+    """Writes JournalStore snapshots on a background thread shortly after changes settle.
+
+    Changes are coalesced: a snapshot is written AUTOSAVE_DELAY_SEC after the last change,
+    or AUTOSAVE_MAX_DELAY_SEC after the first while they keep coming. On the Tk thread it
+    only rotates the journal and copies the dirty sections (marshal, so it is a C-speed
+    copy of exactly the state at that journal position); JSON encoding and the atomic
+    writes happen on the worker. Sections that did not change reuse their last encoding.
+    """
+    def __init__(self, store, scheduler, delay_sec=None, max_delay_sec=None):
+        self.store = store
+        self.scheduler = scheduler
+        self.delay_sec = settings.AUTOSAVE_DELAY_SEC if delay_sec is None else delay_sec
+        self.max_delay_sec = settings.AUTOSAVE_MAX_DELAY_SEC if max_delay_sec is None else max_delay_sec
+        store.autosaver = self
+
+        self._job = None
+        self._thread = None
+        self._first_change = None   # Monotonic time of the oldest change not yet captured
+        self._unsaved_since = None  # ... and of the oldest change not yet safely on disk
+        self._fragments = {}        # Section -> JSON text as last written (worker-owned while it runs)
+        self._sessions_saved = False
+        self._lock = threading.Lock()
+        self._stats = {"saves": 0, "failures": 0, "last_error": None, "last_capture_ms": 0.0,
+                       "last_write_ms": 0.0, "max_write_ms": 0.0, "last_saved": None}
+
+    def changed(self):
+        """Called by the store after every commit; (re)arms the coalescing timer."""
+        now = time.monotonic()
+        if self._first_change is None:
+            self._first_change = now
+        if self._unsaved_since is None:
+            self._unsaved_since = now
+        self.scheduler.cancel(self._job)
+        self._job = self.scheduler.call_at(min(now + self.delay_sec, self._first_change + self.max_delay_sec), self.save_now)
+
+    def save_now(self):
+        self._job = None
+        if self._thread is not None and self._thread.is_alive():
+            # One snapshot at a time; this one picks up whatever is dirty once the last is done
+            self._job = self.scheduler.call_later(self.delay_sec, self.save_now)
+            return
+        if not self.store.dirty and self._sessions_saved:
+            return
+
+        started = time.perf_counter()
+        capture = self._capture()
+        with self._lock:
+            self._stats["last_capture_ms"] = (time.perf_counter() - started) * 1000
+        self._first_change = None
+        self._thread = threading.Thread(target=self._write, args=(capture,), name="autosave", daemon=True)
+        self._thread.start()
+
+    def _capture(self):
+        """Copies everything the snapshot needs at the current journal position (runs on the Tk thread)."""
+        store, data = self.store, self.store.data
+        dirty = set(store.dirty)
+        store.dirty.clear()
+        store.rotate_journal()
+        sync_sessions = "sessions" in dirty or not self._sessions_saved
+        capture = {
+            "meta": marshal.dumps({k: v for k, v in data.items() if k not in SNAPSHOT_SECTIONS and k != 'logs_df'}),
+            "sections": {s: marshal.dumps(data.get(s)) for s in SNAPSHOT_SECTIONS if s in dirty or s not in self._fragments},
+            "session_count": len(data['logs_df']),
+            "sync_sessions": sync_sessions,
+            # Runs on the worker; None when the sessions file already holds this history
+            "sessions": data['logs_df'].bytes_writer() if sync_sessions else None,
+            "unsaved_since": self._unsaved_since,
+        }
+        self._unsaved_since = None
+        return capture
+
+    def _write(self, capture):
+        started = time.perf_counter()
+        try:
+            for section, blob in capture["sections"].items():
+                value = marshal.loads(blob)
+                if section == "tasks":
+                    value = persistence.task_lists(value)
+                self._fragments[section] = json.dumps(value, separators=(',', ':'))
+            if capture["sync_sessions"]:
+                self._sessions_saved = False
+                if capture["sessions"] is not None:
+                    persistence.atomic_write(settings.SESSIONS_FILE_PATH, capture["sessions"]())
+                self._sessions_saved = True
+
+            meta = marshal.loads(capture["meta"])
+            meta["session_count"] = capture["session_count"]
+            parts = [json.dumps(key) + ":" + json.dumps(value, separators=(',', ':')) for key, value in meta.items()]
+            parts += [json.dumps(section) + ":" + text for section, text in self._fragments.items()]
+            persistence.atomic_write(settings.DATA_FILE_PATH, ("{" + ",".join(parts) + "}").encode())
+
+            # The snapshot now covers everything in the rotated journal
+            prev_path = settings.JOURNAL_FILE_PATH + ".prev"
+            if os.path.exists(prev_path):
+                os.remove(prev_path)
+        except Exception as e:
+            print(f"Autosave failed: {e}")
+            with self._lock:
+                self._stats["failures"] += 1
+                self._stats["last_error"] = str(e)
+                # The changes are still only in the journal: keep reporting them as at risk
+                if capture["unsaved_since"] is not None:
+                    self._unsaved_since = min(self._unsaved_since or capture["unsaved_since"], capture["unsaved_since"])
+            return
+
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["saves"] += 1
+            self._stats["last_write_ms"] = elapsed
+            self._stats["max_write_ms"] = max(self._stats["max_write_ms"], elapsed)
+            self._stats["last_saved"] = time.strftime("%H:%M:%S")
+
+    def stats(self):
+        """Save counts and latency, plus how much recent work a power loss could cost right now."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["last_capture_ms"] = round(stats["last_capture_ms"], 2)
+        stats["last_write_ms"] = round(stats["last_write_ms"], 1)
+        stats["max_write_ms"] = round(stats["max_write_ms"], 1)
+        stats["unsaved_changes"] = self.store.pending
+        # A crash loses nothing (every change is in the journal); a power loss can lose what
+        # was neither fsynced to the journal nor written in a snapshot
+        at_risk = None if settings.JOURNAL_FSYNC else self._unsaved_since
+        stats["data_loss_window_sec"] = round(time.monotonic() - at_risk, 1) if at_risk is not None else 0.0
+        stats["writing"] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+    def close(self):
+        """Stops the timer and waits for a snapshot in progress; JournalStore.close() writes the final one."""
+        self.scheduler.cancel(self._job)
+        self._job = None
+        if self._thread is not None:
+            self._thread.join()
+        self.store.autosaver = None
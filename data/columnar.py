@@ -0,0 +1,236 @@
+# data/columnar.py
+import json
+import os
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+MAGIC = b"TSCOLS1\n"
+# Column name -> array typecode: 8 + 4 + 1 + 4 = 17 bytes per session
+COLUMNS = (("timestamp_us", "q"), ("duration_sec", "i"), ("mode_id", "B"), ("label_id", "I"))
+
+def to_epoch_us(timestamp):
+    """Microseconds since 1970-01-01 of a naive local ISO timestamp (round-trips exactly)."""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+def from_epoch_us(us):
+    return (EPOCH + timedelta(microseconds=us)).isoformat()
+
+class SessionColumns:
+    """Session logs as parallel typed arrays instead of a list of dicts.
+
+    Labels and modes are interned to small integer ids. It behaves like the old logs_df
+    list where the app relied on it (append, len, indexing and iteration yield entry
+    dicts), while view() exposes the columns as NumPy arrays without copying.
+    """
+    def __init__(self, entries=()):
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.modes, self.labels = [], []
+        self._mode_ids, self._label_ids = {}, {}
+        self.extend(entries)
+
+    @staticmethod
+    def _intern(names, ids, name):
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
+    def append(self, entry):
+        """Adds one session to every column or, if any value is bad, to none of them."""
+        row = (to_epoch_us(entry['timestamp']), entry['duration_sec'],
+               self._intern(self.modes, self._mode_ids, entry['mode']),
+               self._intern(self.labels, self._label_ids, entry['label']))
+        count = len(self)
+        try:
+            for (name, _), value in zip(COLUMNS, row):
+                getattr(self, name).append(value)
+        except (TypeError, OverflowError):
+            self.truncate(count)  # A value the typecode can't hold; undo the columns already appended
+            raise
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def truncate(self, count):
+        """Drops every session after the first `count`."""
+        for name, _ in COLUMNS:
+            del getattr(self, name)[count:]
+
+    def __len__(self):
+        return len(self.timestamp_us)
+
+    def __getitem__(self, index):
+        return {'timestamp': from_epoch_us(self.timestamp_us[index]), 'label': self.labels[self.label_id[index]],
+                'duration_sec': self.duration_sec[index], 'mode': self.modes[self.mode_id[index]]}
+
+    def __iter__(self):
+        for ts, duration, mode, label in zip(self.timestamp_us, self.duration_sec, self.mode_id, self.label_id):
+            yield {'timestamp': from_epoch_us(ts), 'label': self.labels[label],
+                   'duration_sec': duration, 'mode': self.modes[mode]}
+
+    # --- Vectorised access ---
+    def view(self):
+        """The columns as NumPy arrays sharing this object's memory (valid until the next append)."""
+        import numpy as np
+        columns = {name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode) for name, _ in COLUMNS}
+        columns['modes'] = self.modes
+        columns['labels'] = self.labels
+        return columns
+
+    def select(self, start=None, end=None, mode=None, label=None):
+        """Positions of the sessions matching the filters, in insertion order."""
+        import numpy as np
+        columns = self.view()
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= columns['timestamp_us'] >= (start - EPOCH) // timedelta(microseconds=1)
+        if end is not None:
+            mask &= columns['timestamp_us'] < (end - EPOCH) // timedelta(microseconds=1)
+        if mode is not None:
+            mask &= columns['mode_id'] == self._mode_ids.get(mode, -1)
+        if label is not None:
+            mask &= columns['label_id'] == self._label_ids.get(label, -1)
+        return np.flatnonzero(mask)
+
+    def copy(self):
+        """An independent copy; the columns are copied as whole buffers, not session by session."""
+        columns = SessionColumns()
+        for name, _ in COLUMNS:
+            setattr(columns, name, getattr(self, name)[:])
+        columns.modes, columns.labels = list(self.modes), list(self.labels)
+        columns._mode_ids, columns._label_ids = dict(self._mode_ids), dict(self._label_ids)
+        return columns
+
+    def nbytes(self):
+        return sum(len(getattr(self, name)) * getattr(self, name).itemsize for name, _ in COLUMNS)
+
+    # --- Serialisation ---
+    def to_bytes(self):
+        """MAGIC, a length-prefixed JSON header (counts, labels, modes), then each column's raw bytes."""
+        header = json.dumps({'count': len(self), 'modes': self.modes, 'labels': self.labels,
+                             'columns': [[name, typecode, getattr(self, name).itemsize] for name, typecode in COLUMNS]}).encode()
+        return b"".join([MAGIC, len(header).to_bytes(4, 'little'), header] + [getattr(self, name).tobytes() for name, _ in COLUMNS])
+
+    @classmethod
+    def from_bytes(cls, blob):
+        if not blob.startswith(MAGIC):
+            raise ValueError("Not a session columns file")
+        offset = len(MAGIC)
+        size = int.from_bytes(blob[offset:offset + 4], 'little')
+        header = json.loads(blob[offset + 4:offset + 4 + size])
+        offset += 4 + size
+
+        columns = cls()
+        for name, typecode, itemsize in header['columns']:
+            column = getattr(columns, name)
+            if column.itemsize != itemsize:
+                raise ValueError(f"Column {name} was written with {itemsize}-byte items")
+            length = header['count'] * itemsize
+            column.frombytes(blob[offset:offset + length])
+            offset += length
+        columns.modes, columns.labels = header['modes'], header['labels']
+        columns._mode_ids = {name: i for i, name in enumerate(columns.modes)}
+        columns._label_ids = {name: i for i, name in enumerate(columns.labels)}
+        return columns
+
+    def bytes_writer(self):
+        """A callable that returns to_bytes() as of now and may run on another thread, or None if nothing needs writing."""
+        blob = self.to_bytes()
+        return lambda: blob
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.to_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a file written by save(); a missing file is an empty log."""
+        try:
+            with open(path, 'rb') as f:
+                return cls.from_bytes(f.read())
+        except FileNotFoundError:
+            return cls()
+
+class LazySessionColumns(SessionColumns):
+    """SessionColumns whose history is read only when something first needs it.
+
+    Startup keeps just the session count; sessions appended before the history is loaded
+    wait in a short tail, so logging, counting and aggregating never touch the file. Any
+    access to the columns loads it: `loader()` returns the full SessionColumns, which is
+    cut back to `count` (it may hold sessions saved after the count was taken) and the
+    tail is appended.
+    """
+    def __init__(self, loader, count):
+        self._loader = loader
+        self._count = count
+        self._tail = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Only reached for attributes a loaded instance has (the columns and interning tables)
+        if name.startswith('__') or self.__dict__.get('_loaded', True):
+            raise AttributeError(name)
+        self.load()
+        return getattr(self, name)
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            columns = self._read()
+            self.__dict__.update(columns.__dict__)
+            self._tail = []
+            self._loaded = True
+
+    def _read(self, tail=None):
+        columns = self._loader()
+        if len(columns) < self._count:
+            print(f"Session file holds {len(columns)} of {self._count} sessions; some history is missing.")
+        columns.truncate(self._count)
+        columns.extend(self._tail if tail is None else tail)
+        return columns
+
+    def append(self, entry):
+        with self._lock:
+            if not self._loaded:
+                self._tail.append(dict(entry))
+                return
+        super().append(entry)
+
+    def copy(self):
+        """An independent copy; an unloaded history stays unloaded (the copy reads the file when used)."""
+        with self._lock:
+            if not self._loaded:
+                columns = LazySessionColumns(self._loader, self._count)
+                columns._tail = list(self._tail)
+                return columns
+        return super().copy()
+
+    def __len__(self):
+        if not self._loaded:
+            return self._count + len(self._tail)
+        return super().__len__()
+
+    def bytes_writer(self):
+        if self._loaded:
+            return super().bytes_writer()
+        if not self._tail:
+            return None  # The file already holds exactly this history
+        tail = list(self._tail)
+        return lambda: self._read(tail).to_bytes()
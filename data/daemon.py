@@ -0,0 +1,395 @@
+# data/daemon.py
+"""Headless TimeSplit daemon: owns the data store and serves a local JSON API.
+
+python -m data.daemon [--host 127.0.0.1] [--port 47615]
+
+Every message is one JSON object per line. Requests carry an "id" that is echoed in the
+reply ({"id", "ok": true, "result"} or {"id", "ok": false, "error"}); replies on one
+connection come back in request order. Events pushed to subscribers have an "event" key:
+"records" (changes committed by any client), "tick" (each second while the timer runs)
+and "timer" (started, stopped, finished or failed, with an "error").
+
+Requests: hello, snapshot {[subscribe], [sessions]}, sessions, tasks {mode}, log_session {label, duration_sec, mode,
+[timestamp]}, commit {record}, add_sessions {entries}, timer_start {duration_sec, [mode,
+label, session_type, log]}, timer_stop, timer_status and subscribe {topics}.
+
+Everything runs on one asyncio loop. Each client has a bounded outgoing queue drained by
+its own writer task, so a slow reader only delays itself: ticks to it are dropped and a
+client that falls DAEMON_QUEUE_SIZE replies or changes behind is disconnected. The session
+history is copied on the loop and encoded in a worker thread, so sending it never holds up
+other clients.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import marshal
+import math
+import sys
+from datetime import datetime
+from config import settings
+from data import persistence
+from data.columnar import SessionColumns
+from data.task_index import PRIORITY_ORDER
+from data.transfer import validate
+
+TOPICS = ("records", "ticks", "timer")
+RECORD_OPS = ("log_session", "task_add", "task_update", "task_delete", "set")
+TASK_FIELDS = {"text": str, "deadline": str, "priority": str, "done": bool}
+SESSION_TYPES = ("Focus", *settings.POMODORO_SETTINGS)
+# Top-level settings clients may change with a "set" record, and the check their value must pass
+SETTABLE_KEYS = {"custom_pomodoro_minutes": lambda value: type(value) is int and 0 < value <= 24 * 60}
+
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + "\n").encode()
+
+async def _close(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+def _check_task_fields(fields, skip=()):
+    for key, value in fields.items():
+        if key in skip:
+            continue
+        if key not in TASK_FIELDS or not isinstance(value, TASK_FIELDS[key]):
+            raise ValueError(f"bad task field {key}={value!r}")
+    if 'priority' in fields and fields['priority'] not in PRIORITY_ORDER:
+        raise ValueError(f"unknown priority {fields['priority']!r}")
+    if 'deadline' in fields:
+        try:
+            datetime.strptime(fields['deadline'], '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"bad deadline {fields['deadline']!r}")
+    if 'text' in fields and not fields['text'].strip():
+        raise ValueError("empty task text")
+    return dict(fields)
+
+class _LoopScheduler:
+    """The part of app.scheduler.Scheduler the Autosaver uses, on an asyncio loop (whose clock is time.monotonic)."""
+    def __init__(self, loop):
+        self.loop = loop
+
+    def call_at(self, deadline, callback):
+        return self.loop.call_at(deadline, callback)
+
+    def call_later(self, delay_sec, callback):
+        return self.loop.call_later(delay_sec, callback)
+
+    def cancel(self, handle):
+        if handle is not None:
+            handle.cancel()
+
+class _Client:
+    def __init__(self, client_id, writer):
+        self.id = client_id
+        self.writer = writer
+        self.queue = asyncio.Queue(settings.DAEMON_QUEUE_SIZE)
+        self.topics = set()
+
+    def send(self, payload, droppable=False):
+        """Queues encoded bytes; a client too far behind loses droppable messages or its connection."""
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            if not droppable:
+                print(f"Client {self.id} is not reading; disconnecting it.")
+                self.writer.transport.abort()
+
+class SyncDaemon:
+    def __init__(self, store):
+        self.store = store
+        self.clients = {}
+        self.timer = None        # The running or last timer, see timer_status()
+        self._timer_task = None
+        self._next_client_id = 0
+        self.handlers = {
+            "hello": self.hello, "snapshot": self.snapshot, "sessions": self.sessions, "tasks": self.list_tasks,
+            "log_session": self.log_session, "commit": self.commit, "add_sessions": self.add_sessions,
+            "timer_start": self.timer_start, "timer_stop": self.timer_stop, "timer_status": self.timer_status,
+            "subscribe": self.subscribe,
+        }
+
+    # --- Connections ---
+    async def serve(self, host=None, port=None):
+        server = await asyncio.start_server(self._handle, host or settings.DAEMON_HOST, port or settings.DAEMON_PORT,
+                                            limit=settings.DAEMON_MAX_REQUEST_BYTES)
+        print(f"TimeSplit daemon listening on {', '.join(str(s.getsockname()[:2]) for s in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        if len(self.clients) >= settings.DAEMON_MAX_CLIENTS:
+            writer.write(encode({"ok": False, "error": "Too many clients"}))
+            await _close(writer)
+            return
+        self._next_client_id += 1
+        client = _Client(self._next_client_id, writer)
+        self.clients[client.id] = client
+        sender = asyncio.ensure_future(self._send_loop(client))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                client.send(encode(await self._dispatch(client, line)))
+        except ValueError:
+            # readline() raises this for a line over DAEMON_MAX_REQUEST_BYTES
+            print(f"Client {client.id} sent an oversized request; disconnecting it.")
+        except ConnectionError:
+            pass
+        finally:
+            del self.clients[client.id]
+            sender.cancel()
+            await _close(writer)
+
+    async def _send_loop(self, client):
+        try:
+            while True:
+                payloads = [await client.queue.get()]
+                while not client.queue.empty():
+                    payloads.append(client.queue.get_nowait())
+                client.writer.write(b"".join(payloads))
+                await client.writer.drain()
+        except ConnectionError:
+            client.writer.transport.abort()
+
+    async def _dispatch(self, client, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            handler = self.handlers.get(request.get('op'))
+            if handler is None:
+                raise ValueError(f"Unknown op {request.get('op')!r}")
+            result = handler(client, request)
+            if asyncio.iscoroutine(result):
+                result = await result  # Other clients are served meanwhile; this one's replies stay in order
+            return {"id": request_id, "ok": True, "result": result}
+        except (ValueError, KeyError, TypeError, AttributeError, OverflowError) as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+
+    def broadcast(self, topic, message):
+        if not self.clients:
+            return
+        payload = encode(message)  # Encoded once however many clients receive it
+        for client in list(self.clients.values()):
+            if topic in client.topics:
+                client.send(payload, droppable=(topic == "ticks"))
+
+    # --- Store ---
+    def hello(self, client, request):
+        return {"client_id": client.id, "app": settings.APP_NAME, "backend": type(self.store).__name__,
+                "timer": self.timer_status(client, request)}
+
+    async def snapshot(self, client, request):
+        """Everything a client needs to mirror the store: settings, tasks, aggregates and the session columns.
+
+        With `subscribe`, the topics are subscribed atomically with the snapshot, so every change
+        is either in it or delivered afterwards. With `sessions: false` only the session count is
+        sent and the client fetches the history with a sessions request when it needs it.
+        """
+        if 'subscribe' in request:
+            self.subscribe(client, {"topics": request['subscribe']})
+        # Everything is captured before the first await; changes after that reach the client as events
+        count, read = self._history_reader()
+        snapshot = marshal.loads(marshal.dumps({
+            "data": {k: v for k, v in self.store.data.items() if k not in ('logs_df', 'tasks', 'aggregates')},
+            "tasks": {mode: self.store.tasks(mode) for mode in settings.THEMES},
+            "aggregates": self.store.aggregates}))
+        snapshot['session_count'] = count
+        if request.get('sessions', True):
+            snapshot['sessions'] = await self._encode_history(read)
+        return snapshot
+
+    async def sessions(self, client, request):
+        """The whole session history as base64 SessionColumns bytes (see data.columnar)."""
+        return await self._encode_history(self._history_reader()[1])
+
+    def _history_reader(self):
+        """Returns (count, read): read() returns the history as of now and may run on another thread."""
+        sessions = self.store.data.get('logs_df')
+        if isinstance(sessions, SessionColumns):
+            copy = sessions.copy()
+            return len(copy), lambda: copy
+        return self.store.session_reader()  # SQLiteStore
+
+    async def _encode_history(self, read):
+        encode_history = lambda: base64.b64encode(read().to_bytes()).decode('ascii')
+        return await asyncio.get_event_loop().run_in_executor(None, encode_history)
+
+    def list_tasks(self, client, request):
+        mode = request.get('mode')
+        if mode not in settings.THEMES:
+            raise ValueError(f"unknown mode {mode!r}")
+        return self.store.tasks(mode)
+
+    def commit(self, client, request):
+        record = self.validate_record(request['record'])
+        self.store.commit(record)
+        self.broadcast("records", {"event": "records", "origin": client.id, "records": [record]})
+        return {"seq": self.store.data.get('journal_seq')}
+
+    def validate_record(self, record):
+        """Returns a clean copy of a client's record, or raises ValueError; nothing unchecked is journaled or broadcast."""
+        op = record.get('op')
+        if op not in RECORD_OPS:
+            raise ValueError(f"Unknown record op {op!r}")
+        if op == "log_session":
+            return {"op": op, "entry": validate(record['entry'])}
+        if op == "set":
+            check = SETTABLE_KEYS.get(record.get('key'))
+            if check is None:
+                raise ValueError(f"{record.get('key')!r} cannot be set")
+            if not check(record.get('value')):
+                raise ValueError(f"bad value {record.get('value')!r} for {record['key']}")
+            return {"op": op, "key": record['key'], "value": record['value']}
+
+        mode = record.get('mode')
+        if mode not in settings.THEMES:
+            raise ValueError(f"unknown mode {mode!r}")
+        index = self.store.task_index(mode)
+        if op == "task_add":
+            task = record['task']
+            if not isinstance(task, dict) or set(task) != {"id", *TASK_FIELDS}:
+                raise ValueError(f"a task needs exactly the fields id, {', '.join(TASK_FIELDS)}")
+            if not isinstance(task['id'], str) or not task['id'] or task['id'] in index:
+                raise ValueError(f"bad or duplicate task id {task['id']!r}")
+            return {"op": op, "mode": mode, "task": _check_task_fields(task, skip=("id",))}
+        if not isinstance(record.get('id'), str) or record['id'] not in index:
+            raise ValueError(f"No task with id {record.get('id')!r}")
+        if op == "task_update":
+            if not isinstance(record.get('fields'), dict) or not record['fields']:
+                raise ValueError("task_update needs fields")
+            return {"op": op, "mode": mode, "id": record['id'], "fields": _check_task_fields(record['fields'])}
+        return {"op": op, "mode": mode, "id": record['id']}
+
+    def log_session(self, client, request):
+        entry = dict(request, timestamp=request.get('timestamp') or datetime.now().isoformat())
+        return self.commit(client, {"record": {"op": "log_session", "entry": entry}})
+
+    def add_sessions(self, client, request):
+        entries = [validate(entry) for entry in request['entries']]
+        self.store.add_sessions(entries)
+        self.broadcast("records", {"event": "records", "origin": client.id,
+                                   "records": [{"op": "log_session", "entry": entry} for entry in entries]})
+        return {"added": len(entries)}
+
+    def subscribe(self, client, request):
+        topics = set(request.get('topics', TOPICS))
+        if not topics <= set(TOPICS):
+            raise ValueError(f"Unknown topics {sorted(topics - set(TOPICS))}")
+        client.topics = topics
+        return sorted(topics)
+
+    # --- Timer ---
+    def timer_status(self, client=None, request=None):
+        if self.timer is None:
+            return {"running": False}
+        state = {k: v for k, v in self.timer.items() if k != 'deadline'}
+        if state['running']:
+            state['remaining_sec'] = max(0, math.ceil(self.timer['deadline'] - asyncio.get_event_loop().time()))
+        return state
+
+    def timer_start(self, client, request):
+        if self.timer is not None and self.timer['running']:
+            raise ValueError("A timer is already running")
+        session_type = request.get('session_type', "Focus")
+        if session_type not in SESSION_TYPES:
+            raise ValueError(f"unknown session_type {session_type!r}")
+        # Checked like a logged session now, so the one the timer logs when it finishes can't fail
+        entry = validate({"timestamp": datetime.now(), "label": request.get('label') or "Unlabeled Session",
+                          "duration_sec": request.get('duration_sec'), "mode": request.get('mode', "Work")})
+        duration = entry['duration_sec']
+        self.timer = {"running": True, "session_type": session_type, "mode": entry['mode'],
+                      "label": entry['label'], "duration_sec": duration,
+                      "remaining_sec": duration, "started_at": datetime.now().isoformat(timespec='seconds'),
+                      "log": bool(request.get('log', True)), "owner": client.id,
+                      "deadline": asyncio.get_event_loop().time() + duration}
+        self._timer_task = asyncio.ensure_future(self._run_timer())
+        return self._timer_changed("started")
+
+    def timer_stop(self, client, request):
+        if self.timer is None or not self.timer['running']:
+            return self.timer_status()  # Already stopped or finished
+        self._timer_task.cancel()
+        self.timer['remaining_sec'] = self.timer_status()['remaining_sec']
+        self.timer['running'] = False
+        return self._timer_changed("stopped")
+
+    def _timer_changed(self, action, error=None, owner=None):
+        """Tells timer subscribers, and with `owner` that client even if it isn't subscribed."""
+        state = self.timer_status()
+        message = {"event": "timer", "action": action, "state": state}
+        if error is not None:
+            message['error'] = error
+        self.broadcast("timer", message)
+        if owner is not None and "timer" not in owner.topics:
+            owner.send(encode(message))
+        return state
+
+    async def _run_timer(self):
+        timer = self.timer
+        try:
+            await self._count_down(timer)
+            timer['running'], timer['remaining_sec'] = False, 0
+            if timer['log'] and timer['session_type'] == "Focus":
+                record = self.validate_record({"op": "log_session", "entry": {
+                    "timestamp": datetime.now().isoformat(), "label": timer['label'],
+                    "duration_sec": timer['duration_sec'], "mode": timer['mode']}})
+                self.store.commit(record)
+                self.broadcast("records", {"event": "records", "origin": None, "records": [record]})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Nothing awaits this task, so an error would otherwise vanish with it
+            print(f"Timer failed: {e}")
+            timer['running'] = False
+            self._timer_changed("failed", error=str(e), owner=self.clients.get(timer['owner']))
+            return
+        self._timer_changed("finished")
+
+    async def _count_down(self, timer):
+        loop = asyncio.get_event_loop()
+        last_sent = None
+        while True:
+            remaining = timer['deadline'] - loop.time()
+            if remaining <= 0:
+                return
+            if math.ceil(remaining) != last_sent:
+                last_sent = math.ceil(remaining)
+                self.broadcast("ticks", {"event": "tick", "remaining_sec": last_sent, "session_type": timer['session_type']})
+            # Wake up when the displayed second changes, like the Tk timer
+            await asyncio.sleep(remaining - math.floor(remaining) or 1.0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m data.daemon", description="Serve the TimeSplit data store to local clients.")
+    parser.add_argument('--host', default=settings.DAEMON_HOST)
+    parser.add_argument('--port', type=int, default=settings.DAEMON_PORT)
+    args = parser.parse_args(argv)
+
+    store = persistence.open_local_store()
+    daemon = SyncDaemon(store)
+    loop = asyncio.new_event_loop()
+    autosaver = None
+    if settings.AUTOSAVE_ENABLED and isinstance(store, persistence.JournalStore):
+        from data.autosave import Autosaver
+        autosaver = Autosaver(store, _LoopScheduler(loop))
+    try:
+        loop.run_until_complete(daemon.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        if autosaver is not None:
+            autosaver.close()
+        store.close()
+        loop.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,314 @@
 # data/persistence.py
 import json
+import os
+import shutil
+from functools import partial
 from config import settings
+from data import aggregates
+from data.columnar import LazySessionColumns, SessionColumns
+from data.task_index import TaskIndex, new_task_id
+
+def _default_data():
+    return {"tasks": {"Work": {}, "Study": {}}, "logs": {}}
+
+# In memory each mode's tasks are an insertion-ordered {id: task} dict, so updates and deletes
+# by id are O(1); files and the daemon API keep the plain list of tasks.
+def tasks_by_id(tasks):
+    """{mode: [task]} -> {mode: {id: task}}; tasks saved before they had ids get one."""
+    result = {}
+    for mode, mode_tasks in tasks.items():
+        result[mode] = {}
+        for task in mode_tasks:
+            task.setdefault('id', new_task_id())
+            result[mode][task['id']] = task
+    return result
+
+def task_lists(tasks):
+    """{mode: {id: task}} -> {mode: [task]}, as files and the daemon API hold them."""
+    return {mode: list(mode_tasks.values()) if isinstance(mode_tasks, dict) else mode_tasks
+            for mode, mode_tasks in tasks.items()}
+
+# Which parts of app_data each journal operation touches (anything else is a top-level setting)
+DIRTY_SECTIONS = {"log_session": ("sessions", "aggregates"), "task_add": ("tasks",),
+                  "task_update": ("tasks",), "task_delete": ("tasks",)}
+
+def _prev_journal_path():
+    return settings.JOURNAL_FILE_PATH + ".prev"
+
+def atomic_write(path, payload, fsync_policy=None):
+    """Writes bytes to a temp file and renames it over `path`, so readers never see a partial file.
+
+    fsync_policy (default settings.AUTOSAVE_FSYNC): "full" also syncs the directory entry,
+    "file" syncs the file contents only, "none" leaves flushing to the OS.
+    """
+    policy = fsync_policy or settings.AUTOSAVE_FSYNC
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        if policy != "none":
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if policy == "full" and hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
 def save_data(data):
-    """Saves the application data (tasks, logs) to a JSON file."""
+    """Saves the application data to a JSON snapshot plus a binary session file and folds the journal into them."""
+    sessions = data.get('logs_df')
+    if not isinstance(sessions, SessionColumns):
+        sessions = SessionColumns(sessions or [])
+    snapshot = {key: value for key, value in data.items() if key != 'logs_df'}
+    snapshot['tasks'] = task_lists(data.get('tasks', {}))
+    snapshot['session_count'] = len(sessions)
     try:
-        with open(settings.DATA_FILE_PATH, 'w') as f:
-            json.dump(data, f, indent=4)
+        # Sessions are append-only, so a session file saved ahead of a failed snapshot is cut back on load
+        write_sessions = sessions.bytes_writer()
+        if write_sessions is not None:
+            atomic_write(settings.SESSIONS_FILE_PATH, write_sessions())
+        atomic_write(settings.DATA_FILE_PATH, json.dumps(snapshot, separators=(',', ':')).encode())
+        # Everything up to data['journal_seq'] is now in the snapshot
+        open(settings.JOURNAL_FILE_PATH, 'w').close()
+        if os.path.exists(_prev_journal_path()):
+            os.remove(_prev_journal_path())
     except IOError as e:
         print(f"Error saving data: {e}")
 
 def load_data():
-    """Loads the application data from a JSON file."""
+    """Loads the application data from the JSON snapshot and replays the journal tail on top.
+
+    The snapshot holds only small state (settings, tasks, aggregates); session history stays
+    in the sessions file until something reads it, see LazySessionColumns.
+    """
     try:
         with open(settings.DATA_FILE_PATH, 'r') as f:
-            return json.load(f)
+            data = json.load(f)
     except (FileNotFoundError, json.JSONDecodeError):
         # Return a default structure if the file doesn't exist or is empty
-        return {"tasks": {"Work": [], "Study": []}, "logs": {}}
\ No newline at end of file
+        data = _default_data()
+    data['tasks'] = tasks_by_id(data.get('tasks', {}))
+
+    if 'logs_df' in data:
+        # Snapshot from before the session file: convert; the next save moves it out of the JSON
+        data['logs_df'] = SessionColumns(data['logs_df'])
+    else:
+        # Only the count is needed to start; the history is read the first time it is used
+        data['logs_df'] = LazySessionColumns(partial(SessionColumns.load, settings.SESSIONS_FILE_PATH),
+                                             data.pop('session_count', 0))
+
+    for record in journal_records():
+        if record.get('seq', 0) <= data.get('journal_seq', 0):
+            continue  # Already folded into the snapshot
+        apply_record(data, record)
+        data['journal_seq'] = record['seq']
+
+    # Data saved before aggregates existed (or edited by hand) gets them rebuilt once
+    data.get('aggregates', {}).pop('by_day', None)  # Kept by earlier versions; see data.rollups
+    if data.get('aggregates', {}).get('count') != len(data.get('logs_df', [])):
+        data['aggregates'] = aggregates.rebuild(data.get('logs_df', []))
+    return data
+
+# --- Journal ---
+def read_journal(path=None):
+    """Yields the records of the line-delimited journal, skipping a torn last line."""
+    try:
+        with open(path or settings.JOURNAL_FILE_PATH, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print("Skipping incomplete journal record.")
+    except FileNotFoundError:
+        return
+
+def journal_records():
+    """Yields the rotated journal (written before a snapshot that may not have finished) and then the live one."""
+    yield from read_journal(_prev_journal_path())
+    yield from read_journal()
+
+def _task_id(tasks, record):
+    """Id of the task a record refers to; journals written before task ids used the list 'index' (O(n))."""
+    if 'id' not in record:
+        return list(tasks)[record['index']]
+    if record['id'] not in tasks:
+        raise KeyError(f"No task with id {record['id']}")
+    return record['id']
+
+def apply_record(data, record, task_indexes=None):
+    """Applies one journal record to the in-memory application data (and any task indexes built over it)."""
+    op = record['op']
+    index = (task_indexes or {}).get(record.get('mode'))
+    if op == "log_session":
+        # Checked before either structure changes; once the columns accept the entry the aggregates can't fail
+        delta = aggregates.session_delta(record['entry'])
+        data['logs_df'].append(record['entry'])
+        aggregates.apply_delta(data.setdefault('aggregates', aggregates.empty()), delta)
+    elif op == "task_add":
+        task = record['task']
+        task.setdefault('id', new_task_id())  # Journals written before task ids
+        data.setdefault('tasks', {"Work": {}, "Study": {}}).setdefault(record['mode'], {})[task['id']] = task
+        if index is not None:
+            index.add(task)
+    elif op == "task_update":
+        if index is not None:
+            index.update(record['id'], record['fields'])  # The index holds the same task dicts
+        else:
+            tasks = data['tasks'][record['mode']]
+            tasks[_task_id(tasks, record)].update(record['fields'])
+    elif op == "task_delete":
+        tasks = data['tasks'][record['mode']]
+        task = tasks.pop(_task_id(tasks, record))
+        if index is not None:
+            index.remove(task['id'])
+    elif op == "set":
+        data[record['key']] = record['value']
+    else:
+        print(f"Unknown journal operation: {op}")
+
+class JournalStore:
+    """Keeps app data in memory and appends every change to a journal in constant time."""
+    def __init__(self):
+        self.data = load_data()
+        self.data.setdefault('journal_seq', 0)
+        self.pending = sum(1 for _ in journal_records())
+        self._journal = open(settings.JOURNAL_FILE_PATH, 'a')
+        self._task_indexes = {}
+        self._rollups = None
+        self.dirty = set()      # Sections changed since the last snapshot (see DIRTY_SECTIONS)
+        self.autosaver = None   # A data.autosave.Autosaver takes over compaction when attached
+
+    def _apply(self, record):
+        apply_record(self.data, record, self._task_indexes)
+        if record['op'] == "log_session" and self._rollups is not None:
+            self._rollups.add_session(record['entry'])
+
+    def commit(self, record):
+        """Applies a change and appends it to the journal."""
+        self._apply(record)
+        self.data['journal_seq'] += 1
+        self._journal.write(json.dumps(dict(record, seq=self.data['journal_seq'])) + "\n")
+        self._journal.flush()
+        if settings.JOURNAL_FSYNC:
+            os.fsync(self._journal.fileno())
+
+        self.pending += 1
+        self.dirty.update(DIRTY_SECTIONS.get(record['op'], ("settings",)))
+        if self.autosaver is not None:
+            self.autosaver.changed()
+        elif self.pending >= settings.JOURNAL_COMPACT_THRESHOLD:
+            self.compact()
+
+    def add_sessions(self, entries):
+        """Bulk version of committing log_session records; compaction is left to close()."""
+        for entry in entries:
+            record = {'op': 'log_session', 'entry': entry}
+            self._apply(record)
+            self.data['journal_seq'] += 1
+            self._journal.write(json.dumps(dict(record, seq=self.data['journal_seq'])) + "\n")
+        self._journal.flush()
+        if settings.JOURNAL_FSYNC:
+            os.fsync(self._journal.fileno())
+        self.pending += len(entries)
+        self.dirty.update(DIRTY_SECTIONS["log_session"])
+        if self.autosaver is not None:
+            self.autosaver.changed()
+
+    # --- Queries (same interface as SQLiteStore) ---
+    @property
+    def aggregates(self):
+        """Per-mode, per-label, per-day and per-week totals, updated on every logged session."""
+        return self.data['aggregates']
+
+    @property
+    def rollups(self):
+        """Range-queryable daily totals (data.rollups.Rollups), built from the session history on first use."""
+        if self._rollups is None:
+            from data.rollups import Rollups
+            self._rollups = Rollups(self.session_columns())
+        return self._rollups
+
+    def tasks(self, mode):
+        """Returns the tasks of one mode in insertion order."""
+        return list(self.data.get('tasks', {}).get(mode, {}).values())
+
+    def task_index(self, mode):
+        """Returns the TaskIndex of one mode, built on first use and kept current by commit()."""
+        if mode not in self._task_indexes:
+            self._task_indexes[mode] = TaskIndex(self.tasks(mode))
+        return self._task_indexes[mode]
+
+    def sessions(self, start=None, end=None, mode=None, label=None):
+        """Returns the logged sessions matching the filters, oldest first."""
+        return list(self.iter_sessions(start, end, mode, label))
+
+    def iter_sessions(self, start=None, end=None, mode=None, label=None):
+        # Filtering runs on the integer columns; only matching sessions are decoded to dicts
+        sessions = self.data['logs_df']
+        return (sessions[int(i)] for i in sessions.select(start, end, mode, label))
+
+    def session_totals(self, by, start=None, end=None, mode=None):
+        """Returns {mode or label: total seconds} for the sessions matching the filters."""
+        import numpy as np
+        sessions = self.data['logs_df']
+        columns = sessions.view()
+        selected = sessions.select(start, end, mode)
+        ids, names = (columns['mode_id'], sessions.modes) if by == 'mode' else (columns['label_id'], sessions.labels)
+        sums = np.bincount(ids[selected], weights=columns['duration_sec'][selected], minlength=len(names))
+        present = np.bincount(ids[selected], minlength=len(names)) > 0
+        return {names[i]: int(sums[i]) for i in np.flatnonzero(present)}
+
+    def session_columns(self):
+        """The session log as NumPy columns (see SessionColumns.view), without copying."""
+        return self.data['logs_df'].view()
+
+    def compact(self):
+        """Folds the journal into a fresh snapshot."""
+        self._journal.close()
+        save_data(self.data)
+        self.pending = 0
+        self.dirty.clear()
+        self._journal = open(settings.JOURNAL_FILE_PATH, 'a')
+
+    def rotate_journal(self):
+        """Starts an empty journal, moving the records so far to the .prev file.
+
+        A background snapshot covering those records deletes the .prev file once it is on
+        disk; until then both files are replayed on load.
+        """
+        self._journal.close()
+        prev_path = _prev_journal_path()
+        if os.path.exists(prev_path):
+            # An earlier snapshot never finished: keep its records as well
+            with open(prev_path, 'a') as prev, open(settings.JOURNAL_FILE_PATH, 'r') as current:
+                shutil.copyfileobj(current, prev)
+            os.remove(settings.JOURNAL_FILE_PATH)
+        else:
+            os.replace(settings.JOURNAL_FILE_PATH, prev_path)
+        self.pending = 0
+        self._journal = open(settings.JOURNAL_FILE_PATH, 'a')
+
+    def close(self):
+        self.compact()
+        self._journal.close()
+
+def open_store():
+    """Opens the store the app should use: a mirror of the sync daemon's (settings.SYNC_DAEMON) or the local files."""
+    if settings.SYNC_DAEMON:
+        from data.remote_store import RemoteStore
+        try:
+            return RemoteStore()
+        except OSError as e:
+            print(f"Could not reach the TimeSplit daemon ({e}); using the local data files.")
+    return open_local_store()
+
+def open_local_store():
+    """Opens the storage backend selected by settings.STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == "sqlite":
+        from data.sqlite_store import SQLiteStore, migrate_from_json
+        if not os.path.exists(settings.SQLITE_DB_PATH) and os.path.exists(settings.DATA_FILE_PATH):
+            migrate_from_json()
+        return SQLiteStore()
+    return JournalStore()
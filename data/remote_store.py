@@ -0,0 +1,197 @@
+# data/remote_store.py
+import base64
+import json
+import queue
+import socket
+import threading
+import time
+from config import settings
+from data.columnar import LazySessionColumns, SessionColumns
+from data.persistence import JournalStore, tasks_by_id
+
+RECONNECT_SEC = 5.0
+
+class DaemonConnection:
+    """A connection to data.daemon. Replies and events are read on a background thread;
+    events wait in `events` until the owner drains them on its own thread."""
+    def __init__(self, host=None, port=None):
+        self.sock = socket.create_connection((host or settings.DAEMON_HOST, port or settings.DAEMON_PORT),
+                                             timeout=settings.DAEMON_CONNECT_TIMEOUT_SEC)
+        self.sock.settimeout(None)
+        self.events = queue.Queue()
+        self.closed = False
+        self._next_id = 0
+        self._waiting = {}  # Request id -> [threading.Event, reply]
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        threading.Thread(target=self._read_loop, name="daemon-client", daemon=True).start()
+
+    def send(self, op, **params):
+        """Sends a request without waiting for the reply; an error reply is printed when it arrives."""
+        self._send(op, params, None)
+
+    def request(self, op, timeout=None, **params):
+        """Sends a request and returns its result; raises OSError if the daemon is gone, RuntimeError if it refuses."""
+        waiter = [threading.Event(), None]
+        self._send(op, params, waiter)
+        if not waiter[0].wait(timeout or settings.DAEMON_REQUEST_TIMEOUT_SEC):
+            raise TimeoutError(f"No reply from the daemon to {op}")
+        reply = waiter[1]
+        if reply is None:
+            raise ConnectionError("Lost the connection to the daemon")
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply['result']
+
+    def _send(self, op, params, waiter):
+        if self.closed:
+            raise ConnectionError("Not connected to the daemon")
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            if waiter is not None:
+                self._waiting[request_id] = waiter
+        payload = (json.dumps(dict(params, id=request_id, op=op), separators=(',', ':')) + "\n").encode()
+        with self._send_lock:
+            self.sock.sendall(payload)
+
+    def _read_loop(self):
+        try:
+            for line in self.sock.makefile('rb'):
+                message = json.loads(line)
+                if 'event' in message:
+                    self.events.put(message)
+                    continue
+                with self._lock:
+                    waiter = self._waiting.pop(message.get('id'), None)
+                if waiter is not None:
+                    waiter[1] = message
+                    waiter[0].set()
+                elif not message.get('ok'):
+                    print(f"The daemon rejected a change: {message.get('error')}")
+        except (OSError, ValueError):
+            pass
+        self.closed = True
+        with self._lock:
+            waiting, self._waiting = self._waiting, {}
+        for event, _ in waiting.values():
+            event.set()
+        self.events.put({"event": "disconnected"})
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+class RemoteStore(JournalStore):
+    """A JournalStore whose data mirrors the sync daemon's instead of living in local files.
+
+    Changes are applied here at once, so the UI never waits for a round trip, and sent to
+    the daemon, which journals them and forwards them to the other clients; poll() applies
+    theirs. While the daemon is unreachable, changes queue up and go out on reconnect
+    (changes other clients make in that time show up after a restart).
+    """
+    def __init__(self, host=None, port=None):
+        self.host, self.port = host, port
+        self._unsent = []
+        self._retry_at = 0.0
+        self.timer = {"running": False}  # The daemon's timer, as of the last poll()
+        self._connect()
+        # Subscribing in the same request means no change is both in the snapshot and replayed
+        snapshot = self.connection.request("snapshot", subscribe=["records", "timer"], sessions=False)
+        self.data = dict(snapshot['data'], tasks=tasks_by_id(snapshot['tasks']), aggregates=snapshot['aggregates'])
+        # The history comes over only if something reads it; changes received meanwhile queue in its tail
+        self.data['logs_df'] = LazySessionColumns(self._fetch_sessions, snapshot['session_count'])
+        self.pending = 0
+        self._task_indexes = {}
+        self._rollups = None
+        self.dirty = set()
+        self.autosaver = None
+
+    def _connect(self):
+        self.connection = DaemonConnection(self.host, self.port)
+        hello = self.connection.request("hello")
+        self.client_id = hello['client_id']
+        self.timer = hello['timer']
+
+    def _fetch_sessions(self):
+        return SessionColumns.from_bytes(base64.b64decode(self.connection.request("sessions")))
+
+    def commit(self, record):
+        """Applies a change and sends it to the daemon."""
+        self._apply(record)
+        self._send("commit", record=record)
+
+    def add_sessions(self, entries):
+        entries = list(entries)
+        for entry in entries:
+            self._apply({'op': 'log_session', 'entry': entry})
+        self._send("add_sessions", entries=entries)
+
+    def _send(self, op, **params):
+        if not self._unsent and not self.connection.closed:
+            try:
+                self.connection.send(op, **params)
+                return
+            except OSError:
+                pass
+        self._unsent.append((op, params))
+
+    def publish_timer(self, running, **state):
+        """Mirrors the app's own timer to the daemon for other clients; the app logs its sessions itself."""
+        try:
+            if running:
+                self.connection.send("timer_start", log=False, **state)
+            else:
+                self.connection.send("timer_stop")
+        except OSError:
+            pass  # Only a status display misses it
+
+    def poll(self):
+        """Applies the changes other clients made since the last call; returns how many there were."""
+        applied = 0
+        while True:
+            try:
+                message = self.connection.events.get_nowait()
+            except queue.Empty:
+                break
+            if message['event'] == "records" and message['origin'] != self.client_id:
+                for record in message['records']:
+                    try:
+                        self._apply(record)
+                        applied += 1
+                    except (KeyError, IndexError) as e:
+                        print(f"Skipping a change from another client: {e}")
+            elif message['event'] == "timer":
+                self.timer = message['state']
+                if message['action'] == "failed":
+                    print(f"The daemon's timer failed: {message.get('error')}")
+            elif message['event'] == "disconnected":
+                print("Lost the connection to the TimeSplit daemon; changes will be sent when it is back.")
+        if self.connection.closed:
+            self._reconnect()
+        return applied
+
+    def _reconnect(self):
+        if time.monotonic() < self._retry_at:
+            return
+        self._retry_at = time.monotonic() + RECONNECT_SEC
+        try:
+            self._connect()
+            self.connection.request("subscribe", topics=["records", "timer"])
+        except (OSError, RuntimeError):
+            return
+        unsent, self._unsent = self._unsent, []
+        for op, params in unsent:
+            self._send(op, **params)
+
+    def compact(self):
+        pass  # The daemon owns the files
+
+    def close(self):
+        if self._unsent:
+            print(f"{len(self._unsent)} changes could not be sent to the TimeSplit daemon and are lost.")
+        self.connection.close()
@@ -0,0 +1,145 @@
+# data/rollups.py
+from datetime import date
+import numpy as np
+
+SPARE_DAYS = 64  # Days allocated past today, so new sessions rarely force a regrow
+US_PER_DAY = 86400 * 10 ** 6
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+class _SparseRunning:
+    """Running totals of one label (or mode and label) over only the days it has sessions on.
+
+    `days` holds those days as ordinals, ascending; cum[k] is everything logged before days[k].
+    """
+    __slots__ = ("days", "cum")
+
+    def __init__(self, days=(), seconds=()):
+        self.days = np.asarray(days, dtype=np.int64)
+        self.cum = np.zeros(len(self.days) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(seconds, dtype=np.int64), out=self.cum[1:])
+
+    def add(self, day, seconds):
+        """O(1) for the series' latest day, O(its active days) otherwise."""
+        i = int(np.searchsorted(self.days, day))
+        if i == len(self.days) or self.days[i] != day:
+            self.days = np.insert(self.days, i, day)
+            self.cum = np.insert(self.cum, i + 1, self.cum[i])
+        self.cum[i + 1:] += seconds
+
+    def before(self, days):
+        """Seconds logged before each of the given day ordinals."""
+        return self.cum[np.searchsorted(self.days, days, side='left')]
+
+def _sparse_groups(groups, offsets, seconds, first_ordinal):
+    """Yields (group, _SparseRunning) with the seconds of each group summed per day."""
+    span = int(offsets.max()) + 1
+    keys, inverse = np.unique(groups * span + offsets, return_inverse=True)
+    sums = np.bincount(inverse, weights=seconds).astype(np.int64)
+    owners = keys // span
+    bounds = np.flatnonzero(np.diff(owners)) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(keys)]))):
+        yield int(owners[start]), _SparseRunning(keys[start:end] % span + first_ordinal, sums[start:end])
+
+class Rollups:
+    """Seconds per day, mode and label as running totals.
+
+    The overall and per-mode totals are dense NumPy arrays over every day (row k = everything
+    logged before day k); labels are free text and can number in the thousands, so each label
+    and each (mode, label) pair keeps a sparse series over just the days it was logged on.
+    Either way the total for a date range is two lookups and a subtraction, and a trend for
+    any window is one vectorised lookup plus np.diff. Built from session columns (see
+    SessionColumns.view) in a few vectorised passes and kept current with add_session().
+    """
+    def __init__(self, columns):
+        self.rebuild(columns)
+
+    def rebuild(self, columns):
+        self.modes = sorted(set(columns['modes']))
+        self.by_label, self.cells = {}, {}
+        if not len(columns['timestamp_us']):
+            self.first_day = date.today()
+            self._set_daily(np.zeros((1 + SPARE_DAYS, len(self.modes)), dtype=np.int64))
+            return
+
+        day = columns['timestamp_us'] // US_PER_DAY + EPOCH_ORDINAL  # Timestamps are naive local times
+        seconds = columns['duration_sec'].astype(np.int64)
+        mode = np.array([self.modes.index(m) for m in columns['modes']], dtype=np.int64)[columns['mode_id']]
+        label = columns['label_id'].astype(np.int64)
+        labels = columns['labels']
+
+        first = int(day.min())
+        self.first_day = date.fromordinal(first)
+        days = max(int(day.max()), date.today().toordinal()) - first + 1 + SPARE_DAYS
+        offset = day - first
+        daily = np.bincount(offset * len(self.modes) + mode, weights=seconds, minlength=days * len(self.modes))
+        for group, series in _sparse_groups(label, offset, seconds, first):
+            self.by_label[labels[group]] = series
+        for pair, series in _sparse_groups(mode * len(labels) + label, offset, seconds, first):
+            self.cells[(self.modes[pair // len(labels)], labels[pair % len(labels)])] = series
+        self._set_daily(daily.astype(np.int64).reshape(days, len(self.modes)))
+
+    @property
+    def labels(self):
+        return sorted(self.by_label)
+
+    def _set_daily(self, daily):
+        self._mode_ids = {mode: i for i, mode in enumerate(self.modes)}
+        self.days = daily.shape[0]
+        self.by_mode = np.zeros((self.days + 1, daily.shape[1]), dtype=np.int64)
+        np.cumsum(daily, axis=0, out=self.by_mode[1:])
+        self.total_seconds = self.by_mode.sum(axis=1)
+
+    def add_session(self, entry):
+        """Folds one session in; O(days after it) on the dense totals, which is O(1) for a session logged today."""
+        mode, label, seconds = entry['mode'], entry['label'], entry['duration_sec']
+        day = date.fromisoformat(entry['timestamp'][:10])
+        offset = (day - self.first_day).days
+        if mode not in self._mode_ids or not 0 <= offset < self.days:
+            self._grow(mode, offset)
+            offset = (day - self.first_day).days
+        m = self._mode_ids[mode]
+        self.by_mode[offset + 1:, m] += seconds
+        self.total_seconds[offset + 1:] += seconds
+        self.by_label.setdefault(label, _SparseRunning()).add(day.toordinal(), seconds)
+        self.cells.setdefault((mode, label), _SparseRunning()).add(day.toordinal(), seconds)
+
+    def _grow(self, mode, offset):
+        """Re-lays the dense arrays to fit a new mode or a day outside the allocated range (labels never need this)."""
+        daily = np.diff(self.by_mode, axis=0)
+        old_modes = self.modes
+        self.modes = sorted(set(old_modes) | {mode})
+        shift = max(0, -offset)
+        days = max(self.days + shift, offset + shift + 1 + SPARE_DAYS)
+
+        grown = np.zeros((days, len(self.modes)), dtype=np.int64)
+        mode_index = [self.modes.index(m) for m in old_modes]
+        grown[np.ix_(range(shift, shift + self.days), mode_index)] = daily
+        self.first_day = date.fromordinal(self.first_day.toordinal() - shift)
+        self._set_daily(grown)
+
+    # --- Queries ---
+    def _before(self, ordinals, mode=None, label=None):
+        """Seconds logged before each of the given day ordinals (zeros for an unknown mode or label)."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if mode is not None and mode not in self._mode_ids:
+            return np.zeros(len(ordinals), dtype=np.int64)
+        if label is not None:
+            series = self.by_label.get(label) if mode is None else self.cells.get((mode, label))
+            return series.before(ordinals) if series is not None else np.zeros(len(ordinals), dtype=np.int64)
+        running = self.total_seconds if mode is None else self.by_mode[:, self._mode_ids[mode]]
+        return running[np.clip(ordinals - self.first_day.toordinal(), 0, self.days)]
+
+    def total(self, start, end, mode=None, label=None):
+        """Seconds logged from `start` up to (not including) `end`, in constant (logarithmic for a label) time."""
+        if end <= start:
+            return 0
+        first, last = self._before((start.toordinal(), end.toordinal()), mode, label)
+        return int(last - first)
+
+    def totals(self, edges, mode=None, label=None):
+        """Seconds in each interval between consecutive dates in `edges` (e.g. week or month starts)."""
+        return np.diff(self._before([d.toordinal() for d in edges], mode, label))
+
+    def daily(self, start, end, mode=None, label=None):
+        """Seconds per day from `start` up to `end`, e.g. for a trend line or a yearly heatmap."""
+        return np.diff(self._before(np.arange(start.toordinal(), end.toordinal() + 1), mode, label))
@@ -0,0 +1,253 @@
+# data/sqlite_store.py
+import json
+import os
+import sqlite3
+import sys
+from config import settings
+from data import aggregates, persistence
+from data.columnar import SessionColumns
+from data.task_index import TaskIndex, new_task_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    label TEXT NOT NULL,
+    duration_sec INTEGER NOT NULL,
+    mode TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_mode ON sessions(mode, timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_label ON sessions(label);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    task_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_mode ON tasks(mode, position);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+SESSION_COLUMNS = ('timestamp', 'label', 'duration_sec', 'mode')
+GROUP_COLUMNS = {'mode': 'mode', 'label': 'label'}
+
+def _where(start=None, end=None, mode=None, label=None):
+    """Builds a WHERE clause for the session filters that were actually given."""
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        clauses.append("timestamp < ?")
+        params.append(end.isoformat())
+    if mode is not None:
+        clauses.append("mode = ?")
+        params.append(mode)
+    if label is not None:
+        clauses.append("label = ?")
+        params.append(label)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+class SQLiteStore:
+    """Keeps sessions, tasks and settings in indexed SQLite tables and answers narrow queries."""
+    def __init__(self, path=None):
+        self.path = path or settings.SQLITE_DB_PATH
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._upgrade_tasks()
+        # Only the small settings table is held in memory
+        self.data = {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM settings")}
+        self.aggregates = self._load_aggregates()
+        self._task_indexes = {}
+        self._rollups = None
+
+    def _upgrade_tasks(self):
+        """Adds the task_id column to databases created before tasks had ids and backfills it."""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")]
+        with self.conn:
+            if 'task_id' not in columns:
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN task_id TEXT")
+            for row_id, body in self.conn.execute("SELECT id, body FROM tasks WHERE task_id IS NULL").fetchall():
+                task = json.loads(body)
+                task.setdefault('id', new_task_id())
+                self.conn.execute("UPDATE tasks SET body = ?, task_id = ? WHERE id = ?", (json.dumps(task), task['id'], row_id))
+            self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_task_id ON tasks(task_id)")
+
+    # --- Writes ---
+    def commit(self, record):
+        """Applies one change record (same format as the JSON journal) in a single transaction."""
+        op = record['op']
+        with self.conn:
+            if op == "log_session":
+                self.insert_sessions([record['entry']])
+            elif op == "task_add":
+                task = record['task']
+                self.conn.execute(
+                    "INSERT INTO tasks (mode, position, body, task_id) "
+                    "VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM tasks WHERE mode = ?), ?, ?)",
+                    (record['mode'], record['mode'], json.dumps(task), task['id']))
+                if record['mode'] in self._task_indexes:
+                    self._task_indexes[record['mode']].add(task)
+            elif op == "task_update":
+                index = self._task_indexes.get(record['mode'])
+                if index is not None:
+                    task = index.update(record['id'], record['fields'])
+                else:
+                    task = self._task(record['id'])
+                    task.update(record['fields'])
+                self.conn.execute("UPDATE tasks SET body = ? WHERE task_id = ?", (json.dumps(task), record['id']))
+            elif op == "task_delete":
+                self.conn.execute("DELETE FROM tasks WHERE task_id = ?", (record['id'],))
+                if record['mode'] in self._task_indexes:
+                    self._task_indexes[record['mode']].remove(record['id'])
+            elif op == "set":
+                self.conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                  (record['key'], json.dumps(record['value'])))
+                self.data[record['key']] = record['value']
+            else:
+                print(f"Unknown store operation: {op}")
+
+    def add_sessions(self, entries):
+        """Bulk version of committing log_session records, in one transaction."""
+        with self.conn:
+            self.insert_sessions(entries)
+
+    def insert_sessions(self, entries):
+        for e in entries:
+            self.conn.execute("INSERT INTO sessions (timestamp, label, duration_sec, mode) VALUES (?, ?, ?, ?)",
+                              (e['timestamp'], e['label'], e['duration_sec'], e['mode']))
+            aggregates.add_session(self.aggregates, e)
+            if self._rollups is not None:
+                self._rollups.add_session(e)
+
+    def _task(self, task_id):
+        row = self.conn.execute("SELECT body FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No task with id {task_id}")
+        return json.loads(row[0])
+
+    # --- Queries ---
+    def tasks(self, mode):
+        """Returns the tasks of one mode in insertion order."""
+        rows = self.conn.execute("SELECT body FROM tasks WHERE mode = ? ORDER BY position", (mode,))
+        return [json.loads(body) for (body,) in rows]
+
+    def task_index(self, mode):
+        """Returns the TaskIndex of one mode, built on first use and kept current by commit()."""
+        if mode not in self._task_indexes:
+            self._task_indexes[mode] = TaskIndex(self.tasks(mode))
+        return self._task_indexes[mode]
+
+    def sessions(self, start=None, end=None, mode=None, label=None):
+        """Returns the logged sessions matching the filters, oldest first."""
+        return list(self.iter_sessions(start, end, mode, label))
+
+    def iter_sessions(self, start=None, end=None, mode=None, label=None):
+        where, params = _where(start, end, mode, label)
+        rows = self.conn.execute(f"SELECT timestamp, label, duration_sec, mode FROM sessions{where} ORDER BY timestamp", params)
+        return (dict(zip(SESSION_COLUMNS, row)) for row in rows)
+
+    def session_reader(self):
+        """Returns (count, read): read() builds the sessions logged so far as SessionColumns on its
+        own connection, so it can run on another thread while this one keeps writing."""
+        count, last_id = self.conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM sessions").fetchone()
+
+        def read():
+            conn = sqlite3.connect(self.path)
+            try:
+                rows = conn.execute("SELECT timestamp, label, duration_sec, mode FROM sessions WHERE id <= ? "
+                                    "ORDER BY timestamp", (last_id,))
+                return SessionColumns(dict(zip(SESSION_COLUMNS, row)) for row in rows)
+            finally:
+                conn.close()
+        return count, read
+
+    def session_columns(self):
+        """The session log as NumPy columns (see SessionColumns.view)."""
+        return SessionColumns(self.iter_sessions()).view()
+
+    def session_totals(self, by, start=None, end=None, mode=None):
+        """Returns {mode or label: total seconds} for the sessions matching the filters."""
+        column = GROUP_COLUMNS[by]
+        where, params = _where(start, end, mode)
+        rows = self.conn.execute(f"SELECT {column}, SUM(duration_sec) FROM sessions{where} GROUP BY {column}", params)
+        return dict(rows)
+
+    # --- Aggregates ---
+    @property
+    def rollups(self):
+        """Range-queryable daily totals (data.rollups.Rollups), built on first use."""
+        if self._rollups is None:
+            from data.rollups import Rollups
+            # One row per day, mode and label is all the rollups need
+            rows = self.conn.execute("SELECT substr(timestamp, 1, 10), label, SUM(duration_sec), mode FROM sessions GROUP BY 1, 2, 4")
+            self._rollups = Rollups(SessionColumns(dict(zip(SESSION_COLUMNS, row)) for row in rows).view())
+        return self._rollups
+
+    def _last_session_id(self):
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM sessions").fetchone()[0]
+
+    def _load_aggregates(self):
+        """Loads the saved aggregates, rebuilding them in SQL if sessions were added since they were saved."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'aggregates'").fetchone()
+        saved = json.loads(row[0]) if row else None
+        if saved and saved.get('last_session_id') == self._last_session_id():
+            saved['state'].pop('by_day', None)  # Kept by earlier versions; see data.rollups
+            return saved['state']
+
+        state = aggregates.empty()
+        rows = self.conn.execute("SELECT substr(timestamp, 1, 10), mode, label, SUM(duration_sec), COUNT(*) "
+                                 "FROM sessions GROUP BY 1, 2, 3")
+        for day, mode, label, seconds, count in rows:
+            aggregates.add_session(state, {'timestamp': day, 'mode': mode, 'label': label, 'duration_sec': seconds})
+            state['count'] += count - 1
+        return state
+
+    def save_aggregates(self):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates', ?)",
+                              (json.dumps({'last_session_id': self._last_session_id(), 'state': self.aggregates}),))
+
+    def close(self):
+        self.save_aggregates()
+        self.conn.close()
+
+# --- Migration ---
+def migrate_from_json(db_path=None):
+    """One-shot copy of the JSON snapshot and journal into a fresh SQLite database."""
+    db_path = db_path or settings.SQLITE_DB_PATH
+    if os.path.exists(db_path):
+        print(f"{db_path} already exists; not migrating.")
+        return False
+
+    data = persistence.load_data()
+    store = SQLiteStore(db_path)
+    with store.conn:
+        store.insert_sessions(data.get('logs_df', []))
+        for mode, tasks in data.get('tasks', {}).items():
+            store.conn.executemany("INSERT INTO tasks (mode, position, body, task_id) VALUES (?, ?, ?, ?)",
+                                   ((mode, i, json.dumps(task), task['id']) for i, task in enumerate(tasks.values())))
+        for key, value in data.items():
+            if key not in ('tasks', 'logs_df', 'logs', 'journal_seq', 'aggregates'):
+                store.conn.execute("INSERT INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+    store.close()
+    print(f"Migrated {len(data.get('logs_df', []))} sessions to {db_path}.")
+    return True
+
+if __name__ == "__main__":
+    # python -m data.sqlite_store [db_path]
+    migrate_from_json(sys.argv[1] if len(sys.argv) > 1 else None)
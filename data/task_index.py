@@ -0,0 +1,115 @@
+# data/task_index.py
+import bisect
+import itertools
+import uuid
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+PRIORITY_ORDER = {"High": 1, "Medium": 2, "Low": 3}
+
+def new_task_id():
+    return uuid.uuid4().hex
+
+class TaskIndex:
+    """The tasks of one mode, by id, with the planner's orderings kept sorted as tasks change.
+
+    Lookups by id are O(1). Add, update and delete place a task in each ordering instead of
+    re-sorting: O(log n) with sortedcontainers installed, otherwise a binary search plus a
+    list insert or delete that shifts O(n) references (a memmove, fast well past planner
+    sizes). Views can be read off in order at any time.
+    """
+    def __init__(self, tasks=()):
+        self.by_id = {}
+        self._priority_keys = _SortedKeys()   # (done, priority rank, seq, id)
+        self._deadline_keys = _SortedKeys()   # (deadline, seq, id)
+        self._keys = {}            # id -> (priority key, deadline key)
+        self._seq = itertools.count()
+        self.version = 0  # Bumped on every change, so views can tell when to re-read
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, task_id):
+        return task_id in self.by_id
+
+    def get(self, task_id):
+        return self.by_id[task_id]
+
+    def add(self, task):
+        self.by_id[task['id']] = task
+        self._insert_keys(task, next(self._seq))
+        self.version += 1
+
+    def update(self, task_id, fields):
+        """Applies `fields` to the task (in place) and repositions it in the orderings."""
+        task = self.by_id[task_id]
+        seq = self._remove_keys(task_id)
+        task.update(fields)
+        self._insert_keys(task, seq)
+        self.version += 1
+        return task
+
+    def remove(self, task_id):
+        self._remove_keys(task_id)
+        self.version += 1
+        return self.by_id.pop(task_id)
+
+    # --- Ordered views ---
+    def by_priority(self):
+        """Open tasks first, then by priority; ties keep creation order."""
+        return [self.by_id[key[-1]] for key in self._priority_keys]
+
+    def by_deadline(self):
+        return [self.by_id[key[-1]] for key in self._deadline_keys]
+
+    def due_between(self, start, end):
+        """Tasks whose 'YYYY-MM-DD' deadline falls in [start, end), in time proportional to the result."""
+        return [self.by_id[key[-1]] for key in self._deadline_keys.between((start,), (end,))]
+
+    # --- Internals ---
+    def _insert_keys(self, task, seq):
+        priority_key = (task['done'], PRIORITY_ORDER.get(task['priority'], 3), seq, task['id'])
+        deadline_key = (task.get('deadline') or "", seq, task['id'])
+        self._priority_keys.add(priority_key)
+        self._deadline_keys.add(deadline_key)
+        self._keys[task['id']] = (priority_key, deadline_key)
+
+    def _remove_keys(self, task_id):
+        priority_key, deadline_key = self._keys.pop(task_id)
+        self._priority_keys.remove(priority_key)
+        self._deadline_keys.remove(deadline_key)
+        return priority_key[2]
+
+class _SortedKeys:
+    """Sorted unique keys: a sortedcontainers.SortedList when available, else a bisect-maintained list."""
+    def __init__(self):
+        self.keys = SortedList() if SortedList is not None else []
+
+    def add(self, key):
+        if SortedList is not None:
+            self.keys.add(key)
+        else:
+            bisect.insort(self.keys, key)
+
+    def remove(self, key):
+        if SortedList is not None:
+            self.keys.remove(key)
+        else:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def between(self, low, high):
+        """Keys in [low, high)."""
+        if SortedList is not None:
+            return self.keys.irange(low, high, inclusive=(True, False))
+        return self.keys[bisect.bisect_left(self.keys, low):bisect.bisect_left(self.keys, high)]
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
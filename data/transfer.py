@@ -0,0 +1,218 @@
+# data/transfer.py
+"""Streams session logs between the store and CSV, JSON Lines or Parquet files.
+
+python -m data.transfer import sessions.csv
+python -m data.transfer export sessions.jsonl --start 2024-01-01 --mode Work
+
+Records are read and written TRANSFER_CHUNK_SIZE at a time, so memory stays bounded
+whatever the file size. Parquet needs pyarrow.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+from config import settings
+from data import persistence
+
+FIELDS = ('timestamp', 'label', 'duration_sec', 'mode')
+FORMATS = ('csv', 'jsonl', 'parquet')
+MAX_DURATION_SEC = 2**31 - 1  # The largest the session columns' int32 duration can hold
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    fmt = {'ndjson': 'jsonl', 'pq': 'parquet'}.get(ext, ext)
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot tell the format of {path}; pass --format ({', '.join(FORMATS)})")
+    return fmt
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise RuntimeError("Parquet support needs pyarrow (pip install pyarrow).")
+
+# --- Validation ---
+def validate(raw):
+    """Returns a clean session entry for one raw record, or raises ValueError saying what is wrong."""
+    missing = [field for field in FIELDS if raw.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+
+    timestamp = raw['timestamp']
+    if not isinstance(timestamp, datetime):
+        try:
+            timestamp = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError(f"bad timestamp {raw['timestamp']!r}")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)  # Stored timestamps are local and naive
+
+    try:
+        duration = float(raw['duration_sec'])
+        if not math.isfinite(duration):
+            raise ValueError
+        duration = int(duration)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"bad duration_sec {raw['duration_sec']!r}")
+    if duration <= 0:
+        raise ValueError(f"non-positive duration_sec {duration}")
+    if duration > MAX_DURATION_SEC:
+        raise ValueError(f"duration_sec {duration} is too long")
+
+    mode = str(raw['mode'])
+    if mode not in settings.THEMES:
+        raise ValueError(f"unknown mode {mode!r}")
+
+    label = str(raw['label']).strip()
+    if not label:
+        raise ValueError("blank label")
+
+    return {'timestamp': timestamp.isoformat(), 'label': label, 'duration_sec': duration, 'mode': mode}
+
+def _key(entry):
+    return (entry['timestamp'], entry['label'], entry['duration_sec'], entry['mode'])
+
+# --- Readers (yield raw records) ---
+def _read_csv(path):
+    with open(path, 'r', newline='') as f:
+        yield from csv.DictReader(f)
+
+def _read_jsonl(path):
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield {'_error': f"line {number} is not valid JSON"}
+
+def _read_parquet(path):
+    _require_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    columns = [c for c in FIELDS if c in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(batch_size=settings.TRANSFER_CHUNK_SIZE, columns=columns):
+        yield from batch.to_pylist()
+
+READERS = {'csv': _read_csv, 'jsonl': _read_jsonl, 'parquet': _read_parquet}
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def import_sessions(store, path, fmt=None, chunk_size=None):
+    """Validates, deduplicates and appends the sessions in `path` to the store. Returns counts."""
+    fmt = fmt or detect_format(path)
+    stats = {'read': 0, 'imported': 0, 'duplicates': 0, 'invalid': 0}
+    for chunk in _chunks(READERS[fmt](path), chunk_size or settings.TRANSFER_CHUNK_SIZE):
+        entries = {}
+        for raw in chunk:
+            stats['read'] += 1
+            try:
+                if not isinstance(raw, dict):
+                    raise ValueError(f"not a record: {raw!r}")  # e.g. a JSON Lines line holding a bare number
+                if '_error' in raw:
+                    raise ValueError(raw['_error'])
+                entry = validate(raw)
+            except ValueError as e:
+                stats['invalid'] += 1
+                if stats['invalid'] <= 10:
+                    print(f"Skipping record {stats['read']}: {e}")
+                continue
+            if _key(entry) in entries:
+                stats['duplicates'] += 1
+            else:
+                entries[_key(entry)] = entry
+        if not entries:
+            continue
+
+        # Duplicates of sessions already stored (including earlier chunks) can only fall on the same
+        # days; the store is asked one day at a time, so unsorted input never loads the days in between
+        by_day = {}
+        for key in entries:
+            by_day.setdefault(key[0][:10], []).append(key)
+        stored = set()
+        for day, keys in by_day.items():
+            start = datetime.fromisoformat(day)
+            on_day = {_key(e) for e in store.sessions(start, start + timedelta(days=1))}
+            stored.update(key for key in keys if key in on_day)
+        new = [entry for key, entry in entries.items() if key not in stored]
+        stats['duplicates'] += len(entries) - len(new)
+        store.add_sessions(new)
+        stats['imported'] += len(new)
+    return stats
+
+# --- Writers ---
+def export_sessions(store, path, fmt=None, start=None, end=None, mode=None, label=None, chunk_size=None):
+    """Writes the matching sessions, oldest first, to `path`. Returns the number written."""
+    fmt = fmt or detect_format(path)
+    chunk_size = chunk_size or settings.TRANSFER_CHUNK_SIZE
+    sessions = store.iter_sessions(start, end, mode, label)
+    written = 0
+
+    if fmt == 'parquet':
+        _require_pyarrow()
+        schema = pyarrow.schema([('timestamp', pyarrow.string()), ('label', pyarrow.string()),
+                                 ('duration_sec', pyarrow.int64()), ('mode', pyarrow.string())])
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in _chunks(sessions, chunk_size):
+                writer.write_table(pyarrow.Table.from_pylist(chunk, schema=schema))
+                written += len(chunk)
+        return written
+
+    with open(path, 'w', newline='') as f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            for chunk in _chunks(sessions, chunk_size):
+                writer.writerows(chunk)
+                written += len(chunk)
+        else:
+            for chunk in _chunks(sessions, chunk_size):
+                f.write("".join(json.dumps({k: e[k] for k in FIELDS}) + "\n" for e in chunk))
+                written += len(chunk)
+    return written
+
+# --- Command line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m data.transfer", description="Import or export TimeSplit session logs.")
+    parser.add_argument('action', choices=('import', 'export'))
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension")
+    parser.add_argument('--start', type=datetime.fromisoformat, help="Export sessions from this date/time on")
+    parser.add_argument('--end', type=datetime.fromisoformat, help="Export sessions before this date/time")
+    parser.add_argument('--mode', choices=sorted(settings.THEMES))
+    parser.add_argument('--label')
+    args = parser.parse_args(argv)
+
+    store = persistence.open_store()
+    try:
+        if args.action == 'import':
+            stats = import_sessions(store, args.path, args.format)
+            print(f"Read {stats['read']} records: imported {stats['imported']}, "
+                  f"skipped {stats['duplicates']} duplicates and {stats['invalid']} invalid.")
+        else:
+            count = export_sessions(store, args.path, args.format, args.start, args.end, args.mode, args.label)
+            print(f"Exported {count} sessions to {args.path}.")
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
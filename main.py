@@ -1,7 +1,5 @@
 # main.py
-import matplotlib
-matplotlib.use('TkAgg') # Add this line right at the top
-
+# matplotlib and the Google client are imported lazily by the frames that need them
 from app.app_logic import TimeSplitApp
 
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+# services/calendar_events.py
+import datetime
+
+# Event bodies are built here, without importing the Google client, so they can be
+# queued in the outbox from the Tk thread.
+
+def all_day_event_body(summary, date_str):
+    return {
+        'summary': summary,
+        'start': {'date': date_str},
+        'end': {'date': date_str},
+    }
+
+def timed_event_body(summary, start_iso, end_iso):
+    return {
+        'summary': summary,
+        'start': {'dateTime': _with_offset(start_iso)},
+        'end': {'dateTime': _with_offset(end_iso)},
+    }
+
+def _with_offset(iso):
+    # Naive times are local; the API wants RFC3339 with an offset (a tzinfo's name is not an IANA zone)
+    moment = datetime.datetime.fromisoformat(iso)
+    return (moment if moment.tzinfo else moment.astimezone()).isoformat()
@@ -0,0 +1,218 @@
+# services/calendar_worker.py
+import queue
+import threading
+import time
+from config import settings
+from services.calendar_events import all_day_event_body, timed_event_body
+from services.event_cache import EventCache
+from services.outbox import CalendarOutbox
+
+class AsyncCalendarService:
+    """Runs GoogleCalendarService (authentication included) on a worker thread.
+
+    Calls return immediately; results come back on the Tk thread through a queue
+    that is drained with `after` while requests are outstanding. Callbacks are
+    invoked as callback(result, error).
+    """
+    PENDING, READY, FAILED = "pending", "ready", "failed"
+    POLL_MS = 50
+
+    def __init__(self, root, service_factory=None):
+        self.root = root
+        self.state = self.PENDING
+        self.error = None
+        self.service = None
+        self._service_factory = service_factory or self._default_factory
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._polling = False
+        self._state_listeners = []
+        self.cache = EventCache()
+        self._sync_waiters = None  # Callbacks waiting on the sync in flight, if any
+        self.outbox = CalendarOutbox()
+        self._delivery_callbacks = {}
+        self._flush_job = None
+        self._flushing = False
+
+        self._thread = threading.Thread(target=self._run, name="gcal-worker", daemon=True)
+        self._thread.start()
+        self._submit(None, (), None)  # Reports the authentication outcome
+        if self.outbox:
+            self._schedule_flush(0)  # Writes queued in an earlier run
+
+    @staticmethod
+    def _default_factory():
+        from services.google_calendar import create_calendar_service
+        return create_calendar_service()
+
+    # --- Worker thread ---
+    def _run(self):
+        try:
+            self.service = self._service_factory()
+            if getattr(self.service, 'service', True) is None:
+                raise RuntimeError("Google Calendar service could not be built.")
+            state, error = self.READY, None
+        except Exception as e:
+            print(f"Google Calendar authentication failed: {e}")
+            state, error = self.FAILED, e
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            method, args, callback = job
+            if method is None:
+                self._results.put((self._set_state, (state, error), None))
+                continue
+            if state != self.READY:
+                self._results.put((callback, None, error))
+                continue
+            try:
+                self._results.put((callback, getattr(self.service, method)(*args), None))
+            except Exception as e:
+                print(f"Google Calendar call {method} failed: {e}")
+                self._results.put((callback, None, e))
+
+    # --- Tk thread ---
+    def _submit(self, method, args, callback):
+        self._outstanding += 1
+        self._jobs.put((method, args, callback))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            if callback == self._set_state:
+                self._set_state(*result)
+            elif callback:
+                callback(result, error)
+
+        # Only keep waking up while something is in flight
+        if self._outstanding:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _set_state(self, state, error):
+        self.state, self.error = state, error
+        for listener in self._state_listeners:
+            listener(state)
+
+    def add_state_listener(self, listener):
+        self._state_listeners.append(listener)
+
+    @property
+    def busy(self):
+        return self._outstanding > 0
+
+    def call(self, method, *args, callback=None):
+        """Queues GoogleCalendarService.<method>(*args) on the worker thread."""
+        self._submit(method, args, callback)
+
+    def get_upcoming_events(self, callback, max_results=15, force_sync=False):
+        """Answers from the local cache right away, and again after a sync if the cache is stale.
+
+        Within the cache TTL this makes no API calls at all.
+        """
+        had_data = self.cache.has_data
+        if had_data:
+            callback(self.cache.upcoming(max_results), None)
+            if self.cache.is_fresh() and not force_sync:
+                return
+        # A failed refresh keeps showing the cached events instead of an error
+        self.sync(lambda error: callback(self.cache.upcoming(max_results), None if had_data else error))
+
+    def sync(self, callback=None):
+        """Runs one incremental sync on the worker; concurrent requests share it."""
+        if self._sync_waiters is not None:
+            self._sync_waiters.append(callback)
+            return
+        self._sync_waiters = [callback]
+        self.call('sync_events', self.cache.sync_token, callback=self._on_synced)
+
+    def _on_synced(self, result, error):
+        if result:
+            self.cache.apply_sync(*result)
+        elif error is None:
+            error = RuntimeError("Calendar sync failed.")
+        waiters, self._sync_waiters = self._sync_waiters, None
+        for waiter in waiters:
+            if waiter:
+                waiter(error)
+
+    # --- Outbox ---
+    def create_all_day_event(self, summary, date_str, callback=None):
+        self.queue_events([all_day_event_body(summary, date_str)], callback)
+
+    def create_timed_event(self, summary, start_iso, end_iso, callback=None):
+        self.queue_events([timed_event_body(summary, start_iso, end_iso)], callback)
+
+    def queue_events(self, events, callback=None):
+        """Persists event bodies to the outbox and sends them in batches.
+
+        Bursts of writes are coalesced into one batch; `callback(event, error)` runs once per
+        event when it is delivered or permanently rejected.
+        """
+        for event_id in self.outbox.enqueue(events):
+            self._delivery_callbacks[event_id] = callback
+        self._schedule_flush(settings.OUTBOX_FLUSH_DELAY_MS)
+
+    def _schedule_flush(self, delay_ms):
+        if self._flush_job is None:
+            self._flush_job = self.root.after(int(delay_ms), self._flush)
+
+    def _flush(self):
+        self._flush_job = None
+        if self._flushing:
+            return
+        due = self.outbox.due()
+        if not due:
+            self._schedule_retry()
+            return
+        self._flushing = True
+        ids = [item['id'] for item in due]
+        self.call('insert_events_batch', [item['event'] for item in due],
+                  callback=lambda results, error: self._on_flushed(ids, results))
+
+    def _on_flushed(self, ids, results):
+        self._flushing = False
+        if results is None:
+            results = {event_id: (None, 0) for event_id in ids}  # Offline or not authenticated
+        delivered, failed = self.outbox.apply_results(results)
+
+        # New events show up in the cache immediately instead of waiting for the next sync
+        created = {event_id: event for event_id, event in delivered.items() if event is not None}
+        if created:
+            self.cache.upsert(created.values())
+            self.cache.save()
+        self._deliver(created)
+        # Events an earlier attempt created (HTTP 409) are fetched rather than cached from our request body
+        existing = [event_id for event_id, event in delivered.items() if event is None]
+        if existing:
+            self.sync(lambda error: self._deliver({i: self.cache.events.get(i, {'id': i}) for i in existing}))
+        for event_id, status in failed.items():
+            callback = self._delivery_callbacks.pop(event_id, None)
+            if callback:
+                callback(None, RuntimeError(f"Google Calendar rejected the event (HTTP {status})."))
+        self._schedule_retry()
+
+    def _deliver(self, events):
+        for event_id, event in events.items():
+            callback = self._delivery_callbacks.pop(event_id, None)
+            if callback:
+                callback(event, None)
+
+    def _schedule_retry(self):
+        next_attempt = self.outbox.next_attempt()
+        if next_attempt is not None:
+            self._schedule_flush(max(0.0, next_attempt - time.time()) * 1000)
+
+    def close(self):
+        self._jobs.put(None)
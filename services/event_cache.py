@@ -0,0 +1,102 @@
+# services/event_cache.py
+import datetime
+import json
+import os
+import time
+from config import settings
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+def parse_event_time(value):
+    """Returns an event's start or end ({'dateTime' or 'date', optional 'timeZone'}) as an aware
+    datetime (all-day events use local midnight), or None if it is missing or malformed."""
+    try:
+        if 'dateTime' in value:
+            moment = datetime.datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+            return moment if moment.tzinfo else _localize(moment, value.get('timeZone'))
+        if 'date' in value:
+            return datetime.datetime.fromisoformat(value['date']).astimezone()
+    except (TypeError, ValueError, AttributeError):
+        pass
+    return None
+
+def _localize(moment, time_zone):
+    # A dateTime without an offset is in the event's own time zone, or failing that the local one
+    if time_zone and ZoneInfo is not None:
+        try:
+            return moment.replace(tzinfo=ZoneInfo(time_zone))
+        except (ValueError, KeyError):  # KeyError: ZoneInfoNotFoundError
+            pass
+    return moment.astimezone()
+
+def _event_time(event, edge):
+    return parse_event_time(event.get(edge) or {})
+
+class EventCache:
+    """Local copy of the primary calendar, kept current with the Calendar API's sync tokens."""
+    def __init__(self, path=None, ttl_sec=None):
+        self.path = path or settings.EVENT_CACHE_PATH
+        self.ttl_sec = settings.EVENT_CACHE_TTL_SEC if ttl_sec is None else ttl_sec
+        self.events = {}
+        self.sync_token = None
+        self.synced_at = 0.0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+            self.events = saved.get('events', {})
+            self.sync_token = saved.get('sync_token')
+            self.synced_at = saved.get('synced_at', 0.0)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'events': self.events, 'sync_token': self.sync_token, 'synced_at': self.synced_at}, f)
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            print(f"Error saving calendar cache: {e}")
+
+    @property
+    def has_data(self):
+        return self.synced_at > 0
+
+    def is_fresh(self):
+        return time.time() - self.synced_at < self.ttl_sec
+
+    def apply_sync(self, items, sync_token, full_sync):
+        """Folds a sync result into the cache: upserts changed events and drops cancelled ones."""
+        if full_sync:
+            self.events = {}
+        self.upsert(items)
+        self.sync_token = sync_token
+        self.synced_at = time.time()
+        self._prune_past()
+        self.save()
+
+    def upsert(self, items):
+        for event in items:
+            if event.get('status') == 'cancelled':
+                self.events.pop(event['id'], None)
+            else:
+                self.events[event['id']] = event
+
+    def _prune_past(self):
+        # Events that ended more than a day ago are never displayed again
+        cutoff = datetime.datetime.now().astimezone() - datetime.timedelta(days=1)
+        for event_id in [i for i, e in self.events.items() if (_event_time(e, 'end') or cutoff) < cutoff]:
+            del self.events[event_id]
+
+    def upcoming(self, max_results=15):
+        """Returns the next events that have not ended yet, ordered by start time."""
+        now = datetime.datetime.now().astimezone()
+        upcoming = [e for e in self.events.values() if (_event_time(e, 'end') or now) >= now]
+        upcoming.sort(key=lambda e: _event_time(e, 'start') or now)
+        return upcoming[:max_results]
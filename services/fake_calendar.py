@@ -0,0 +1,174 @@
+# services/fake_calendar.py
+import datetime
+import random
+import time
+from googleapiclient.errors import HttpError
+from services.event_cache import parse_event_time
+
+class _Response(dict):
+    """Minimal stand-in for httplib2.Response, enough for HttpError."""
+    def __init__(self, status, reason):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = reason
+
+def _http_error(status, reason):
+    return HttpError(_Response(status, reason), f'{{"error": {{"code": {status}, "message": "{reason}"}}}}'.encode())
+
+class FakeCalendar:
+    """In-process stand-in for the Calendar v3 resource returned by googleapiclient's build().
+
+    Supports the calls GoogleCalendarService makes (events().list / insert and batch
+    requests), including paging and sync tokens, with configurable latency and error
+    injection so planner and sync paths can be exercised without credentials or network.
+    """
+    PAGE_SIZE = 250
+
+    def __init__(self, latency_ms=0, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stored = {}      # id -> event (not `events`, which is the resource method)
+        self.changes = {}     # id -> version of its last change
+        self.version = 0
+        self.min_sync_version = 0
+        self.request_count = 0
+        self._forced_errors = []
+
+    # --- Seeding and fault injection ---
+    def seed_events(self, count, start=None, spread_days=60):
+        """Adds `count` timed events spread over the days following `start` (default: now)."""
+        start = start or datetime.datetime.now().astimezone().replace(microsecond=0)
+        for i in range(count):
+            begin = start + datetime.timedelta(minutes=self.random.randrange(spread_days * 24 * 60))
+            self._store({
+                'id': f"seed{self.version:08d}",
+                'summary': f"Seeded event {i}",
+                'start': {'dateTime': begin.isoformat()},
+                'end': {'dateTime': (begin + datetime.timedelta(minutes=30)).isoformat()},
+            })
+
+    def update_event(self, event_id, **fields):
+        self._store(dict(self.stored[event_id], **fields))
+
+    def delete_event(self, event_id):
+        self.stored.pop(event_id)
+        self.version += 1
+        self.changes[event_id] = self.version
+
+    def fail_next(self, count=1, status=503):
+        """Makes the next `count` requests fail with the given HTTP status."""
+        self._forced_errors.extend([status] * count)
+
+    def expire_sync_tokens(self):
+        """Invalidates every sync token handed out so far (the next sync gets HTTP 410)."""
+        self.min_sync_version = self.version + 1
+
+    def _store(self, event):
+        self.version += 1
+        self.stored[event['id']] = dict(event, status='confirmed')
+        self.changes[event['id']] = self.version
+
+    def _before_request(self):
+        self.request_count += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self._forced_errors:
+            raise _http_error(self._forced_errors.pop(0), "Injected error")
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise _http_error(503, "Injected error")
+
+    # --- Resource interface ---
+    def events(self):
+        return _EventsResource(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _BatchRequest(self, callback)
+
+    def _list(self, syncToken=None, pageToken=None, maxResults=None, timeMin=None, orderBy=None, **_):
+        if syncToken is not None:
+            since = int(syncToken)
+            if since < self.min_sync_version:
+                raise _http_error(410, "Sync token is no longer valid")
+            changed = sorted((v, i) for i, v in self.changes.items() if v > since)
+            items = [self.stored.get(i, {'id': i, 'status': 'cancelled'}) for _, i in changed]
+        else:
+            items = list(self.stored.values())
+            if timeMin:
+                minimum = datetime.datetime.fromisoformat(timeMin.replace('Z', '+00:00'))
+                items = [e for e in items if _end(e) > minimum]
+            if orderBy == 'startTime':
+                items.sort(key=_start)
+
+        offset = int(pageToken or 0)
+        size = min(maxResults or self.PAGE_SIZE, self.PAGE_SIZE)
+        result = {'items': items[offset:offset + size]}
+        if offset + size < len(items):
+            result['nextPageToken'] = str(offset + size)
+        else:
+            result['nextSyncToken'] = str(self.version)
+        return result
+
+    def _insert(self, body, calendarId='primary'):
+        if body.get('id') in self.stored:
+            raise _http_error(409, "The requested identifier already exists.")
+        event = dict(body, id=body.get('id') or f"fake{self.version:08d}", htmlLink="https://calendar.invalid/event",
+                     start=_normalized_time(body.get('start')), end=_normalized_time(body.get('end')))
+        self._store(event)
+        return self.stored[event['id']]
+
+def _normalized_time(value):
+    # Like the API: a dateTime comes back as RFC3339 with an offset, whatever form was sent
+    if not isinstance(value, dict) or ('dateTime' not in value and 'date' not in value):
+        raise _http_error(400, "Missing start or end time.")
+    if 'date' in value:
+        return dict(value)
+    moment = parse_event_time(value)
+    if moment is None:
+        raise _http_error(400, "Invalid start or end time.")
+    return dict(value, dateTime=moment.isoformat())
+
+def _start(event):
+    return parse_event_time(event['start'])
+
+def _end(event):
+    return parse_event_time(event['end'])
+
+class _EventsResource:
+    def __init__(self, calendar):
+        self.calendar = calendar
+
+    def list(self, **params):
+        return _Request(self.calendar, self.calendar._list, params)
+
+    def insert(self, calendarId, body):
+        return _Request(self.calendar, self.calendar._insert, {'calendarId': calendarId, 'body': body})
+
+class _Request:
+    def __init__(self, calendar, handler, params):
+        self.calendar = calendar
+        self.handler = handler
+        self.params = params
+
+    def execute(self):
+        self.calendar._before_request()
+        return self.handler(**self.params)
+
+class _BatchRequest:
+    """One round trip for many requests, like googleapiclient's BatchHttpRequest."""
+    def __init__(self, calendar, callback):
+        self.calendar = calendar
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback))
+
+    def execute(self):
+        self.calendar._before_request()
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = request.handler(**request.params), None
+            except HttpError as e:
+                response, exception = None, e
+            (callback or self.callback)(request_id, response, exception)
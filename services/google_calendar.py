@@ -7,11 +7,18 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from config import settings
+from services.calendar_events import all_day_event_body, timed_event_body
+
+BATCH_LIMIT = 50  # Requests per batch allowed by the Calendar API
 
 class GoogleCalendarService:
-    def __init__(self):
+    def __init__(self, transport=None):
+        """`transport` replaces the real API resource (see services/fake_calendar.py and services/recording.py)."""
         self.creds = None
-        self._authenticate()
+        if transport is not None:
+            self.service = transport
+        else:
+            self._authenticate()
 
     def _authenticate(self):
         # ... (authentication code is unchanged)
@@ -55,26 +62,42 @@ class GoogleCalendarService:
             print(f"An error occurred fetching events: {e}")
             return []
 
+    def sync_events(self, sync_token=None):
+        """Fetches events changed since `sync_token`, or every event when there is no token.
+
+        Returns (items, next_sync_token, full_sync). Cancelled events are included so the
+        caller can drop them. An expired token (HTTP 410) falls back to a full sync.
+        """
+        if not self.service: return None
+
+        items, page_token = [], None
+        try:
+            while True:
+                params = {'calendarId': 'primary', 'singleEvents': True, 'pageToken': page_token}
+                if sync_token:
+                    params['syncToken'] = sync_token
+                result = self.service.events().list(**params).execute()
+                items.extend(result.get('items', []))
+                page_token = result.get('nextPageToken')
+                if not page_token:
+                    return items, result.get('nextSyncToken'), sync_token is None
+        except HttpError as e:
+            if sync_token and e.resp.status == 410:
+                print("Calendar sync token expired; running a full sync.")
+                return self.sync_events(None)
+            print(f"An error occurred syncing events: {e}")
+            return None
+
     # RENAMED from create_event to be more specific
     def create_all_day_event(self, summary, date_str):
         if not self.service: return None
-        event = {
-            'summary': summary,
-            'start': {'date': date_str},
-            'end': {'date': date_str},
-        }
-        return self._execute_event_creation(event)
+        return self._execute_event_creation(all_day_event_body(summary, date_str))
 
     # <<< NEW FUNCTION FOR TIMED EVENTS >>>
     def create_timed_event(self, summary, start_iso, end_iso):
         """Creates a timed event on the user's primary calendar."""
         if not self.service: return None
-        event = {
-            'summary': summary,
-            'start': {'dateTime': start_iso, 'timeZone': str(datetime.datetime.now().astimezone().tzinfo)},
-            'end': {'dateTime': end_iso, 'timeZone': str(datetime.datetime.now().astimezone().tzinfo)},
-        }
-        return self._execute_event_creation(event)
+        return self._execute_event_creation(timed_event_body(summary, start_iso, end_iso))
 
     def _execute_event_creation(self, event):
         try:
@@ -83,4 +106,50 @@ class GoogleCalendarService:
             return created_event
         except HttpError as e:
             print(f"An error occurred creating the event: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def insert_events_batch(self, events):
+        """Inserts events in batched HTTP requests (up to BATCH_LIMIT per round trip).
+
+        Every event must carry a client-chosen 'id', which makes retries idempotent.
+        Returns {event_id: (created_event, http_status)}; http_status is None on success
+        and 0 when the request failed without an HTTP response.
+        """
+        if not self.service: return None
+        results = {}
+
+        def on_response(request_id, response, exception):
+            if exception is None:
+                results[request_id] = (response, None)
+            else:
+                results[request_id] = (None, getattr(getattr(exception, 'resp', None), 'status', 0))
+
+        for i in range(0, len(events), BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for event in events[i:i + BATCH_LIMIT]:
+                batch.add(self.service.events().insert(calendarId='primary', body=event), request_id=event['id'])
+            try:
+                batch.execute()
+            except Exception as e:
+                print(f"An error occurred sending an event batch: {e}")
+                for event in events[i:i + BATCH_LIMIT]:
+                    results.setdefault(event['id'], (None, 0))
+        return results
+
+def create_calendar_service():
+    """Builds the calendar service with the transport selected by settings.CALENDAR_TRANSPORT."""
+    transport = settings.CALENDAR_TRANSPORT
+    if transport == "fake":
+        from services.fake_calendar import FakeCalendar
+        calendar = FakeCalendar(latency_ms=settings.FAKE_CALENDAR_LATENCY_MS)
+        calendar.seed_events(settings.FAKE_CALENDAR_EVENTS)
+        return GoogleCalendarService(transport=calendar)
+    if transport == "replay":
+        from services.recording import ReplayTransport
+        return GoogleCalendarService(transport=ReplayTransport(settings.CALENDAR_CASSETTE_PATH))
+
+    service = GoogleCalendarService()
+    if transport == "record" and service.service:
+        from services.recording import RecordingTransport
+        service.service = RecordingTransport(service.service, settings.CALENDAR_CASSETTE_PATH)
+    return service
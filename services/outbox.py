@@ -0,0 +1,91 @@
+# services/outbox.py
+import json
+import os
+import time
+import uuid
+from config import settings
+
+# HTTP statuses worth retrying; anything else (except 409, see below) is a permanent failure
+RETRYABLE_STATUSES = {0, 408, 429, 500, 502, 503, 504}
+# 409 means an event with our client-chosen id already exists, i.e. an earlier attempt got through
+ALREADY_CREATED = 409
+
+class CalendarOutbox:
+    """Persisted queue of calendar writes waiting to be sent.
+
+    Each queued event gets a client-side id that is also used as the Google event id,
+    so a write that is retried after a crash or timeout can never create a duplicate.
+    """
+    def __init__(self, path=None):
+        self.path = path or settings.OUTBOX_PATH
+        self.items = []
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.items = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.items = []
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.items, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            print(f"Error saving calendar outbox: {e}")
+
+    def enqueue(self, events):
+        """Queues event bodies and returns their ids."""
+        ids = []
+        for event in events:
+            event = dict(event, id=uuid.uuid4().hex)
+            self.items.append({'id': event['id'], 'event': event, 'attempts': 0, 'next_attempt': 0.0})
+            ids.append(event['id'])
+        self.save()
+        return ids
+
+    def due(self, now=None, limit=None):
+        """Returns the queued items whose backoff has expired, oldest first."""
+        now = time.time() if now is None else now
+        due = [item for item in self.items if item['next_attempt'] <= now]
+        return due[:limit] if limit else due
+
+    def next_attempt(self):
+        """Returns the earliest time something is due, or None when the outbox is empty."""
+        return min((item['next_attempt'] for item in self.items), default=None)
+
+    def apply_results(self, results, now=None):
+        """Removes delivered (or permanently failed) items and backs off the rest.
+
+        Returns (delivered, failed): {id: created_event} and {id: http_status}. The event is
+        None for a 409: it was created earlier, and only the API knows its stored form.
+        """
+        now = time.time() if now is None else now
+        delivered, failed = {}, {}
+        remaining = []
+        for item in self.items:
+            if item['id'] not in results:
+                remaining.append(item)
+                continue
+            event, status = results[item['id']]
+            if status is None or status == ALREADY_CREATED:
+                delivered[item['id']] = event
+            elif status in RETRYABLE_STATUSES:
+                item['attempts'] += 1
+                item['next_attempt'] = now + min(settings.OUTBOX_BACKOFF_BASE_SEC * 2 ** (item['attempts'] - 1),
+                                                 settings.OUTBOX_BACKOFF_MAX_SEC)
+                remaining.append(item)
+            else:
+                print(f"Dropping calendar write {item['id']}: HTTP {status}")
+                failed[item['id']] = status
+        self.items = remaining
+        self.save()
+        return delivered, failed
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,160 @@
+# services/recording.py
+import json
+from googleapiclient.errors import HttpError
+from services.fake_calendar import _http_error
+
+# Parameters that differ on every run (the current time, client-generated event ids)
+# are left out when matching a replayed request to a recording
+VOLATILE_PARAMS = ('timeMin',)
+
+def _key(method, params):
+    params = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+    if isinstance(params.get('body'), dict):
+        params['body'] = {k: v for k, v in params['body'].items() if k != 'id'}
+    return method + " " + json.dumps(params, sort_keys=True, default=str)
+
+def read_cassette(path):
+    """Returns the recorded interactions; cassettes written before the line format are one JSON list."""
+    with open(path, 'r') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+class RecordingTransport:
+    """Wraps a real Calendar resource and appends every request/response pair to a cassette file.
+
+    The cassette has one JSON interaction per line, so each request costs one appended line.
+    """
+    def __init__(self, inner, cassette_path):
+        self.inner = inner
+        self.cassette_path = cassette_path
+        self._file = open(cassette_path, 'w')  # Each recording session starts a new cassette
+
+    def record(self, method, params, response=None, status=None):
+        interaction = {'method': method, 'params': params, 'response': response, 'status': status}
+        self._file.write(json.dumps(interaction, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def events(self):
+        return _RecordingEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _RecordingBatch(self, callback)
+
+class _RecordingEvents:
+    def __init__(self, transport):
+        self.transport = transport
+
+    def list(self, **params):
+        return _RecordingRequest(self.transport, 'events.list', params, self.transport.inner.events().list(**params))
+
+    def insert(self, calendarId, body):
+        params = {'calendarId': calendarId, 'body': body}
+        return _RecordingRequest(self.transport, 'events.insert', params, self.transport.inner.events().insert(**params))
+
+class _RecordingRequest:
+    def __init__(self, transport, method, params, inner):
+        self.transport = transport
+        self.method = method
+        self.params = params
+        self.inner = inner
+
+    def execute(self):
+        try:
+            response = self.inner.execute()
+        except HttpError as e:
+            self.transport.record(self.method, self.params, status=e.resp.status)
+            raise
+        self.transport.record(self.method, self.params, response=response)
+        return response
+
+class _RecordingBatch:
+    def __init__(self, transport, callback):
+        self.transport = transport
+        self.callback = callback
+        self.requests = {}
+        self.inner = transport.inner.new_batch_http_request(callback=self._on_response)
+
+    def add(self, request, callback=None, request_id=None):
+        request_id = request_id or str(len(self.requests))
+        self.requests[request_id] = (request, callback)
+        self.inner.add(request.inner, request_id=request_id)
+
+    def _on_response(self, request_id, response, exception):
+        request, callback = self.requests[request_id]
+        status = getattr(getattr(exception, 'resp', None), 'status', 0) if exception else None
+        self.transport.record(request.method, request.params, response=response, status=status)
+        (callback or self.callback)(request_id, response, exception)
+
+    def execute(self):
+        self.inner.execute()
+
+class ReplayTransport:
+    """Serves responses from a cassette written by RecordingTransport, without any network access.
+
+    Requests are matched on method and parameters; repeated identical requests are answered
+    in the order they were recorded.
+    """
+    def __init__(self, cassette_path):
+        self.responses = {}
+        for interaction in read_cassette(cassette_path):
+            self.responses.setdefault(_key(interaction['method'], interaction['params']), []).append(interaction)
+        self.request_count = 0
+
+    def respond(self, method, params):
+        queue = self.responses.get(_key(method, params))
+        if not queue:
+            raise _http_error(404, f"No recorded response for {method}")
+        interaction = queue.pop(0) if len(queue) > 1 else queue[0]
+        if interaction['status']:
+            raise _http_error(interaction['status'], "Recorded error")
+        return interaction['response']
+
+    def events(self):
+        return _ReplayEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _ReplayBatch(self, callback)
+
+class _ReplayEvents:
+    def __init__(self, transport):
+        self.transport = transport
+
+    def list(self, **params):
+        return _ReplayRequest(self.transport, 'events.list', params)
+
+    def insert(self, calendarId, body):
+        return _ReplayRequest(self.transport, 'events.insert', {'calendarId': calendarId, 'body': body})
+
+class _ReplayRequest:
+    def __init__(self, transport, method, params):
+        self.transport = transport
+        self.method = method
+        # Round-trip through JSON so parameters compare the same way they were recorded
+        self.params = json.loads(json.dumps(params, default=str))
+
+    def execute(self):
+        self.transport.request_count += 1
+        return self.transport.respond(self.method, self.params)
+
+class _ReplayBatch:
+    def __init__(self, transport, callback):
+        self.transport = transport
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback))
+
+    def execute(self):
+        self.transport.request_count += 1
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = self.transport.respond(request.method, request.params), None
+            except HttpError as e:
+                response, exception = None, e
+            (callback or self.callback)(request_id, response, exception)